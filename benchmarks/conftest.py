@@ -0,0 +1,91 @@
+"""
+Shared data for the pytest-benchmark suite (see the bench targets in the
+Makefile). Pools are generated straight into UTXOPool columns, so even the
+1M-UTXO sweeps set up quickly.
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import Callable
+
+import numpy as np
+import pytest
+
+from bitcoin_utxo_lp import SelectionParams, TxSizing, UTXOPool
+
+# Sweep axes. Each benchmark sweeps one axis around the BASE_* point.
+POOL_SIZES = [10, 1_000, 100_000, 1_000_000]
+CLASS_COUNTS = [1, 4, 32]
+TARGET_RATIOS = [0.001, 0.01, 0.1]
+FEE_RATES = [1.0, 10.0, 100.0]
+
+BASE_SIZE = 10_000
+BASE_CLASSES = 4
+BASE_RATIO = 0.01
+BASE_FEE_RATE = 10.0
+BASE_TARGET_SATS = 5_000_000  # size sweeps: a payment-sized target
+
+SIZING = TxSizing(
+    base_overhead_vbytes=10.5,
+    recipient_output_vbytes=31.0,
+    change_output_vbytes=31.0,
+)
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--bench-max-size",
+        type=int,
+        default=max(POOL_SIZES),
+        help="Skip pool sizes above this (e.g. 100000 for a quick run)",
+    )
+
+
+@pytest.fixture
+def max_size(request: pytest.FixtureRequest) -> int:
+    return int(request.config.getoption("--bench-max-size"))
+
+
+@functools.lru_cache(maxsize=8)
+def _pool(n: int, classes: int, seed: int) -> UTXOPool:
+    rng = np.random.default_rng(seed)
+    # Real input sizes first (P2TR, P2WPKH, P2SH-P2WPKH, P2PKH), then
+    # whole-weight-unit sizes in between for higher diversity
+    known = np.array([57.5, 68.0, 91.0, 148.0], dtype=np.float32)
+    extra = (58.0 + 0.25 * np.arange(max(0, classes - known.size))).astype(np.float32)
+    sizes = np.concatenate((known, extra))[:classes]
+    return UTXOPool(
+        txid=rng.integers(0, 256, size=(n, 32), dtype=np.uint8),
+        vout=rng.integers(0, 4, size=n, dtype=np.uint32),
+        value_sats=rng.integers(1_000, 2_000_000, size=n, dtype=np.int64),
+        input_vbytes=sizes[rng.integers(0, classes, size=n)],
+    )
+
+
+@pytest.fixture
+def make_pool(max_size: int) -> Callable[..., UTXOPool]:
+    def make(n: int, classes: int = BASE_CLASSES, seed: int = 1) -> UTXOPool:
+        if n > max_size:
+            pytest.skip(f"pool size {n} > --bench-max-size {max_size}")
+        return _pool(n, classes, seed)
+
+    return make
+
+
+def make_params(target_sats: int, fee_rate: float = BASE_FEE_RATE) -> SelectionParams:
+    return SelectionParams(
+        target_sats=target_sats,
+        fee_rate_sat_per_vb=fee_rate,
+        min_change_sats=546,
+        sizing=SIZING,
+    )
+
+
+def ratio_target(pool: UTXOPool, ratio: float) -> int:
+    return int(ratio * int(pool.value_sats.sum()))
+
+
+def rounds_for(n: int) -> int:
+    # Enough rounds for stable medians without making 1M-UTXO runs crawl
+    return max(3, min(50, 200_000 // max(n, 1)))
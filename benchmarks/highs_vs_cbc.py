@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+
+from bitcoin_utxo_lp import (
+    UTXO,
+    HiGHSMILPSolver,
+    SelectionParams,
+    SimpleCoinSelectionModel,
+    SimpleMILPSolver,
+    TxSizing,
+)
+
+
+def _wallet(rnd: random.Random, n: int) -> list[UTXO]:
+    return [
+        UTXO(
+            txid=f"{i:064x}",
+            vout=i,
+            value_sats=rnd.randint(1_000, 200_000),
+            input_vbytes=float(rnd.choice([58, 68, 91, 148])),
+        )
+        for i in range(n)
+    ]
+
+
+def _latencies_ms(
+    solver: SimpleMILPSolver | HiGHSMILPSolver,
+    models: list[SimpleCoinSelectionModel],
+) -> list[float]:
+    out: list[float] = []
+    for model in models:
+        start = time.perf_counter()
+        solver.solve(model)
+        out.append((time.perf_counter() - start) * 1_000)
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare per-solve latency of CBC (subprocess) and HiGHS."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 20, 100, 1_000])
+    parser.add_argument("--repeats", type=int, default=30, help="Solves per size")
+    parser.add_argument("--seed", type=int, default=1337)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    sizing = TxSizing(
+        base_overhead_vbytes=10.0,
+        recipient_output_vbytes=31.0,
+        change_output_vbytes=31.0,
+    )
+
+    print(f"{'utxos':>7} {'backend':>8} {'median ms':>10} {'p95 ms':>10}")
+    for n in args.sizes:
+        models = []
+        for _ in range(args.repeats):
+            utxos = _wallet(rnd, n)
+            total = sum(u.value_sats for u in utxos)
+            params = SelectionParams(
+                target_sats=rnd.randint(1_000, max(1_000, total // 2)),
+                fee_rate_sat_per_vb=float(rnd.choice([1, 2, 3, 5, 8, 10])),
+                min_change_sats=546,
+                sizing=sizing,
+            )
+            models.append(SimpleCoinSelectionModel(utxos=utxos, params=params))
+
+        for name, solver in (
+            ("cbc", SimpleMILPSolver(time_limit_seconds=30)),
+            ("highs", HiGHSMILPSolver(time_limit_seconds=30)),
+        ):
+            lat = sorted(_latencies_ms(solver, models))
+            p95 = lat[min(len(lat) - 1, int(0.95 * len(lat)))]
+            print(f"{n:>7} {name:>8} {statistics.median(lat):>10.2f} {p95:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import tracemalloc
+from typing import Callable, Sequence
+
+from bitcoin_utxo_lp import UTXO, UTXOPool
+
+
+def _wallet(rnd: random.Random, n: int) -> list[UTXO]:
+    return [
+        UTXO(
+            txid=rnd.randbytes(32).hex(),
+            vout=rnd.randrange(4),
+            value_sats=rnd.randint(1_000, 200_000),
+            input_vbytes=float(rnd.choice([57.5, 68, 91, 148])),
+        )
+        for _ in range(n)
+    ]
+
+
+def _traced_bytes(build: Callable[[], Sequence[UTXO]]) -> int:
+    """Bytes still allocated once build() returns (what holding it costs)."""
+    gc.collect()
+    tracemalloc.start()
+    held = build()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Memory per UTXO: list of UTXO dataclasses vs UTXOPool."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--seed", type=int, default=1337)
+    args = parser.parse_args()
+
+    print(f"{'utxos':>9} {'layout':>10} {'MB':>9} {'B/UTXO':>8}")
+    for n in args.sizes:
+        utxos = _wallet(random.Random(args.seed), n)
+        pool = UTXOPool.from_utxos(utxos)
+        seed = args.seed
+
+        for layout, nbytes in (
+            ("list", _traced_bytes(lambda: _wallet(random.Random(seed), n))),
+            ("UTXOPool", _traced_bytes(lambda: UTXOPool.from_utxos(utxos))),
+        ):
+            print(f"{n:>9} {layout:>10} {nbytes / 1e6:>9.1f} {nbytes / n:>8.1f}")
+        assert pool.nbytes / n < 64
+
+
+if __name__ == "__main__":
+    main()
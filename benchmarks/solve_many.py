@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from bitcoin_utxo_lp import (
+    UTXO,
+    SelectionParams,
+    SelectionResult,
+    SimpleCoinSelectionModel,
+    SimpleMILPSolver,
+    TxSizing,
+)
+
+
+def _wallet(rnd: random.Random, n: int) -> list[UTXO]:
+    return [
+        UTXO(
+            txid=f"{i:064x}",
+            vout=i,
+            value_sats=rnd.randint(1_000, 200_000),
+            input_vbytes=float(rnd.choice([58, 68, 91, 148])),
+        )
+        for i in range(n)
+    ]
+
+
+def _quotes(rnd: random.Random, count: int) -> list[SelectionParams]:
+    sizing = TxSizing(
+        base_overhead_vbytes=10.0,
+        recipient_output_vbytes=31.0,
+        change_output_vbytes=31.0,
+    )
+    # Payment-sized targets: a handful of inputs each
+    return [
+        SelectionParams(
+            target_sats=rnd.randint(10_000, 1_000_000),
+            fee_rate_sat_per_vb=float(rnd.choice([1, 2, 3, 5, 8, 10])),
+            min_change_sats=546,
+            sizing=sizing,
+        )
+        for _ in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare solve_many() with a loop of independent solve() calls."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--quotes", type=int, default=50, help="Params per pool")
+    parser.add_argument("--time-limit", type=float, default=10.0)
+    parser.add_argument("--presolve", action="store_true")
+    parser.add_argument("--seed", type=int, default=1337)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    solver = SimpleMILPSolver(
+        time_limit_seconds=args.time_limit, presolve=args.presolve
+    )
+
+    print(f"{'utxos':>7} {'mode':>10} {'total s':>9} {'quotes/s':>9}")
+    for n in args.sizes:
+        utxos = _wallet(rnd, n)
+        params_list = _quotes(rnd, args.quotes)
+
+        start = time.perf_counter()
+        looped: list[SelectionResult | None] = []
+        for params in params_list:
+            try:
+                looped.append(solver.solve(SimpleCoinSelectionModel(utxos, params)))
+            except RuntimeError:
+                looped.append(None)
+        loop_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batched = solver.solve_many(utxos, params_list)
+        batch_s = time.perf_counter() - start
+
+        for a, b in zip(looped, batched):
+            assert (a is None) == (b is None)
+            assert a is None or b is None or a.fee_sats == b.fee_sats
+
+        for mode, total_s in (("loop", loop_s), ("solve_many", batch_s)):
+            print(
+                f"{n:>7} {mode:>10} {total_s:>9.2f} {len(params_list) / total_s:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Model construction: PuLP problems (build) and solver-neutral arrays
+(build_arrays, presolve) across pool sizes and input size diversity.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import pytest
+
+from bitcoin_utxo_lp import SimpleCoinSelectionModel, UTXOPool, presolve
+
+from .conftest import (
+    BASE_SIZE,
+    BASE_TARGET_SATS,
+    CLASS_COUNTS,
+    POOL_SIZES,
+    make_params,
+    rounds_for,
+)
+
+# PuLP builds one Python object per UTXO; 1M is minutes, not a benchmark
+PULP_SIZES = [n for n in POOL_SIZES if n <= 100_000]
+
+
+def _model(pool: UTXOPool) -> SimpleCoinSelectionModel:
+    return SimpleCoinSelectionModel(pool, make_params(BASE_TARGET_SATS))
+
+
+@pytest.mark.parametrize("n", PULP_SIZES)
+def test_build_pulp(benchmark: Any, make_pool: Callable[..., UTXOPool], n: int) -> None:
+    model = _model(make_pool(n))
+    benchmark.group = "build: pulp problem"
+    benchmark.pedantic(model.build, rounds=rounds_for(n) // 3 + 1)
+
+
+@pytest.mark.parametrize("n", POOL_SIZES)
+def test_build_arrays(
+    benchmark: Any, make_pool: Callable[..., UTXOPool], n: int
+) -> None:
+    model = _model(make_pool(n))
+    benchmark.group = "build: arrays"
+    benchmark.pedantic(model.build_arrays, rounds=rounds_for(n))
+
+
+@pytest.mark.parametrize("n", POOL_SIZES)
+def test_presolve(benchmark: Any, make_pool: Callable[..., UTXOPool], n: int) -> None:
+    model = _model(make_pool(n))
+    benchmark.group = "build: presolve"
+    result = benchmark.pedantic(presolve, args=(model,), rounds=rounds_for(n))
+    assert len(result.model.utxos) <= n
+
+
+@pytest.mark.parametrize("classes", CLASS_COUNTS)
+def test_presolve_by_class_count(
+    benchmark: Any, make_pool: Callable[..., UTXOPool], classes: int
+) -> None:
+    model = _model(make_pool(BASE_SIZE, classes))
+    benchmark.group = "build: presolve by class count"
+    benchmark.pedantic(presolve, args=(model,), rounds=rounds_for(BASE_SIZE))
@@ -0,0 +1,58 @@
+"""
+Post-solve work: mapping solver values back to UTXOs (selected_from) and
+the integer fee/vbytes/change recomputation (evaluate_fee_and_vbytes,
+result_for).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import numpy as np
+import pytest
+
+from bitcoin_utxo_lp import SimpleCoinSelectionModel, UTXOPool
+
+from .conftest import POOL_SIZES, make_params, rounds_for
+
+# Share of the pool a solver "selects" in these benchmarks
+SELECTED_SHARE = 0.01
+
+
+def _solved(pool: UTXOPool) -> tuple[SimpleCoinSelectionModel, list[float]]:
+    n = len(pool)
+    x_values = np.zeros(n)
+    x_values[:: max(1, int(1 / SELECTED_SHARE))] = 1.0
+    picked = x_values > 0.5
+    # A target the picked UTXOs always cover with change to spare
+    target = int(pool.value_sats[picked].sum()) // 2
+    model = SimpleCoinSelectionModel(pool, make_params(target))
+    return model, x_values.tolist()
+
+
+@pytest.mark.parametrize("n", POOL_SIZES)
+def test_selected_from(
+    benchmark: Any, make_pool: Callable[..., UTXOPool], n: int
+) -> None:
+    model, x_values = _solved(make_pool(n))
+    benchmark.group = "extract: selected_from"
+    benchmark.pedantic(model.selected_from, args=(x_values,), rounds=rounds_for(n))
+
+
+@pytest.mark.parametrize("n", POOL_SIZES)
+def test_evaluate_fee_and_vbytes(
+    benchmark: Any, make_pool: Callable[..., UTXOPool], n: int
+) -> None:
+    model, x_values = _solved(make_pool(n))
+    selected = model.selected_from(x_values)
+    benchmark.group = "extract: evaluate_fee_and_vbytes"
+    benchmark(model.evaluate_fee_and_vbytes, selected)
+
+
+@pytest.mark.parametrize("n", POOL_SIZES)
+def test_result_for(benchmark: Any, make_pool: Callable[..., UTXOPool], n: int) -> None:
+    model, x_values = _solved(make_pool(n))
+    selected = model.selected_from(x_values)
+    benchmark.group = "extract: result_for"
+    result = benchmark(model.result_for, selected)
+    assert len(result.selected) == len(selected)
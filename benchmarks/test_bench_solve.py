@@ -0,0 +1,127 @@
+"""
+Solver time on presolved models, one sweep axis at a time: pool size,
+input size diversity, target/pool-value ratio and fee rate. Presolve and
+build run in setup, so only the search itself is timed (see
+test_bench_build.py for those).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import pulp
+import pytest
+
+from bitcoin_utxo_lp import (
+    BranchAndBoundSolver,
+    ClassDPSolver,
+    SelectionResult,
+    SimpleCoinSelectionModel,
+    SimpleMILPSolver,
+    UTXOPool,
+    presolve,
+)
+
+from .conftest import (
+    BASE_CLASSES,
+    BASE_FEE_RATE,
+    BASE_RATIO,
+    BASE_SIZE,
+    BASE_TARGET_SATS,
+    CLASS_COUNTS,
+    FEE_RATES,
+    POOL_SIZES,
+    TARGET_RATIOS,
+    make_params,
+    ratio_target,
+)
+
+# Hard sweep points hit this; their time then measures the limit, and the
+# fee_sats in extra_info shows how good the anytime answer was
+TIME_LIMIT_SECONDS = 5.0
+ROUNDS = 3
+
+SOLVERS: dict[str, Callable[[SimpleCoinSelectionModel], SelectionResult]] = {
+    "milp": SimpleMILPSolver(time_limit_seconds=TIME_LIMIT_SECONDS).solve,
+    "milp-cold": SimpleMILPSolver(
+        time_limit_seconds=TIME_LIMIT_SECONDS, warm_start=False
+    ).solve,
+    "fast": SimpleMILPSolver(fast=True).solve,
+    "dp": ClassDPSolver().solve,
+    "bnb": BranchAndBoundSolver().solve,
+}
+
+
+def _reduced(
+    pool: UTXOPool, target_sats: int, fee_rate: float = BASE_FEE_RATE
+) -> SimpleCoinSelectionModel:
+    return presolve(
+        SimpleCoinSelectionModel(pool, make_params(target_sats, fee_rate))
+    ).model
+
+
+def _bench_solve(
+    benchmark: Any, group: str, solver: str, model: SimpleCoinSelectionModel
+) -> None:
+    benchmark.group = group
+    benchmark.extra_info["candidates"] = len(model.utxos)
+    result = benchmark.pedantic(SOLVERS[solver], args=(model,), rounds=ROUNDS)
+    benchmark.extra_info["fee_sats"] = result.fee_sats
+
+
+@pytest.mark.parametrize("solver", SOLVERS)
+@pytest.mark.parametrize("n", POOL_SIZES)
+def test_solve_by_pool_size(
+    benchmark: Any, make_pool: Callable[..., UTXOPool], n: int, solver: str
+) -> None:
+    model = _reduced(make_pool(n), BASE_TARGET_SATS)
+    _bench_solve(benchmark, f"solve: pool size {n}", solver, model)
+
+
+@pytest.mark.parametrize("solver", SOLVERS)
+@pytest.mark.parametrize("classes", CLASS_COUNTS)
+def test_solve_by_class_count(
+    benchmark: Any, make_pool: Callable[..., UTXOPool], classes: int, solver: str
+) -> None:
+    pool = make_pool(BASE_SIZE, classes)
+    model = _reduced(pool, ratio_target(pool, BASE_RATIO))
+    _bench_solve(benchmark, f"solve: {classes} input size classes", solver, model)
+
+
+@pytest.mark.parametrize("solver", SOLVERS)
+@pytest.mark.parametrize("ratio", TARGET_RATIOS)
+def test_solve_by_target_ratio(
+    benchmark: Any, make_pool: Callable[..., UTXOPool], ratio: float, solver: str
+) -> None:
+    pool = make_pool(BASE_SIZE, BASE_CLASSES)
+    model = _reduced(pool, ratio_target(pool, ratio))
+    _bench_solve(benchmark, f"solve: target {ratio:g} of pool value", solver, model)
+
+
+@pytest.mark.parametrize("solver", SOLVERS)
+@pytest.mark.parametrize("fee_rate", FEE_RATES)
+def test_solve_by_fee_rate(
+    benchmark: Any, make_pool: Callable[..., UTXOPool], fee_rate: float, solver: str
+) -> None:
+    pool = make_pool(BASE_SIZE, BASE_CLASSES)
+    model = _reduced(pool, ratio_target(pool, BASE_RATIO), fee_rate)
+    _bench_solve(benchmark, f"solve: {fee_rate:g} sat/vB", solver, model)
+
+
+@pytest.mark.parametrize("n", POOL_SIZES)
+def test_cbc_only(benchmark: Any, make_pool: Callable[..., UTXOPool], n: int) -> None:
+    # The bare CBC call on a built problem, without the warm start,
+    # cutoff and result extraction SimpleMILPSolver adds around it
+    model = _reduced(make_pool(n), BASE_TARGET_SATS)
+
+    def setup() -> tuple[tuple[pulp.LpProblem], dict[str, Any]]:
+        return (model.build()[0],), {}
+
+    def run(prob: pulp.LpProblem) -> int:
+        return int(
+            prob.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=TIME_LIMIT_SECONDS))
+        )
+
+    benchmark.group = "solve: bare CBC"
+    benchmark.extra_info["candidates"] = len(model.utxos)
+    benchmark.pedantic(run, setup=setup, rounds=ROUNDS)
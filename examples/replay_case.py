@@ -3,6 +3,7 @@ from __future__ import annotations
 import argparse
 import json
 from pathlib import Path
+from typing import Sequence
 
 from bitcoin_utxo_lp import (
     UTXO,
@@ -11,6 +12,7 @@ from bitcoin_utxo_lp import (
     SimpleMILPSolver,
     TxSizing,
 )
+from bitcoin_utxo_lp.snapshot import read_snapshot
 
 
 def main() -> None:
@@ -24,16 +26,29 @@ def main() -> None:
     parser.add_argument(
         "--time-limit", type=int, default=5, help="Solver time limit seconds"
     )
+    parser.add_argument(
+        "--snapshot-dir",
+        help="Read the case from case_NNN.utxos/.json in this directory "
+        "(python -m bitcoin_utxo_lp.snapshot FIXTURE DIR) instead of the fixture",
+    )
     args = parser.parse_args()
 
-    fixture_path = Path(args.fixture)
-    payload = json.loads(fixture_path.read_text(encoding="utf-8"))
-    cases = payload["cases"]
+    if args.snapshot_dir:
+        # The case without its UTXOs; the fixture is not read at all
+        snapshot_path = Path(args.snapshot_dir) / f"case_{args.index:03d}.utxos"
+        header_path = snapshot_path.with_suffix(".json")
+        if not header_path.exists():
+            raise SystemExit(f"No case #{args.index} in {args.snapshot_dir}")
+        case = json.loads(header_path.read_text(encoding="utf-8"))
+    else:
+        fixture_path = Path(args.fixture)
+        payload = json.loads(fixture_path.read_text(encoding="utf-8"))
+        cases = payload["cases"]
 
-    if args.index < 0 or args.index >= len(cases):
-        raise SystemExit(f"Index out of range: {args.index} (0..{len(cases) - 1})")
+        if args.index < 0 or args.index >= len(cases):
+            raise SystemExit(f"Index out of range: {args.index} (0..{len(cases) - 1})")
 
-    case = cases[args.index]
+        case = cases[args.index]
 
     sizing = TxSizing(
         base_overhead_vbytes=float(case["base_overhead_vbytes"]),
@@ -48,15 +63,19 @@ def main() -> None:
         sizing=sizing,
     )
 
-    utxos = [
-        UTXO(
-            txid=f"{i:064x}",
-            vout=i,
-            value_sats=int(u["value_sats"]),
-            input_vbytes=float(u["input_vbytes"]),
-        )
-        for i, u in enumerate(case["utxos"])
-    ]
+    utxos: Sequence[UTXO]
+    if args.snapshot_dir:
+        utxos = read_snapshot(snapshot_path)
+    else:
+        utxos = [
+            UTXO(
+                txid=f"{i:064x}",
+                vout=i,
+                value_sats=int(u["value_sats"]),
+                input_vbytes=float(u["input_vbytes"]),
+            )
+            for i, u in enumerate(case["utxos"])
+        ]
 
     print(
         f"Case #{args.index} expect={case.get('expect')} "
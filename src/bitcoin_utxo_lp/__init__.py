@@ -1,13 +1,35 @@
 from importlib.metadata import PackageNotFoundError, version
 
-from .model import SimpleCoinSelectionModel
-from .solver import SimpleMILPSolver
+from .bnb import BranchAndBoundSolver
+from .cache import CacheInfo, CachingSolver
+from .digest import PoolDigest, pool_digest
+from .dp import ClassDPSolver
+from .feasibility import infeasibility_certificate
+from .model import (
+    AggregatedCoinSelectionModel,
+    CoinSelectionArrays,
+    InfeasibleSelectionError,
+    MinChangeRoundingError,
+    SimpleCoinSelectionModel,
+    SolverTimeoutError,
+)
+from .pool import UTXOPool
+from .presolve import PresolveResult, presolve
+from .quote import FeeQuote, FeeQuoteIndex, build_quote_index
+from .solver import HiGHSMILPSolver, SimpleMILPSolver
+from .sweep import FeeRatePiece, FeeRateSweep, sweep_fee_rates
 from .types import (
     UTXO,
+    CoinSelectionSolver,
+    Incumbent,
+    InfeasibilityCertificate,
     SelectionParams,
     SelectionResult,
+    SolveStats,
     TxSizing,
 )
+from .wallet import WalletPool
+from .window import LPWindowSolver
 
 try:
     __version__ = version("bitcoin-utxo-lp")
@@ -17,9 +39,37 @@ except PackageNotFoundError:  # pragma: no cover
 
 __all__ = [
     "UTXO",
+    "UTXOPool",
     "TxSizing",
     "SelectionParams",
     "SelectionResult",
+    "Incumbent",
+    "SolveStats",
+    "CoinSelectionSolver",
     "SimpleCoinSelectionModel",
+    "AggregatedCoinSelectionModel",
+    "CoinSelectionArrays",
+    "MinChangeRoundingError",
+    "InfeasibleSelectionError",
+    "SolverTimeoutError",
+    "InfeasibilityCertificate",
+    "infeasibility_certificate",
     "SimpleMILPSolver",
+    "HiGHSMILPSolver",
+    "ClassDPSolver",
+    "BranchAndBoundSolver",
+    "LPWindowSolver",
+    "PresolveResult",
+    "presolve",
+    "FeeQuote",
+    "FeeQuoteIndex",
+    "build_quote_index",
+    "CachingSolver",
+    "CacheInfo",
+    "PoolDigest",
+    "pool_digest",
+    "WalletPool",
+    "FeeRatePiece",
+    "FeeRateSweep",
+    "sweep_fee_rates",
 ]
@@ -0,0 +1,300 @@
+"""
+Runs PuLP's bundled CBC binary on a pulp.LpProblem directly.
+
+pulp.PULP_CBC_CMD throws the CBC log away (or only writes it to a file), but
+the log is the only place CBC reports its best bound, gap and improving
+incumbents. This module does the same MPS round trip as PuLP, reusing its
+writer and solution reader, while reading the log as CBC runs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import os
+import re
+import subprocess
+import tempfile
+import time
+import warnings
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import pulp
+
+_INCUMBENT_RE = re.compile(r"Integer solution of (\S+) found")
+_SUMMARY_RE = re.compile(r"^(Objective value|Lower bound|Enumerated nodes):\s+(\S+)")
+
+
+def _cbc_solver(**kwargs: Any) -> Any:
+    with warnings.catch_warnings():
+        # PULP_CBC_CMD is deprecated in favour of a system-wide COIN_CMD, but
+        # it is the CBC binary that ships with PuLP.
+        warnings.simplefilter("ignore", DeprecationWarning)
+        return pulp.PULP_CBC_CMD(msg=False, **kwargs)
+
+
+@dataclass(slots=True)
+class CBCLog:
+    """What CBC reported about the search, in objective units (incl. constant)."""
+
+    objective: float | None = None
+    best_bound: float | None = None
+    nodes: int | None = None
+    incumbents: list[float] = field(default_factory=list)
+    # Wall time writing the MPS/MST files, running CBC and reading its solution
+    write_seconds: float = 0.0
+    run_seconds: float = 0.0
+    read_seconds: float = 0.0
+    time_limit_seconds: float | None = None  # the limit CBC was given
+
+    @property
+    def out_of_time(self) -> bool:
+        """Whether CBC ran until its time limit."""
+        limit = self.time_limit_seconds
+        return limit is not None and self.run_seconds >= limit
+
+
+@dataclass(slots=True)
+class CBCRun:
+    """Files and command for one CBC invocation on a problem."""
+
+    prob: pulp.LpProblem
+    args: list[str]
+    mps_path: str
+    sol_path: str
+    mst_path: str | None
+    variables: list[pulp.LpVariable]
+    variable_names: dict[str, str]
+    constraint_names: dict[str, str]
+    log: CBCLog = field(default_factory=CBCLog)
+
+    @property
+    def offset(self) -> float:
+        # CBC does not see the objective's constant term
+        return float(self.prob.objective.constant)
+
+    def feed(self, line: str) -> float | None:
+        """
+        Parses one log line; returns the new incumbent objective (incl. the
+        constant) if the line reports an improving solution.
+        """
+        m = _INCUMBENT_RE.search(line)
+        if m is not None:
+            value = float(m.group(1)) + self.offset
+            if not self.log.incumbents or value < self.log.incumbents[-1]:
+                self.log.incumbents.append(value)
+                return value
+            return None
+
+        m = _SUMMARY_RE.match(line)
+        if m is not None:
+            key, raw = m.groups()
+            if key == "Objective value":
+                self.log.objective = float(raw) + self.offset
+            elif key == "Lower bound":
+                self.log.best_bound = float(raw) + self.offset
+            elif key == "Enumerated nodes":
+                self.log.nodes = int(raw)
+        return None
+
+    def cleanup(self) -> None:
+        for path in (self.mps_path, self.sol_path, self.mst_path):
+            if path is not None and os.path.exists(path):
+                os.remove(path)
+
+    def finish(self, returncode: int) -> int:
+        """
+        Reads CBC's solution back into the problem, removes the temp files
+        and returns the PuLP status. Raises RuntimeError if CBC failed.
+        """
+        started = time.perf_counter()
+        try:
+            if returncode != 0 or not os.path.exists(self.sol_path):
+                raise RuntimeError(f"CBC exited with code {returncode}")
+            status, values, _dj, _pi, _slacks, sol_status = _cbc_solver().readsol_MPS(
+                self.sol_path,
+                self.prob,
+                self.variables,
+                self.variable_names,
+                self.constraint_names,
+            )
+        except pulp.PulpSolverError as exc:
+            raise RuntimeError(f"Could not read CBC's solution: {exc}") from exc
+        finally:
+            self.cleanup()
+
+        self.prob.assignVarsVals(values)
+        self.prob.assignStatus(status, sol_status)
+        if self.log.best_bound is None and sol_status == pulp.LpSolutionOptimal:
+            self.log.best_bound = self.log.objective
+        self.log.read_seconds = time.perf_counter() - started
+        return int(status)
+
+
+def prepare(
+    prob: pulp.LpProblem,
+    *,
+    time_limit_seconds: float | None = None,
+    warm_start: bool = False,
+    options: list[str] | None = None,
+) -> CBCRun:
+    """
+    Writes the problem (and MIP start, if warm_start) and builds the CBC
+    command line, mirroring pulp.PULP_CBC_CMD.
+    """
+    started = time.perf_counter()
+    solver = _cbc_solver()
+    tmp_dir = tempfile.gettempdir()
+    stem = os.path.join(tmp_dir, f"{os.getpid()}-{id(prob)}-{os.urandom(4).hex()}")
+    mps_path, sol_path = f"{stem}.mps", f"{stem}.sol"
+    mst_path = f"{stem}.mst" if warm_start else None
+
+    try:
+        variables, variable_names, constraint_names, _obj = prob.writeMPS(
+            mps_path, rename=1
+        )
+        if mst_path is not None:
+            solver.writesol(mst_path, prob, variables, variable_names, constraint_names)
+    except BaseException:
+        for path in (mps_path, mst_path):
+            if path is not None and os.path.exists(path):
+                os.remove(path)
+        raise
+
+    args = [solver.path, mps_path]
+    if mst_path is not None:
+        args += ["-mips", mst_path]
+    if time_limit_seconds is not None:
+        args += ["-sec", str(time_limit_seconds)]
+    for option in options or []:
+        args += ["-" + option.split()[0], *option.split()[1:]]
+    args += ["-timeMode", "elapsed", "-solve", "-printingOptions", "all"]
+    args += ["-solution", sol_path]
+
+    return CBCRun(
+        prob=prob,
+        args=args,
+        mps_path=mps_path,
+        sol_path=sol_path,
+        mst_path=mst_path,
+        variables=variables,
+        variable_names=variable_names,
+        constraint_names=constraint_names,
+        log=CBCLog(
+            write_seconds=time.perf_counter() - started,
+            time_limit_seconds=time_limit_seconds,
+        ),
+    )
+
+
+def solve(
+    prob: pulp.LpProblem,
+    *,
+    time_limit_seconds: float | None = None,
+    warm_start: bool = False,
+    options: list[str] | None = None,
+    on_incumbent: Callable[[float], None] | None = None,
+) -> tuple[int, CBCLog]:
+    """
+    Synchronous CBC solve; calls on_incumbent(objective) for every improving
+    solution CBC logs. Returns (PuLP status, CBC log summary).
+    """
+    run = prepare(
+        prob,
+        time_limit_seconds=time_limit_seconds,
+        warm_start=warm_start,
+        options=options,
+    )
+    started = time.perf_counter()
+    try:
+        with subprocess.Popen(
+            run.args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            text=True,
+        ) as proc:
+            assert proc.stdout is not None
+            try:
+                for line in proc.stdout:
+                    value = run.feed(line)
+                    if value is not None and on_incumbent is not None:
+                        on_incumbent(value)
+            except BaseException:
+                proc.kill()
+                proc.wait()
+                raise
+            returncode = proc.wait()
+    except BaseException:
+        run.cleanup()
+        raise
+
+    run.log.run_seconds = time.perf_counter() - started
+    return run.finish(returncode), run.log
+
+
+def _discard_run(preparing: asyncio.Future[CBCRun]) -> None:
+    if not preparing.cancelled() and preparing.exception() is None:
+        preparing.result().cleanup()
+
+
+async def solve_async(
+    prob: pulp.LpProblem,
+    *,
+    time_limit_seconds: float | None = None,
+    warm_start: bool = False,
+    options: list[str] | None = None,
+) -> tuple[int, CBCLog]:
+    """
+    solve() for asyncio: CBC runs through asyncio.create_subprocess_exec and
+    the MPS/solution files are handled in a worker thread. If the awaiting
+    task is cancelled, CBC is killed before the cancellation propagates, and
+    files still being written are removed once the thread is done.
+    """
+    # A plain executor future rather than asyncio.to_thread's task, so that
+    # not even asyncio.run's shutdown cancels it: the thread cannot be
+    # stopped, and its files are removed when it finishes
+    writing = functools.partial(
+        prepare,
+        prob,
+        time_limit_seconds=time_limit_seconds,
+        warm_start=warm_start,
+        options=options,
+    )
+    preparing = asyncio.get_running_loop().run_in_executor(
+        None, contextvars.copy_context().run, writing
+    )
+    try:
+        run = await asyncio.shield(preparing)
+    except asyncio.CancelledError:
+        preparing.add_done_callback(_discard_run)
+        raise
+    started = time.perf_counter()
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *run.args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            stdin=asyncio.subprocess.DEVNULL,
+        )
+    except BaseException:
+        run.cleanup()
+        raise
+
+    try:
+        assert proc.stdout is not None
+        async for raw in proc.stdout:
+            run.feed(raw.decode(errors="replace"))
+        returncode = await proc.wait()
+    except BaseException:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        run.cleanup()
+        raise
+
+    run.log.run_seconds = time.perf_counter() - started
+    status = await asyncio.to_thread(run.finish, returncode)
+    return status, run.log
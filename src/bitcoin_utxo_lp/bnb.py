@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import heapq
+import math
+import time
+from dataclasses import dataclass, replace
+from typing import Callable
+
+import numpy as np
+import numpy.typing as npt
+
+from .feasibility import ensure_feasible
+from .metrics import instrumented
+from .model import SimpleCoinSelectionModel, SolverTimeoutError, utxo_weights
+from .presolve import presolve
+from .types import UTXO, Incumbent, SelectionResult
+
+
+@dataclass(frozen=True, slots=True)
+class _SearchOrder:
+    """
+    A pool sorted for the search (by decreasing effective value), with the
+    lookahead bounds over every suffix [i:].
+    """
+
+    order: npt.NDArray[np.intp]
+    values: list[int]
+    weights: list[int]
+    effective: list[int]  # in 1/4000 sats (sat/kvB times weight units), exact
+    lookahead: list[int]  # positive effective value left
+    best_ratio: list[float]  # best effective value per weight unit left
+    min_weight: list[float]  # smallest input left
+    required: int  # effective value needed: target + min_change + fixed fee
+
+    @classmethod
+    def of(cls, model: SimpleCoinSelectionModel) -> _SearchOrder:
+        p = model.params
+        rate = p.fee_rate_sat_per_kvb
+        values_arr, weights_arr = utxo_weights(model.utxos)
+        ensure_feasible(model, values_arr, weights_arr)
+        # Effective values in 1/4000 sats (sat/kvB times weight units), exact
+        effective_arr = 4000 * values_arr - rate * weights_arr
+
+        order = np.lexsort((weights_arr, -values_arr, -effective_arr))
+        values: list[int] = values_arr[order].tolist()
+        weights: list[int] = weights_arr[order].tolist()
+        effective: list[int] = effective_arr[order].tolist()
+
+        n = len(values)
+        lookahead = [0] * (n + 1)
+        best_ratio = [0.0] * (n + 1)
+        min_weight = [math.inf] * (n + 1)
+        for i in range(n - 1, -1, -1):
+            lookahead[i] = lookahead[i + 1] + max(effective[i], 0)
+            best_ratio[i] = max(best_ratio[i + 1], effective[i] / weights[i])
+            min_weight[i] = min(min_weight[i + 1], weights[i])
+
+        # Continuous requirement: sum(effective) >= target + min_change + fixed fee
+        fixed_fee = rate * model.fixed_weight()
+        required = 4000 * (p.target_sats + p.min_change_sats) + fixed_fee
+
+        return cls(
+            order=order,
+            values=values,
+            weights=weights,
+            effective=effective,
+            lookahead=lookahead,
+            best_ratio=best_ratio,
+            min_weight=min_weight,
+            required=required,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class BranchAndBoundSolver:
+    """
+    Depth-first branch-and-bound over UTXOs, in the spirit of Bitcoin Core's
+    BnB coin selection, minimising the total input size.
+
+    UTXOs are explored by decreasing effective value (value - fee_rate *
+    input_vbytes), always trying "include" before "exclude". A branch is cut
+    when:
+      - it is already feasible (adding inputs only makes it bigger),
+      - the remaining effective value cannot cover what is still missing,
+      - the smallest input size that could cover what is missing would not
+        beat the best selection found so far.
+    Runs of identical UTXOs are only branched on once.
+
+    The search stops after max_iterations visited nodes and returns the best
+    selection found so far, with is_optimal=False (SolverTimeoutError if it
+    found none). Runs on the presolved pool and needs no external solver.
+    """
+
+    max_iterations: int = 100_000
+
+    @instrumented("bnb")
+    def solve(
+        self,
+        model: SimpleCoinSelectionModel,
+        on_incumbent: Callable[[Incumbent], None] | None = None,
+    ) -> SelectionResult:
+        """
+        Solves the model; on_incumbent, if given, is called with every
+        improving selection as the search finds it.
+        """
+        started = time.perf_counter()
+        reduced = presolve(model).model
+
+        p = reduced.params
+        tree = _SearchOrder.of(reduced)
+        order = tree.order
+        values, weights, effective = tree.values, tree.weights, tree.effective
+        lookahead, best_ratio = tree.lookahead, tree.best_ratio
+        required = tree.required
+        n = len(values)
+
+        def picked(positions: list[int]) -> list[UTXO]:
+            return [reduced.utxos[k] for k in sorted(order[positions].tolist())]
+
+        best_weight: float = math.inf
+        best: list[int] | None = None
+
+        stack: list[int] = []
+        cur_value = 0
+        cur_weight = 0
+        cur_effective = 0
+        i = 0
+        iterations = 0
+
+        exhausted = False
+        while iterations < self.max_iterations:
+            iterations += 1
+
+            backtrack = False
+            missing = required - cur_effective
+            fee, tx_vbytes = reduced.fee_and_vbytes_for_weight(cur_weight)
+            if stack and cur_value - p.target_sats - fee >= p.min_change_sats:
+                if cur_weight < best_weight:
+                    best_weight = cur_weight
+                    best = list(stack)
+                    if on_incumbent is not None:
+                        on_incumbent(
+                            Incumbent(
+                                reduced.objective_for(tx_vbytes),
+                                time.perf_counter() - started,
+                                model.result_for(picked(best)),
+                            )
+                        )
+                backtrack = True
+            elif i >= n or lookahead[i] < missing:
+                backtrack = True
+            elif (
+                best_ratio[i] <= 0
+                or cur_weight + missing / best_ratio[i] >= best_weight
+            ):
+                backtrack = True
+
+            if backtrack:
+                if not stack:
+                    exhausted = True
+                    break
+
+                # Undo the last inclusion and explore it excluded instead,
+                # skipping the identical UTXOs that follow it.
+                j = stack.pop()
+                cur_value -= values[j]
+                cur_weight -= weights[j]
+                cur_effective -= effective[j]
+                i = j + 1
+                while i < n and values[i] == values[j] and weights[i] == weights[j]:
+                    i += 1
+                continue
+
+            stack.append(i)
+            cur_value += values[i]
+            cur_weight += weights[i]
+            cur_effective += effective[i]
+            i += 1
+
+        if best is None:
+            if not exhausted:
+                raise SolverTimeoutError(
+                    f"No solution found within {self.max_iterations} iterations"
+                )
+            raise RuntimeError("No feasible solution found")
+
+        result = model.result_for(picked(best))
+        return result if exhausted else replace(result, is_optimal=False)
+
+    def solve_top_k(
+        self, model: SimpleCoinSelectionModel, k: int
+    ) -> list[SelectionResult]:
+        """
+        The k best distinct selections (different sets of UTXOs), cheapest
+        first, e.g. to pick at random among near-optimal ones. Fewer are
+        returned if fewer selections are feasible.
+
+        One search collects them in a bounded heap and prunes against the
+        k-th best input size. To keep every alternative reachable, it runs
+        on the whole pool (presolve() only keeps the optimum), keeps
+        extending feasible selections, and branches on identical UTXOs
+        separately, so equal-cost selections of different UTXOs all count.
+        If max_iterations stops it, the selections found so far are
+        returned with is_optimal=False.
+        """
+        if k < 1:
+            raise ValueError("k must be >= 1")
+        model.validate()
+
+        p = model.params
+        tree = _SearchOrder.of(model)
+        order = tree.order
+        values, weights, effective = tree.values, tree.weights, tree.effective
+        lookahead, best_ratio = tree.lookahead, tree.best_ratio
+        min_weight, required = tree.min_weight, tree.required
+        n = len(values)
+
+        # Max-heap on input size of the k best: (-weight, -seq, positions)
+        best: list[tuple[int, int, tuple[int, ...]]] = []
+
+        def kth_weight() -> float:
+            return -best[0][0] if len(best) == k else math.inf
+
+        stack: list[int] = []
+        cur_value = 0
+        cur_weight = 0
+        cur_effective = 0
+        i = 0
+        arrived = False  # stack was just extended (not backtracked to)
+        iterations = 0
+
+        exhausted = False
+        while iterations < self.max_iterations:
+            iterations += 1
+
+            missing = required - cur_effective
+            fee, _tx_vbytes = model.fee_and_vbytes_for_weight(cur_weight)
+            if stack and cur_value - p.target_sats - fee >= p.min_change_sats:
+                if arrived and cur_weight < kth_weight():
+                    heapq.heappush(best, (-cur_weight, -iterations, tuple(stack)))
+                    if len(best) > k:
+                        heapq.heappop(best)
+                # Supersets are feasible too, if not too big
+                backtrack = i >= n or cur_weight + min_weight[i] >= kth_weight()
+            elif i >= n or lookahead[i] < missing:
+                backtrack = True
+            else:
+                backtrack = (
+                    best_ratio[i] <= 0
+                    or cur_weight + missing / best_ratio[i] >= kth_weight()
+                )
+
+            if backtrack:
+                if not stack:
+                    exhausted = True
+                    break
+
+                # Undo the last inclusion and explore it excluded instead
+                j = stack.pop()
+                cur_value -= values[j]
+                cur_weight -= weights[j]
+                cur_effective -= effective[j]
+                i = j + 1
+                arrived = False
+                continue
+
+            stack.append(i)
+            cur_value += values[i]
+            cur_weight += weights[i]
+            cur_effective += effective[i]
+            i += 1
+            arrived = True
+
+        if not best:
+            if not exhausted:
+                raise SolverTimeoutError(
+                    f"No solution found within {self.max_iterations} iterations"
+                )
+            raise RuntimeError("No feasible solution found")
+
+        results = []
+        for _weight, _seq, positions in sorted(best, reverse=True):
+            selected = [model.utxos[j] for j in sorted(order[list(positions)].tolist())]
+            result = model.result_for(selected)
+            results.append(result if exhausted else replace(result, is_optimal=False))
+        return results
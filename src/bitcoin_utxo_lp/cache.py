@@ -0,0 +1,137 @@
+"""
+Result cache for repeated selection requests (e.g. a preview then a confirm).
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from .digest import pool_digest
+from .model import SimpleCoinSelectionModel
+from .types import CoinSelectionSolver, SelectionParams, SelectionResult
+
+_CacheKey = tuple[type[SimpleCoinSelectionModel], bytes, SelectionParams]
+
+
+@dataclass(frozen=True, slots=True)
+class CacheInfo:
+    """Counters and current size of a CachingSolver."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    nbytes: int
+
+
+def _result_nbytes(result: SelectionResult) -> int:
+    # Approximate memory held by a cached result (UTXOs may be shared)
+    size = sys.getsizeof(result) + sys.getsizeof(result.selected)
+    for u in result.selected:
+        size += sys.getsizeof(u) + sys.getsizeof(u.txid)
+    return size
+
+
+class CachingSolver:
+    """
+    Wraps a solver and caches its results by (model class, pool digest,
+    params), so a repeated request returns the earlier SelectionResult
+    without solving again.
+
+      - The pool digest is order-independent (see digest.PoolDigest), so the
+        same UTXOs in another order hit the same entry; the cached result
+        selects UTXOs equal to (not necessarily identical to) the caller's.
+      - Digests of UTXOPools are computed once per pool; a caller that keeps
+        a PoolDigest up to date can pass digest= and skip hashing entirely.
+      - Least recently used entries are evicted beyond max_entries results or
+        max_bytes (estimated) of cached results.
+      - Only results are cached: a solve that raises is retried next time.
+        Anytime results (is_optimal=False) are cached like any other.
+
+    The wrapper is thread-safe; concurrent misses on the same key may each
+    solve.
+    """
+
+    def __init__(
+        self,
+        solver: CoinSelectionSolver,
+        *,
+        max_entries: int = 1024,
+        max_bytes: int | None = 64 * 1024 * 1024,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1")
+        self.solver = solver
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[_CacheKey, tuple[SelectionResult, int]] = (
+            OrderedDict()
+        )
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def solve(
+        self, model: SimpleCoinSelectionModel, digest: bytes | None = None
+    ) -> SelectionResult:
+        """
+        The cached result for model, solving it on a miss. digest, if given,
+        must be pool_digest(model.utxos) (e.g. PoolDigest.digest() of a pool
+        kept in sync with model.utxos).
+        """
+        key = (
+            type(model),
+            pool_digest(model.utxos) if digest is None else digest,
+            model.params,
+        )
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+
+        result = self.solver.solve(model)
+        self._store(key, result)
+        return result
+
+    def _store(self, key: _CacheKey, result: SelectionResult) -> None:
+        nbytes = _result_nbytes(result)
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._nbytes -= old[1]
+            self._entries[key] = (result, nbytes)
+            self._nbytes += nbytes
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._nbytes > self.max_bytes
+            ):
+                _, (_, freed) = self._entries.popitem(last=False)
+                self._nbytes -= freed
+                self._evictions += 1
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                nbytes=self._nbytes,
+            )
+
+    def clear(self) -> None:
+        """Drops all entries; the counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
@@ -0,0 +1,169 @@
+"""
+Order-independent digests of UTXO sets.
+
+Each UTXO is hashed to two 64-bit lanes from (txid, vout, value_sats, input
+weight units), and a set's digest is the lane-wise sum of its members'
+hashes modulo 2**64, plus the member count. The sum does not depend on the
+order, and adding or removing a UTXO updates it in O(1), so a wallet can
+keep the digest of a changing pool current instead of rehashing it.
+
+Hashes are computed in vectorised NumPy (a few ms for 100k UTXOs). They are
+fit for cache keys, not for authenticating a pool against an adversary.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import weakref
+from typing import Iterable, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from .pool import TXID_BYTES, UTXOPool
+from .types import UTXO
+from .units import to_weights
+
+# Lane seeds and splitmix64 finalizer constants
+_SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F)
+_M1 = np.uint64(0xBF58476D1CE4E5B9)
+_M2 = np.uint64(0x94D049BB133111EB)
+_MASK = (1 << 64) - 1
+
+
+def _mix(z: npt.NDArray[np.uint64]) -> npt.NDArray[np.uint64]:
+    z = (z ^ (z >> np.uint64(30))) * _M1
+    z = (z ^ (z >> np.uint64(27))) * _M2
+    return z ^ (z >> np.uint64(31))
+
+
+def _lane_sums(
+    txid: npt.NDArray[np.uint8],
+    vout: npt.NDArray[np.uint32],
+    value_sats: npt.NDArray[np.int64],
+    input_vbytes: npt.NDArray[np.floating],
+) -> tuple[int, int]:
+    # Sum over the UTXOs of each lane's hash, modulo 2**64
+    words = [
+        *np.ascontiguousarray(txid).view("<u8").T,
+        vout.astype(np.uint64),
+        value_sats.view(np.uint64),
+        to_weights(input_vbytes).view(np.uint64),
+    ]
+    sums = []
+    for seed in _SEEDS:
+        h = np.full(len(value_sats), seed, dtype=np.uint64)
+        for word in words:
+            h = _mix(h ^ word)
+        sums.append(int(h.sum(dtype=np.uint64)))
+    return sums[0], sums[1]
+
+
+def _txid_bytes(txid: str) -> bytes:
+    # Raw txid for hex txids (as UTXOPool stores them), a hash otherwise
+    if len(txid) == 2 * TXID_BYTES:
+        try:
+            return bytes.fromhex(txid)
+        except ValueError:
+            pass
+    return hashlib.blake2b(txid.encode(), digest_size=TXID_BYTES).digest()
+
+
+def _columns(
+    utxos: Sequence[UTXO],
+) -> tuple[
+    npt.NDArray[np.uint8],
+    npt.NDArray[np.uint32],
+    npt.NDArray[np.int64],
+    npt.NDArray[np.float64],
+]:
+    n = len(utxos)
+    raw = b"".join(_txid_bytes(u.txid) for u in utxos)
+    return (
+        np.frombuffer(raw, dtype=np.uint8).reshape(n, TXID_BYTES),
+        np.fromiter((u.vout for u in utxos), dtype=np.uint32, count=n),
+        np.fromiter((u.value_sats for u in utxos), dtype=np.int64, count=n),
+        np.fromiter((u.input_vbytes for u in utxos), dtype=np.float64, count=n),
+    )
+
+
+class PoolDigest:
+    """
+    Incrementally maintained digest of a multiset of UTXOs; see the module
+    docstring. Two pools with the same UTXOs, in any order, have the same
+    digest().
+    """
+
+    __slots__ = ("_lanes", "count")
+
+    def __init__(self, utxos: Sequence[UTXO] = ()) -> None:
+        self._lanes = (0, 0)
+        self.count = 0
+        self.update(utxos)
+
+    def _apply(self, utxos: Sequence[UTXO], sign: int) -> None:
+        if not len(utxos):
+            return
+        if isinstance(utxos, UTXOPool):
+            lanes = _lane_sums(
+                utxos.txid, utxos.vout, utxos.value_sats, utxos.input_vbytes
+            )
+        else:
+            lanes = _lane_sums(*_columns(utxos))
+        self._lanes = (
+            (self._lanes[0] + sign * lanes[0]) & _MASK,
+            (self._lanes[1] + sign * lanes[1]) & _MASK,
+        )
+        self.count += sign * len(utxos)
+
+    def update(self, utxos: Sequence[UTXO]) -> None:
+        """Adds UTXOs (a list or a UTXOPool)."""
+        self._apply(utxos, 1)
+
+    def add(self, utxo: UTXO) -> None:
+        self._apply([utxo], 1)
+
+    def remove(self, utxo: UTXO) -> None:
+        """Removes one UTXO; it must have been added."""
+        self._apply([utxo], -1)
+
+    def remove_all(self, utxos: Sequence[UTXO]) -> None:
+        self._apply(utxos, -1)
+
+    def copy(self) -> PoolDigest:
+        other = PoolDigest()
+        other._lanes, other.count = self._lanes, self.count
+        return other
+
+    def digest(self) -> bytes:
+        """24 bytes: the two lane sums and the count."""
+        return b"".join(
+            x.to_bytes(8, "little") for x in (*self._lanes, self.count & _MASK)
+        )
+
+    def hexdigest(self) -> str:
+        return self.digest().hex()
+
+
+# Digests of UTXOPools already hashed; pools are treated as immutable
+_POOL_DIGESTS: weakref.WeakKeyDictionary[UTXOPool, bytes] = weakref.WeakKeyDictionary()
+_POOL_DIGESTS_LOCK = threading.Lock()
+
+
+def pool_digest(utxos: Sequence[UTXO] | Iterable[UTXO]) -> bytes:
+    """
+    PoolDigest(utxos).digest(). For a UTXOPool the digest is computed once
+    and remembered for the pool's lifetime.
+    """
+    if not isinstance(utxos, UTXOPool):
+        items = utxos if isinstance(utxos, Sequence) else list(utxos)
+        return PoolDigest(items).digest()
+
+    with _POOL_DIGESTS_LOCK:
+        known = _POOL_DIGESTS.get(utxos)
+    if known is None:
+        known = PoolDigest(utxos).digest()
+        with _POOL_DIGESTS_LOCK:
+            _POOL_DIGESTS[utxos] = known
+    return known
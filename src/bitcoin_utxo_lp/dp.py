@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+
+from .feasibility import ensure_feasible
+from .heuristics import greedy_indices
+from .metrics import instrumented
+from .model import SimpleCoinSelectionModel, utxo_weights
+from .presolve import presolve
+from .types import SelectionResult
+from .units import WITNESS_SCALE_FACTOR
+
+
+@dataclass(frozen=True, slots=True)
+class ClassDPSolver:
+    """
+    Exact solver for pools with a few distinct input sizes (e.g. 58/68/91/148).
+
+    The fee depends only on the total input size, and for a given number of
+    inputs from one size class the best choice is always the highest-valued
+    UTXOs of that class. So a DP over the total input size, combining the
+    per-class prefix sums of sorted values, gives the largest reachable input
+    value for every size; the smallest size whose value covers
+    target + fee + min_change is the optimum.
+
+    Sizes are counted in units of the largest weight that divides every
+    input's weight (e.g. 4 WU = 1 vbyte for whole-vbyte inputs). Results use
+    the same integer fee rounding as SimpleCoinSelectionModel's
+    evaluate_fee_and_vbytes(), and the DP runs on the presolved pool.
+    """
+
+    max_table_cells: int = 50_000_000  # classes x sizes guard
+
+    @instrumented("dp")
+    def solve(self, model: SimpleCoinSelectionModel) -> SelectionResult:
+        reduced = presolve(model).model
+
+        p = reduced.params
+        values, weights = utxo_weights(reduced.utxos)
+        ensure_feasible(reduced, values, weights)
+
+        unit = max(int(np.gcd.reduce(weights)), 1) if weights.size else 1
+        sizes = weights // unit
+        classes, class_of = np.unique(sizes, return_inverse=True)
+
+        # Largest total input size worth looking at (in units)
+        greedy = greedy_indices(reduced, values, weights)
+        if greedy is None:
+            horizon = int(sizes.sum())
+        else:
+            _fee, tx_vbytes = reduced.fee_and_vbytes_for_weight(
+                int(weights[greedy].sum())
+            )
+            max_input_weight = WITNESS_SCALE_FACTOR * tx_vbytes - reduced.fixed_weight()
+            horizon = max_input_weight // unit
+
+        if classes.size * (horizon + 1) > self.max_table_cells:
+            raise ValueError(
+                f"DP table too large ({classes.size} classes x {horizon + 1} sizes)"
+            )
+
+        # best[t]: largest input value with total (scaled) input size exactly t
+        best = np.full(horizon + 1, -np.inf)
+        best[0] = 0.0
+        members: list[npt.NDArray[np.intp]] = []
+        choices: list[npt.NDArray[np.int32]] = []
+
+        for c, size in enumerate(classes.tolist()):
+            idx = np.flatnonzero(class_of == c)
+            idx = idx[np.argsort(-values[idx], kind="stable")]
+            prefix = np.concatenate(([0.0], np.cumsum(values[idx], dtype=np.float64)))
+
+            nxt = best.copy()
+            choice = np.zeros(horizon + 1, dtype=np.int32)
+            for k in range(1, min(idx.size, horizon // size) + 1):
+                shift = k * size
+                cand = best[: horizon + 1 - shift] + prefix[k]
+                better = cand > nxt[shift:]
+                nxt[shift:][better] = cand[better]
+                choice[shift:][better] = k
+
+            best = nxt
+            members.append(idx)
+            choices.append(choice)
+
+        fee = reduced.fees_for_weights(np.arange(horizon + 1, dtype=np.int64) * unit)
+        feasible = np.flatnonzero(best - p.target_sats - fee >= p.min_change_sats)
+        feasible = feasible[feasible > 0]
+        if feasible.size == 0:
+            raise RuntimeError("No feasible solution found")
+
+        # Walk the choices back from the smallest feasible size
+        t = int(feasible[0])
+        picked: list[int] = []
+        for c in reversed(range(classes.size)):
+            k = int(choices[c][t])
+            picked.extend(members[c][:k].tolist())
+            t -= k * int(classes[c])
+
+        return model.result_for([reduced.utxos[i] for i in sorted(picked)])
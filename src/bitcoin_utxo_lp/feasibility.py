@@ -0,0 +1,83 @@
+"""
+Fast infeasibility check, run before any MILP is built.
+
+Change of a selection S is at most sum(v_i - fee_rate * s_i for i in S)
+- fee_rate * fixed_vbytes - target_sats (rounding the fee up only lowers
+it), and that sum is largest when S is every UTXO with positive effective
+value. If even that leaves less than min_change_sats, no selection is
+feasible. The bound is computed exactly, in 1/4000 sats (sat/kvB times
+weight units).
+
+The converse does not quite hold: a request can still fail by a few sats of
+fee rounding, which the solvers report as before.
+
+The UTXOs with positive effective value at any rate are those whose value
+density (value_sats per weight unit) is above the rate, i.e. a prefix of
+the pool sorted by density. A FeeQuoteIndex keeps that order with prefix
+sums, so FeeQuoteIndex.infeasibility_certificate() finds the same bound in
+O(log n) per request instead of this module's O(n) pass.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import numpy.typing as npt
+
+from .model import InfeasibleSelectionError, SimpleCoinSelectionModel, utxo_weights
+from .types import InfeasibilityCertificate
+
+# Fee units per sat in the bound: sat/kvB times weight units
+_SCALE = 4000
+
+
+def infeasibility_certificate(
+    model: SimpleCoinSelectionModel,
+    values: npt.NDArray[np.int64] | None = None,
+    weights: npt.NDArray[np.int64] | None = None,
+) -> InfeasibilityCertificate | None:
+    """
+    Returns a certificate if no selection of model.utxos is feasible, and
+    None if one may be. values/weights are the utxo_weights() of the model,
+    when the caller already has them.
+
+    One vectorised pass over the pool; no model is built.
+    """
+    if values is None or weights is None:
+        values, weights = utxo_weights(model.utxos)
+
+    useful = _SCALE * values - model.params.fee_rate_sat_per_kvb * weights > 0
+    return certificate_for_useful(
+        model, int(values[useful].sum()), int(weights[useful].sum())
+    )
+
+
+def certificate_for_useful(
+    model: SimpleCoinSelectionModel, total_in_sats: int, input_weight: int
+) -> InfeasibilityCertificate | None:
+    """
+    The certificate (or None) given the total value and weight of the
+    UTXOs with positive effective value at the model's fee rate.
+    """
+    p = model.params
+    fee = p.fee_rate_sat_per_kvb * (model.fixed_weight() + input_weight)
+    best_change = (_SCALE * (total_in_sats - p.target_sats) - fee) // _SCALE
+    if best_change >= p.min_change_sats:
+        return None
+    return InfeasibilityCertificate(
+        shortfall_sats=p.min_change_sats - best_change,
+        best_change_sats=best_change,
+    )
+
+
+def ensure_feasible(
+    model: SimpleCoinSelectionModel,
+    values: npt.NDArray[np.int64] | None = None,
+    weights: npt.NDArray[np.int64] | None = None,
+) -> None:
+    """
+    Raises InfeasibleSelectionError (a RuntimeError) with the certificate if
+    infeasibility_certificate() finds one.
+    """
+    certificate = infeasibility_certificate(model, values, weights)
+    if certificate is not None:
+        raise InfeasibleSelectionError(certificate)
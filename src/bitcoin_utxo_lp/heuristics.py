@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import bisect
+
+import numpy as np
+import numpy.typing as npt
+
+from .model import SimpleCoinSelectionModel
+
+
+def largest_first(
+    model: SimpleCoinSelectionModel,
+    values: npt.NDArray[np.int64],
+    weights: npt.NDArray[np.int64],
+) -> npt.NDArray[np.intp] | None:
+    """
+    Takes UTXOs by decreasing effective value (value - fee_rate * vbytes)
+    until the selection is feasible, and returns the indices taken.
+    weights are the input sizes in weight units (see utxo_weights()).
+
+    Returns None if no prefix of that order is feasible.
+    """
+    p = model.params
+
+    # Effective value in 1/4000 sats (sat/kvB times weight units), exact
+    effective = 4000 * values - p.fee_rate_sat_per_kvb * weights
+    order = np.argsort(-effective, kind="stable")
+    total_in = np.cumsum(values[order])
+    fees = model.fees_for_weights(np.cumsum(weights[order]))
+    change = total_in - p.target_sats - fees
+
+    feasible = np.flatnonzero(change >= p.min_change_sats)
+    if feasible.size == 0:
+        return None
+    return order[: feasible[0] + 1]
+
+
+def improve(
+    model: SimpleCoinSelectionModel,
+    values: npt.NDArray[np.int64],
+    weights: npt.NDArray[np.int64],
+    selected: npt.NDArray[np.intp],
+) -> npt.NDArray[np.intp]:
+    """
+    Local improvement of a feasible selection. Repeatedly, largest inputs
+    first:
+      - drops an input if the rest is still feasible, or
+      - swaps it for the best unselected UTXO of the smallest size class
+        that keeps the selection feasible.
+    Every step shrinks the total input size, so this terminates.
+    """
+    p = model.params
+    chosen = set(selected.tolist())
+    total = int(values[selected].sum())
+    input_weight = int(weights[selected].sum())
+
+    def slack(total_in: int, in_weight: int) -> int:
+        fee, _ = model.fee_and_vbytes_for_weight(in_weight)
+        return total_in - p.target_sats - fee - p.min_change_sats
+
+    # Unselected UTXOs per size class, as (value, index) sorted ascending.
+    # Swaps never take more than len(selected) UTXOs from one class, so only
+    # the top 2 * len(selected) of each class can matter.
+    order = np.lexsort((-values, weights))
+    sorted_weights = weights[order]
+    rank = np.arange(order.size) - np.searchsorted(sorted_weights, sorted_weights)
+    sizes: list[int] = np.unique(weights).tolist()
+    pools: dict[int, list[tuple[int, int]]] = {size: [] for size in sizes}
+    for k in order[rank < 2 * len(chosen)][::-1].tolist():
+        if k not in chosen:
+            pools[int(weights[k])].append((int(values[k]), k))
+
+    improved = True
+    while improved:
+        improved = False
+        for i in sorted(chosen, key=lambda k: (-weights[k], values[k], k)):
+            v_i, s_i = int(values[i]), int(weights[i])
+
+            if slack(total - v_i, input_weight - s_i) >= 0:
+                chosen.remove(i)
+                total -= v_i
+                input_weight -= s_i
+                bisect.insort(pools[s_i], (v_i, i))
+                improved = True
+                break
+
+            for size in sizes:
+                if size >= s_i:
+                    break
+                pool = pools[size]
+                if not pool:
+                    continue
+                v_j, j = pool[-1]
+                if slack(total - v_i + v_j, input_weight - s_i + size) >= 0:
+                    pool.pop()
+                    chosen.remove(i)
+                    chosen.add(j)
+                    total += v_j - v_i
+                    input_weight += size - s_i
+                    bisect.insort(pools[s_i], (v_i, i))
+                    improved = True
+                    break
+            if improved:
+                break
+
+    return np.array(sorted(chosen), dtype=np.intp)
+
+
+def greedy_indices(
+    model: SimpleCoinSelectionModel,
+    values: npt.NDArray[np.int64],
+    weights: npt.NDArray[np.int64],
+) -> npt.NDArray[np.intp] | None:
+    """
+    Fast feasible selection: largest_first() followed by improve().
+    Returns sorted indices into values/weights, or None if none was found.
+    """
+    selected = largest_first(model, values, weights)
+    if selected is None:
+        return None
+    return improve(model, values, weights, selected)
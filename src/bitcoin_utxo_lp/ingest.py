@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import contextlib
+import csv
+import heapq
+import json
+import math
+import os
+from typing import IO, Iterable, Iterator
+
+from .heuristics import greedy_indices
+from .model import SimpleCoinSelectionModel, utxo_weights
+from .pool import UTXOPool
+from .types import UTXO, SelectionParams
+from .units import WITNESS_SCALE_FACTOR, to_weight
+
+Source = str | os.PathLike[str] | IO[str]
+
+
+def _open(source: Source) -> contextlib.AbstractContextManager[IO[str]]:
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, newline="", encoding="utf-8")
+    return contextlib.nullcontext(source)
+
+
+def _utxo(record: dict[str, object], where: str) -> UTXO:
+    try:
+        return UTXO(
+            txid=str(record["txid"]),
+            vout=int(str(record["vout"])),
+            value_sats=int(str(record["value_sats"])),
+            input_vbytes=float(str(record["input_vbytes"])),
+        )
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid UTXO record at {where}: {exc}") from exc
+
+
+def read_jsonl(source: Source) -> Iterator[UTXO]:
+    """
+    Yields UTXOs from a JSON Lines file (one object with txid, vout,
+    value_sats and input_vbytes per line), one line at a time. Blank lines
+    are skipped.
+    """
+    with _open(source) as f:
+        for lineno, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"Invalid JSON at line {lineno}: {exc}") from exc
+            if not isinstance(record, dict):
+                raise ValueError(f"Invalid UTXO record at line {lineno}")
+            yield _utxo(record, f"line {lineno}")
+
+
+def read_csv(source: Source) -> Iterator[UTXO]:
+    """
+    Yields UTXOs from a CSV file with a txid,vout,value_sats,input_vbytes
+    header, one row at a time.
+    """
+    with _open(source) as f:
+        reader = csv.DictReader(f)
+        for record in reader:
+            yield _utxo(dict(record), f"line {reader.line_num}")
+
+
+def top_k_candidates(
+    utxos: Iterable[UTXO],
+    params: SelectionParams,
+    *,
+    chunk_size: int = 10_000,
+) -> UTXOPool:
+    """
+    Streams UTXOs and keeps only those that can be part of an optimal
+    selection for any request at most as demanding as params (target_sats
+    and fee_rate_sat_per_vb are upper bounds; same sizing and min_change).
+
+    This is presolve()'s top-K-per-class reduction done online: a greedy
+    feasible selection among the candidates kept so far bounds the optimal
+    input size, hence how many UTXOs of each input_vbytes class can matter,
+    and every class keeps only that many of its highest-valued UTXOs in a
+    min-heap. The bound is refreshed every chunk_size records, so memory
+    depends on the candidate count plus one chunk, not on the input size.
+
+    Returns the candidates as a UTXOPool in input order.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+
+    # Per input size class (weight units): min-heap of (value_sats, -seq, utxo)
+    heaps: dict[int, list[tuple[int, int, UTXO]]] = {}
+    max_input_weight = math.inf
+
+    def cap(size: int) -> float:
+        # Most UTXOs of this input size an optimal selection can use
+        if math.isinf(max_input_weight) or size <= 0:
+            return math.inf
+        return max_input_weight // size
+
+    def tighten() -> None:
+        nonlocal max_input_weight
+        items = [item for heap in heaps.values() for item in heap]
+        if not items:
+            return
+        model = SimpleCoinSelectionModel([u for _, _, u in items], params)
+        values, weights = utxo_weights(model.utxos)
+        greedy = greedy_indices(model, values, weights)
+        if greedy is None:
+            return
+        _fee, tx_vbytes = model.fee_and_vbytes_for_weight(int(weights[greedy].sum()))
+        max_input_weight = min(
+            max_input_weight, WITNESS_SCALE_FACTOR * tx_vbytes - model.fixed_weight()
+        )
+        for size, heap in heaps.items():
+            while len(heap) > cap(size):
+                heapq.heappop(heap)
+
+    for seq, utxo in enumerate(utxos, start=1):
+        size = to_weight(utxo.input_vbytes)
+        heap = heaps.setdefault(size, [])
+        item = (utxo.value_sats, -seq, utxo)
+        if len(heap) < cap(size):
+            heapq.heappush(heap, item)
+        elif heap and item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+        if seq % chunk_size == 0:
+            tighten()
+    tighten()
+
+    kept = sorted(
+        (item for heap in heaps.values() for item in heap), key=lambda t: -t[1]
+    )
+    return UTXOPool.from_utxos(u for _, _, u in kept)
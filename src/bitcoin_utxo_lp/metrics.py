@@ -0,0 +1,254 @@
+"""
+Process-wide solve metrics: latency histograms per backend and pool-size
+bucket, and outcome counters.
+
+Every solver records each solve() into REGISTRY. Outcomes are:
+  - ok: an optimal selection,
+  - timeout: a limit (CBC/HiGHS time limit, BnB iteration cap) stopped the
+    search, with the best selection found so far (is_optimal=False) or with
+    none (a SolverTimeoutError),
+  - rounding_failure: a MinChangeRoundingError,
+  - infeasible: any other RuntimeError (no feasible selection returned),
+  - error: any other exception (e.g. invalid params).
+
+Only the outermost solve() is recorded: the sub-pool solves LPWindowSolver
+runs through its stage-2 solver count as part of its own lp_window solve.
+
+The registry lives in the process that solved; solves run through
+parallel.solve_batch are recorded in the worker processes.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextvars
+import functools
+import math
+import threading
+import time
+from typing import Any, Callable, Sequence, TypeVar, cast
+
+from .model import (
+    MinChangeRoundingError,
+    SimpleCoinSelectionModel,
+    SolverTimeoutError,
+)
+from .types import SelectionResult
+
+# Histogram upper bounds, in seconds and in UTXOs (the last bucket is +Inf)
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+POOL_SIZE_BUCKETS = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+OUTCOMES = ("ok", "timeout", "rounding_failure", "infeasible", "error")
+
+_PREFIX = "bitcoin_utxo_lp"
+
+
+def _le(bound: float) -> str:
+    # Prometheus bucket label: "0.005", "1000", "+Inf"
+    if math.isinf(bound):
+        return "+Inf"
+    return f"{bound:g}" if isinstance(bound, float) else str(bound)
+
+
+def outcome_of(
+    result: SelectionResult | None = None, error: BaseException | None = None
+) -> str:
+    """Outcome label for a finished solve (see the module docstring)."""
+    if error is not None:
+        if isinstance(error, MinChangeRoundingError):
+            return "rounding_failure"
+        if isinstance(error, SolverTimeoutError):
+            return "timeout"
+        if isinstance(error, RuntimeError):
+            return "infeasible"
+        return "error"
+    if result is not None and not result.is_optimal:
+        return "timeout"
+    return "ok"
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, n_buckets: int) -> None:
+        self.counts = [0] * (n_buckets + 1)  # per bucket, not cumulative
+        self.sum = 0.0
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store for solve latencies and outcomes. Recording a solve
+    is a bisect and a few dict updates under a lock.
+    """
+
+    def __init__(
+        self,
+        latency_buckets: Sequence[float] = LATENCY_BUCKETS,
+        pool_size_buckets: Sequence[int] = POOL_SIZE_BUCKETS,
+    ) -> None:
+        self.latency_buckets = tuple(sorted(latency_buckets))
+        self.pool_size_buckets = tuple(sorted(pool_size_buckets))
+        self._lock = threading.Lock()
+        self._histograms: dict[tuple[str, str], _Histogram] = {}
+        self._outcomes: dict[tuple[str, str], int] = {}
+
+    def pool_size_bucket(self, pool_size: int) -> str:
+        """Label of the smallest pool-size bucket holding pool_size UTXOs."""
+        i = bisect.bisect_left(self.pool_size_buckets, pool_size)
+        if i == len(self.pool_size_buckets):
+            return "+Inf"
+        return _le(self.pool_size_buckets[i])
+
+    def observe_solve(
+        self, backend: str, pool_size: int, seconds: float, outcome: str
+    ) -> None:
+        """Records one solve of a pool_size-UTXO model."""
+        if outcome not in OUTCOMES:
+            raise ValueError(f"Unknown outcome {outcome!r}")
+        key = (backend, self.pool_size_bucket(pool_size))
+        bucket = bisect.bisect_left(self.latency_buckets, seconds)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = _Histogram(len(self.latency_buckets))
+            hist.counts[bucket] += 1
+            hist.sum += seconds
+            counter = (backend, outcome)
+            self._outcomes[counter] = self._outcomes.get(counter, 0) + 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._outcomes.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Plain-dict copy of the metrics:
+          {"solve_seconds": {backend: {pool_size_bucket: {"buckets": {le:
+          cumulative count}, "sum": seconds, "count": n}}},
+           "solves_total": {backend: {outcome: n}}}
+        """
+        bounds = [*self.latency_buckets, math.inf]
+        latencies: dict[str, dict[str, dict[str, Any]]] = {}
+        outcomes: dict[str, dict[str, int]] = {}
+        with self._lock:
+            for (backend, pool), hist in sorted(self._histograms.items()):
+                cumulative, buckets = 0, {}
+                for bound, count in zip(bounds, hist.counts):
+                    cumulative += count
+                    buckets[_le(bound)] = cumulative
+                latencies.setdefault(backend, {})[pool] = {
+                    "buckets": buckets,
+                    "sum": hist.sum,
+                    "count": cumulative,
+                }
+            for (backend, outcome), n in sorted(self._outcomes.items()):
+                outcomes.setdefault(backend, {})[outcome] = n
+        return {"solve_seconds": latencies, "solves_total": outcomes}
+
+    def to_prometheus(self) -> str:
+        """Renders the metrics in the Prometheus text exposition format."""
+        snap = self.snapshot()
+        lines = [
+            f"# HELP {_PREFIX}_solve_seconds Wall time of solve() calls.",
+            f"# TYPE {_PREFIX}_solve_seconds histogram",
+        ]
+        for backend, pools in snap["solve_seconds"].items():
+            for pool, hist in pools.items():
+                labels = f'backend="{backend}",pool_size="{pool}"'
+                for le, count in hist["buckets"].items():
+                    lines.append(
+                        f'{_PREFIX}_solve_seconds_bucket{{{labels},le="{le}"}} {count}'
+                    )
+                lines.append(f"{_PREFIX}_solve_seconds_sum{{{labels}}} {hist['sum']!r}")
+                lines.append(
+                    f"{_PREFIX}_solve_seconds_count{{{labels}}} {hist['count']}"
+                )
+
+        lines += [
+            f"# HELP {_PREFIX}_solves_total Finished solve() calls by outcome.",
+            f"# TYPE {_PREFIX}_solves_total counter",
+        ]
+        for backend, counts in snap["solves_total"].items():
+            for outcome, n in counts.items():
+                lines.append(
+                    f'{_PREFIX}_solves_total{{backend="{backend}",'
+                    f'outcome="{outcome}"}} {n}'
+                )
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def record_solve(
+    backend: str,
+    pool_size: int,
+    started: float,
+    result: SelectionResult | None = None,
+    error: BaseException | None = None,
+) -> None:
+    """
+    Records a solve that began at time.perf_counter() == started and ended
+    now with result or error, into REGISTRY.
+    """
+    elapsed = time.perf_counter() - started
+    REGISTRY.observe_solve(backend, pool_size, elapsed, outcome_of(result, error))
+
+
+_F = TypeVar("_F", bound=Callable[..., SelectionResult])
+
+# Set while an instrumented solve() runs, so solves inside it are not recorded
+_solving: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "_solving", default=False
+)
+
+
+def instrumented(backend: str | Callable[[Any], str]) -> Callable[[_F], _F]:
+    """
+    Decorates a solver's solve(self, model, ...) method to record every call
+    into REGISTRY, unless it runs inside another instrumented solve().
+    backend is the label, or a function of the solver giving it (e.g. to
+    tell a MILP solver's fast mode apart).
+    """
+
+    def decorate(solve: _F) -> _F:
+        @functools.wraps(solve)
+        def wrapper(
+            self: Any, model: SimpleCoinSelectionModel, *args: Any, **kwargs: Any
+        ) -> SelectionResult:
+            if _solving.get():
+                return solve(self, model, *args, **kwargs)
+            label = backend if isinstance(backend, str) else backend(self)
+            started = time.perf_counter()
+            token = _solving.set(True)
+            try:
+                result = solve(self, model, *args, **kwargs)
+            except Exception as exc:
+                record_solve(label, len(model.utxos), started, error=exc)
+                raise
+            finally:
+                _solving.reset(token)
+            record_solve(label, len(model.utxos), started, result)
+            return result
+
+        return cast(_F, wrapper)
+
+    return decorate
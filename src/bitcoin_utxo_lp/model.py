@@ -1,12 +1,109 @@
 from __future__ import annotations
 
-import math
 from dataclasses import dataclass
 from typing import Sequence
 
+import numpy as np
+import numpy.typing as npt
 import pulp
+from scipy import sparse
 
-from .types import UTXO, SelectionParams
+from .pool import UTXOPool
+from .types import UTXO, InfeasibilityCertificate, SelectionParams, SelectionResult
+from .units import fee_for, to_weight, to_weights, vbytes_for
+
+
+def utxo_columns(
+    utxos: Sequence[UTXO],
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+    """
+    Returns (value_sats, input_vbytes) as NumPy arrays aligned with utxos.
+    """
+    if isinstance(utxos, UTXOPool):
+        return utxos.value_sats, utxos.input_vbytes.astype(np.float64)
+
+    n = len(utxos)
+    values = np.fromiter((u.value_sats for u in utxos), dtype=np.int64, count=n)
+    vbytes = np.fromiter((u.input_vbytes for u in utxos), dtype=np.float64, count=n)
+    return values, vbytes
+
+
+def utxo_weights(
+    utxos: Sequence[UTXO],
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """
+    Returns (value_sats, input weight units) as NumPy arrays aligned with
+    utxos; sizes are rounded up to whole weight units (see units.py).
+    """
+    values, vbytes = utxo_columns(utxos)
+    return values, to_weights(vbytes)
+
+
+def utxo_subset(utxos: Sequence[UTXO], indices: Sequence[int]) -> Sequence[UTXO]:
+    """
+    The UTXOs at the given indices, as a UTXOPool if utxos is one.
+    """
+    if isinstance(utxos, UTXOPool):
+        return utxos.take(indices)
+    return [utxos[i] for i in indices]
+
+
+class InfeasibleSelectionError(RuntimeError):
+    """
+    No selection can pay the target, the fee and min_change_sats; see
+    feasibility.py. The certificate says by how much.
+    """
+
+    def __init__(self, certificate: InfeasibilityCertificate) -> None:
+        super().__init__(
+            "No feasible solution: the best selection leaves at most "
+            f"{certificate.best_change_sats} sats of change, "
+            f"{certificate.shortfall_sats} sats short of min_change_sats"
+        )
+        self.certificate = certificate
+
+    def __reduce__(self) -> tuple[type[InfeasibleSelectionError], tuple[object]]:
+        # Rebuild from the certificate, e.g. when sent back from a worker
+        return type(self), (self.certificate,)
+
+
+class MinChangeRoundingError(RuntimeError):
+    """
+    A selection passed to result_for() leaves less than min_change_sats once
+    the fee is rounded up to whole sats and vbytes. The solvers optimise the
+    rounded fee itself, so their selections never do.
+    """
+
+
+class SolverTimeoutError(RuntimeError):
+    """
+    A time limit or iteration cap stopped the search before it found any
+    feasible selection. The model may well be feasible.
+    """
+
+
+@dataclass(frozen=True, slots=True)
+class CoinSelectionArrays:
+    """
+    Array form of the simple coin-selection MILP, ready for matrix solvers.
+
+    Column layout is [x_0, ..., x_{n-1}, change_sats, tx_vbytes, fee_sats];
+    the problem is:
+      minimise    objective @ z + objective_offset
+      subject to  constraint_lb <= constraint_matrix @ z <= constraint_ub
+                  lower_bounds <= z <= upper_bounds
+                  z[j] integral where integrality[j] == 1
+    """
+
+    objective: npt.NDArray[np.float64]
+    objective_offset: float
+    constraint_matrix: sparse.csr_array
+    constraint_lb: npt.NDArray[np.float64]
+    constraint_ub: npt.NDArray[np.float64]
+    lower_bounds: npt.NDArray[np.float64]
+    upper_bounds: npt.NDArray[np.float64]
+    integrality: npt.NDArray[np.int8]
+    n_choice: int  # number of leading selection columns
 
 
 @dataclass(frozen=True, slots=True)
@@ -16,94 +113,340 @@ class SimpleCoinSelectionModel:
       - always includes a change output
       - enforces change >= min_change_sats
       - minimises fee (equivalently minimises total input vbytes)
+
+    Sizes are whole weight units and the fee rate whole sat/kvB (see
+    units.py), so the model's fee is exactly the reported one.
     """
 
     utxos: Sequence[UTXO]
     params: SelectionParams
 
-    def _ceil_int(self, x: float) -> int:
-        # vbytes should be treated as an integer for fee calculation
-        return math.ceil(x)
+    def fixed_weight(self) -> int:
+        """Weight units of everything but the inputs."""
+        sizing = self.params.sizing
+        return (
+            to_weight(sizing.base_overhead_vbytes)
+            + to_weight(sizing.recipient_output_vbytes)
+            + to_weight(sizing.change_output_vbytes)
+        )
 
     def fixed_vbytes(self) -> float:
+        return self.fixed_weight() / 4
+
+    def validate(self) -> None:
         p = self.params
-        return (
-            p.sizing.base_overhead_vbytes
-            + p.sizing.recipient_output_vbytes
-            + p.sizing.change_output_vbytes
+
+        if p.target_sats < 0:
+            raise ValueError("target_sats must be >= 0")
+        if p.min_change_sats < 0:
+            raise ValueError("min_change_sats must be >= 0")
+        if p.fee_rate_sat_per_vb <= 0:
+            raise ValueError("fee_rate_sat_per_vb must be > 0")
+        if not self.utxos:
+            raise ValueError("No UTXOs provided")
+
+    def choice_columns(
+        self,
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """
+        Returns (value_sats, input weight units, max_count) per selection
+        column. Here every UTXO is its own 0/1 column.
+        """
+        values, weights = utxo_weights(self.utxos)
+        return values, weights, np.ones(len(values), dtype=np.int64)
+
+    def choice_values(self, selected: Sequence[int]) -> list[int]:
+        """
+        Selection column values for a selection given as indices into
+        self.utxos (e.g. to warm-start a solver).
+        """
+        chosen = set(selected)
+        return [1 if i in chosen else 0 for i in range(len(self.utxos))]
+
+    def choice_variables(self) -> list[pulp.LpVariable]:
+        """
+        Fresh PuLP variables for the selection columns, as used by build().
+        """
+        # Decision variables: x_i in {0,1}
+        return [
+            pulp.LpVariable(f"x_{i}", lowBound=0, upBound=1, cat=pulp.LpBinary)
+            for i in range(len(self.utxos))
+        ]
+
+    def build_arrays(self) -> CoinSelectionArrays:
+        """
+        Builds the same problem as build(), but as NumPy arrays and a sparse
+        constraint matrix, without creating any per-variable Python objects.
+        """
+        self.validate()
+
+        p = self.params
+        rate = p.fee_rate_sat_per_kvb
+        values, weights, counts = self.choice_columns()
+        n = len(values)
+        change, tx_vbytes, fee = n, n + 1, n + 2
+
+        # Rows, all with integral coefficients:
+        #   balance:  sum(v_i * x_i) - change - fee = target
+        #   weight:   sum(-w_i * x_i) + 4 * tx_vbytes >= fixed_weight
+        #   fee_rate: -rate * tx_vbytes + 1000 * fee >= 0
+        data = np.concatenate((values, [-1, -1], -weights, [4, -rate, 1000]))
+        indices = np.concatenate(
+            (np.arange(n), [change, fee], np.arange(n), [tx_vbytes, tx_vbytes, fee])
+        )
+        indptr = np.array([0, n + 2, 2 * n + 3, 2 * n + 5])
+        matrix = sparse.csr_array(
+            (data.astype(np.float64), indices, indptr), shape=(3, n + 3)
+        )
+        row_lb = np.array([p.target_sats, self.fixed_weight(), 0], dtype=np.float64)
+        row_ub = np.array([p.target_sats, np.inf, np.inf])
+
+        # Objective: rate * tx_vbytes, the fee before rounding to whole sats
+        objective = np.zeros(n + 3, dtype=np.float64)
+        objective[tx_vbytes] = rate / 1000
+
+        lower = np.zeros(n + 3, dtype=np.float64)
+        lower[change] = p.min_change_sats
+        upper = np.full(n + 3, np.inf)
+        upper[:n] = counts
+
+        return CoinSelectionArrays(
+            objective=objective,
+            objective_offset=0.0,
+            constraint_matrix=matrix,
+            constraint_lb=row_lb,
+            constraint_ub=row_ub,
+            lower_bounds=lower,
+            upper_bounds=upper,
+            integrality=np.ones(n + 3, dtype=np.int8),
+            n_choice=n,
         )
 
     def build(
         self,
+        x_vars: list[pulp.LpVariable] | None = None,
     ) -> tuple[
         pulp.LpProblem,
         list[pulp.LpVariable],
         pulp.LpVariable,
-        pulp.LpAffineExpression,
-        pulp.LpAffineExpression,
+        pulp.LpVariable,
+        pulp.LpVariable,
     ]:
         """
         Builds and returns:
-          (problem, x_vars, change_var, fee_expr, vbytes_expr)
-        where x_vars is a list aligned with self.utxos.
+          (problem, x_vars, change_var, fee_var, vbytes_var)
+        where x_vars is a list aligned with choice_columns() (for this model,
+        with self.utxos).
+
+        Passing x_vars (from choice_variables() on the same pool) reuses them
+        instead of creating new variables, e.g. to solve many params.
         """
 
-        p = self.params
+        self.validate()
 
-        if p.target_sats < 0:
-            raise ValueError("target_sats must be >= 0")
-        if p.min_change_sats < 0:
-            raise ValueError("min_change_sats must be >= 0")
-        if p.fee_rate_sat_per_vb <= 0:
-            raise ValueError("fee_rate_sat_per_vb must be > 0")
-        if not self.utxos:
-            raise ValueError("No UTXOs provided")
+        p = self.params
+        rate = p.fee_rate_sat_per_kvb
+        values, weights, counts = self.choice_columns()
 
         # Problem
         prob = pulp.LpProblem("coin_selection_simple", pulp.LpMinimize)
 
-        # Decision variables: x_i in {0,1}
-        x = [
-            pulp.LpVariable(f"x_{i}", lowBound=0, upBound=1, cat=pulp.LpBinary)
-            for i in range(len(self.utxos))
-        ]
+        x = self.choice_variables() if x_vars is None else x_vars
 
-        # Change (integer sats)
+        # Change, tx vbytes and fee, all integral
         change = pulp.LpVariable("change_sats", lowBound=0, cat=pulp.LpInteger)
+        tx_vbytes = pulp.LpVariable("tx_vbytes", lowBound=0, cat=pulp.LpInteger)
+        fee = pulp.LpVariable("fee_sats", lowBound=0, cat=pulp.LpInteger)
 
-        # vbytes = fixed + sum(s_i * x_i)
-        fixed_vb = self.fixed_vbytes()
-        input_vb_expr = pulp.lpSum(
-            [u.input_vbytes * x_i for u, x_i in zip(self.utxos, x)]
+        # tx_vbytes >= ceil(weight / 4), with weight = fixed + sum(w_i * x_i)
+        # (expressions are built straight from coefficient arrays; going
+        # through lpSum would create one temporary expression per term)
+        weight_row = pulp.LpAffineExpression(
+            zip([*x, tx_vbytes], [*(-weights).tolist(), 4])
         )
-        vbytes_expr = fixed_vb + input_vb_expr
+        prob += (weight_row >= self.fixed_weight()), "weight"
 
-        # Fee = feerate * vbytes
-        fee_expr = (p.fee_rate_sat_per_vb) * vbytes_expr
+        # fee >= ceil(rate * tx_vbytes / 1000), rate in sat/kvB
+        prob += (1000 * fee - rate * tx_vbytes >= 0), "fee_rate"
 
         # Balance equality:
         # sum(v_i * x_i) = target + change + fee
-        total_in_expr = pulp.lpSum(
-            [u.value_sats * x_i for u, x_i in zip(self.utxos, x)]
-        )
-        prob += (total_in_expr == p.target_sats + change + fee_expr), "balance"
+        total_in_expr = pulp.LpAffineExpression(zip(x, values.tolist()))
+        prob += (total_in_expr == p.target_sats + change + fee), "balance"
 
         # Enforce dust / min change (because change output always exists)
         prob += (change >= p.min_change_sats), "min_change"
 
-        # Objective: minimise fee
-        # (same as minimise sum(input vbytes) since others are constant)
-        prob += fee_expr, "minimise_fee"
+        # Objective: minimise rate * tx_vbytes, the fee before rounding to
+        # whole sats. Its optimum has the smallest tx_vbytes, hence also the
+        # smallest rounded fee; results recompute both from the selection.
+        prob += (rate / 1000) * tx_vbytes, "minimise_fee"
+
+        return prob, x, change, fee, tx_vbytes
 
-        return prob, x, change, fee_expr, vbytes_expr
+    def objective_for(self, tx_vbytes: int) -> float:
+        """The MILP objective of a selection of tx_vbytes vbytes."""
+        return self.params.fee_rate_sat_per_kvb * tx_vbytes / 1000
 
     def evaluate_fee_and_vbytes(self, selected: Sequence[UTXO]) -> tuple[int, int]:
         """
-        Deterministic post-solve computation using integer vbytes (ceil),
-        so your library returns consistent, wallet-like figures.
+        Deterministic post-solve computation in integer weight units and
+        sat/kvB (see units.py), so your library returns consistent,
+        wallet-like figures.
         """
-        p = self.params
-        vbytes = self.fixed_vbytes() + sum((u.input_vbytes for u in selected), 0.0)
-        vbytes_i = self._ceil_int(vbytes)
-        fee = math.ceil(float(p.fee_rate_sat_per_vb) * float(vbytes_i))
-        return int(fee), int(vbytes_i)
+        weight = sum(to_weight(u.input_vbytes) for u in selected)
+        return self.fee_and_vbytes_for_weight(weight)
+
+    def fee_and_vbytes_for_weight(self, input_weight: int) -> tuple[int, int]:
+        """
+        Same as evaluate_fee_and_vbytes(), from the total input weight only.
+        """
+        tx_vbytes = vbytes_for(self.fixed_weight() + int(input_weight))
+        return fee_for(tx_vbytes, self.params.fee_rate_sat_per_kvb), tx_vbytes
+
+    def fee_and_vbytes_for(self, input_vbytes: float) -> tuple[int, int]:
+        """
+        Same as evaluate_fee_and_vbytes(), from the total input vbytes only
+        (rounded up to a whole weight unit).
+        """
+        return self.fee_and_vbytes_for_weight(to_weight(input_vbytes))
+
+    def fees_for_weights(
+        self, input_weights: npt.NDArray[np.int64]
+    ) -> npt.NDArray[np.int64]:
+        """
+        Vectorised fee part of fee_and_vbytes_for_weight().
+        """
+        tx_vbytes = vbytes_for(self.fixed_weight() + input_weights)
+        return fee_for(tx_vbytes, self.params.fee_rate_sat_per_kvb)
+
+    def selected_from(self, x_values: Sequence[float | None]) -> list[UTXO]:
+        """
+        Maps solver values of the selection columns back to UTXOs.
+        """
+        return [
+            self.utxos[i]
+            for i, xv in enumerate(x_values)
+            if xv is not None and xv > 0.5
+        ]
+
+    def result_for(self, selected: Sequence[UTXO]) -> SelectionResult:
+        """
+        Builds the SelectionResult for a solver's selection, recomputing
+        fee/vbytes/change in a deterministic integer way.
+        """
+        fee_sats, tx_vbytes = self.evaluate_fee_and_vbytes(selected)
+
+        # Sanity: compute change from balance with integer fee/vbytes
+        total_in = sum(u.value_sats for u in selected)
+        target = self.params.target_sats
+        change_sats = total_in - target - fee_sats
+
+        # Enforce policy sanity (since we recompute fee with ceil)
+        if change_sats < self.params.min_change_sats:
+            raise MinChangeRoundingError(
+                "Solution violates min_change after integer fee rounding. "
+                "Try slightly higher UTXO sum or adjust sizing/feerate rounding."
+            )
+
+        return SelectionResult(
+            selected=tuple(selected),
+            change_sats=int(change_sats),
+            fee_sats=int(fee_sats),
+            tx_vbytes=int(tx_vbytes),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class UTXOGroups:
+    """
+    UTXOs grouped by identical (value_sats, input weight units).
+
+    Group g holds the UTXOs order[starts[g] : starts[g] + counts[g]], in pool
+    order.
+    """
+
+    values: npt.NDArray[np.int64]
+    weights: npt.NDArray[np.int64]
+    counts: npt.NDArray[np.int64]
+    order: npt.NDArray[np.intp]
+    starts: npt.NDArray[np.intp]
+
+    def members(self, g: int) -> npt.NDArray[np.intp]:
+        start = int(self.starts[g])
+        return self.order[start : start + int(self.counts[g])]
+
+
+def group_utxos(utxos: Sequence[UTXO]) -> UTXOGroups:
+    """
+    Groups identical UTXOs (same value and input size) together.
+    """
+    values, weights = utxo_weights(utxos)
+    # lexsort is stable, so each group keeps the pool order
+    order = np.lexsort((weights, values))
+    sorted_values, sorted_weights = values[order], weights[order]
+
+    new_group = np.ones(order.size, dtype=bool)
+    new_group[1:] = (sorted_values[1:] != sorted_values[:-1]) | (
+        sorted_weights[1:] != sorted_weights[:-1]
+    )
+    starts = np.flatnonzero(new_group)
+    counts = np.diff(np.append(starts, order.size))
+
+    return UTXOGroups(
+        values=sorted_values[starts],
+        weights=sorted_weights[starts],
+        counts=counts.astype(np.int64),
+        order=order,
+        starts=starts,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class AggregatedCoinSelectionModel(SimpleCoinSelectionModel):
+    """
+    Same problem as SimpleCoinSelectionModel, but identical UTXOs (same
+    value_sats and input_vbytes) share one integer variable
+    0 <= n_g <= count_g instead of one binary each.
+
+    This removes the symmetry between interchangeable UTXOs: a pool with
+    100k UTXOs of 6 distinct shapes becomes a 6-variable MILP. Solutions are
+    expanded back to concrete UTXOs by taking the first n_g of each group in
+    pool order.
+    """
+
+    def choice_columns(
+        self,
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        groups = group_utxos(self.utxos)
+        return groups.values, groups.weights, groups.counts
+
+    def choice_values(self, selected: Sequence[int]) -> list[int]:
+        groups = group_utxos(self.utxos)
+        group_of = np.empty(len(self.utxos), dtype=np.intp)
+        group_of[groups.order] = np.repeat(np.arange(groups.counts.size), groups.counts)
+        taken = np.bincount(
+            group_of[np.asarray(selected, dtype=np.intp)],
+            minlength=groups.counts.size,
+        )
+        return [int(k) for k in taken]
+
+    def choice_variables(self) -> list[pulp.LpVariable]:
+        # Decision variables: n_g in {0, ..., count_g}
+        counts = group_utxos(self.utxos).counts
+        return [
+            pulp.LpVariable(f"n_{g}", lowBound=0, upBound=c, cat=pulp.LpInteger)
+            for g, c in enumerate(counts.tolist())
+        ]
+
+    def selected_from(self, x_values: Sequence[float | None]) -> list[UTXO]:
+        """
+        Expands group counts to UTXOs: the first n_g of each group, in pool
+        order.
+        """
+        groups = group_utxos(self.utxos)
+        picked: list[int] = []
+        for g, xv in enumerate(x_values):
+            if xv is not None and xv > 0.5:
+                picked.extend(groups.members(g)[: int(round(xv))].tolist())
+        return [self.utxos[i] for i in sorted(picked)]
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, replace
+from typing import Any, Iterable, cast
+
+import numpy as np
+import numpy.typing as npt
+
+from .model import SimpleCoinSelectionModel, utxo_weights
+from .pool import TXID_BYTES, UTXOPool
+from .types import CoinSelectionSolver, SelectionParams, SelectionResult
+from .units import WITNESS_SCALE_FACTOR
+
+
+@dataclass(frozen=True, slots=True)
+class BatchJobResult:
+    """
+    Outcome of one job of solve_batch(): either a result or the exception
+    the job raised.
+    """
+
+    result: SelectionResult | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _solve_job(
+    model_cls: type[SimpleCoinSelectionModel],
+    values: npt.NDArray[np.int64],
+    weights: npt.NDArray[np.int64],
+    params: SelectionParams,
+    solver: CoinSelectionSolver,
+) -> SelectionResult:
+    # Runs in a worker, on a UTXOPool over the columns with vout set to each
+    # UTXO's index in the pool, which the parent maps back to the real UTXOs.
+    # Sizes are whole weight units, so weight / 4 is exact as float32.
+    n = values.size
+    pool = UTXOPool(
+        txid=np.zeros((n, TXID_BYTES), dtype=np.uint8),
+        vout=np.arange(n, dtype=np.uint32),
+        value_sats=values,
+        input_vbytes=(weights / WITNESS_SCALE_FACTOR).astype(np.float32),
+    )
+    return solver.solve(model_cls(utxos=pool, params=params))
+
+
+def _with_time_limit(
+    solver: CoinSelectionSolver, time_limit_seconds: float | None
+) -> CoinSelectionSolver:
+    # Tightens the solver's own time limit, for solvers that have one
+    if time_limit_seconds is None or not hasattr(solver, "time_limit_seconds"):
+        return solver
+    current = solver.time_limit_seconds
+    if current is not None and current <= time_limit_seconds:
+        return solver
+    return cast(
+        CoinSelectionSolver,
+        replace(cast(Any, solver), time_limit_seconds=time_limit_seconds),
+    )
+
+
+def solve_batch(
+    jobs: Iterable[tuple[SimpleCoinSelectionModel, CoinSelectionSolver]],
+    *,
+    max_workers: int | None = None,
+    max_in_flight: int | None = None,
+    time_limit_seconds: float | None = None,
+) -> list[BatchJobResult]:
+    """
+    Solves (model, solver) jobs in parallel on a ProcessPoolExecutor and
+    returns one BatchJobResult per job, in input order.
+
+      - max_in_flight bounds how many jobs are submitted but not finished
+        (default: 2 * the number of workers), so large batches are not all
+        serialised up front.
+      - time_limit_seconds caps each job's solver time limit (for solvers
+        with a time_limit_seconds field, e.g. the MILP solvers).
+      - Models are sent to workers as NumPy value/weight arrays, solved there
+        as a UTXOPool, rather than as lists of UTXO objects; results refer to
+        the original UTXOs.
+      - A job that raises gives a BatchJobResult with the exception; the
+        rest of the batch still runs.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    limit = 2 * workers if max_in_flight is None else max_in_flight
+    if limit < 1:
+        raise ValueError("max_in_flight must be >= 1")
+
+    job_list = list(jobs)
+    results: dict[int, BatchJobResult] = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: dict[Future[SelectionResult], int] = {}
+        next_job = 0
+        while next_job < len(job_list) or pending:
+            while next_job < len(job_list) and len(pending) < limit:
+                model, solver = job_list[next_job]
+                try:
+                    values, weights = utxo_weights(model.utxos)
+                    future = pool.submit(
+                        _solve_job,
+                        type(model),
+                        values,
+                        weights,
+                        model.params,
+                        _with_time_limit(solver, time_limit_seconds),
+                    )
+                except Exception as exc:
+                    results[next_job] = BatchJobResult(error=exc)
+                else:
+                    pending[future] = next_job
+                next_job += 1
+
+            if not pending:
+                continue
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                k = pending.pop(future)
+                model = job_list[k][0]
+                try:
+                    res = future.result()
+                    selected = tuple(model.utxos[u.vout] for u in res.selected)
+                    results[k] = BatchJobResult(result=replace(res, selected=selected))
+                except Exception as exc:
+                    results[k] = BatchJobResult(error=exc)
+
+    return [results[k] for k in range(len(job_list))]
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Iterable, Iterator, overload
+
+import numpy as np
+import numpy.typing as npt
+
+from .types import UTXO
+
+TXID_BYTES = 32
+
+
+@dataclass(frozen=True, slots=True, eq=False, weakref_slot=True)
+class UTXOPool(Sequence[UTXO]):
+    """
+    Columnar UTXO set: one NumPy array per field, 48 bytes per UTXO.
+
+      - txid: raw 32-byte txids, shape (n, 32), uint8 (hex-decoded)
+      - vout: uint32
+      - value_sats: int64
+      - input_vbytes: float32 (exact for whole weight units, i.e. multiples
+        of 0.25 vbytes)
+
+    Behaves as a Sequence[UTXO], so models and solvers accept it in place of
+    a list; UTXO objects are only created for the items accessed (e.g. the
+    selected ones), while solvers read the value/size columns directly.
+    """
+
+    txid: npt.NDArray[np.uint8]
+    vout: npt.NDArray[np.uint32]
+    value_sats: npt.NDArray[np.int64]
+    input_vbytes: npt.NDArray[np.float32]
+
+    def __post_init__(self) -> None:
+        n = len(self.value_sats)
+        if self.txid.shape != (n, TXID_BYTES) or self.txid.dtype != np.uint8:
+            raise ValueError(f"txid must be a ({n}, {TXID_BYTES}) uint8 array")
+        for name, dtype in (
+            ("vout", np.uint32),
+            ("value_sats", np.int64),
+            ("input_vbytes", np.float32),
+        ):
+            column = getattr(self, name)
+            if column.shape != (n,) or column.dtype != dtype:
+                raise ValueError(f"{name} must be a ({n},) {np.dtype(dtype)} array")
+
+    @classmethod
+    def from_utxos(cls, utxos: Iterable[UTXO]) -> UTXOPool:
+        """
+        Packs UTXOs into a pool. txids must be 64-character hex strings.
+        """
+        items = list(utxos)
+        n = len(items)
+        try:
+            raw = b"".join(bytes.fromhex(u.txid) for u in items)
+        except ValueError as exc:
+            raise ValueError("UTXOPool needs hex txids") from exc
+        if len(raw) != n * TXID_BYTES:
+            raise ValueError(f"UTXOPool needs {TXID_BYTES}-byte txids")
+
+        return cls(
+            txid=np.frombuffer(raw, dtype=np.uint8).reshape(n, TXID_BYTES).copy(),
+            vout=np.fromiter((u.vout for u in items), dtype=np.uint32, count=n),
+            value_sats=np.fromiter(
+                (u.value_sats for u in items), dtype=np.int64, count=n
+            ),
+            input_vbytes=np.fromiter(
+                (u.input_vbytes for u in items), dtype=np.float32, count=n
+            ),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays."""
+        return (
+            self.txid.nbytes
+            + self.vout.nbytes
+            + self.value_sats.nbytes
+            + self.input_vbytes.nbytes
+        )
+
+    def take(self, indices: npt.ArrayLike) -> UTXOPool:
+        """Sub-pool with the UTXOs at the given indices, in that order."""
+        idx = np.asarray(indices, dtype=np.intp)
+        return UTXOPool(
+            txid=self.txid[idx],
+            vout=self.vout[idx],
+            value_sats=self.value_sats[idx],
+            input_vbytes=self.input_vbytes[idx],
+        )
+
+    def __len__(self) -> int:
+        return len(self.value_sats)
+
+    @overload
+    def __getitem__(self, index: int) -> UTXO: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> UTXOPool: ...
+
+    def __getitem__(self, index: int | slice) -> UTXO | UTXOPool:
+        if isinstance(index, slice):
+            return self.take(np.arange(len(self))[index])
+        return UTXO(
+            txid=self.txid[index].tobytes().hex(),
+            vout=int(self.vout[index]),
+            value_sats=int(self.value_sats[index]),
+            input_vbytes=float(self.input_vbytes[index]),
+        )
+
+    def __iter__(self) -> Iterator[UTXO]:
+        for i in range(len(self)):
+            yield self[i]
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+
+import numpy as np
+import numpy.typing as npt
+
+from .heuristics import greedy_indices
+from .model import SimpleCoinSelectionModel, utxo_subset, utxo_weights
+from .units import WITNESS_SCALE_FACTOR
+
+
+def _class_sorted(
+    values: npt.NDArray[np.int64], weights: npt.NDArray[np.int64]
+) -> bool:
+    # True if ordered by input size ascending, then value_sats descending
+    same = weights[1:] == weights[:-1]
+    return bool(
+        np.all((weights[1:] > weights[:-1]) | (same & (values[1:] <= values[:-1])))
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class PresolveResult:
+    """
+    Outcome of presolve():
+      - model: the reduced model (same class and params, subset of the UTXOs,
+        same order)
+      - kept: indices of the kept UTXOs in the original model
+      - removed_uneconomical: UTXOs worth no more than their own input fee
+      - removed_dominated: UTXOs outside the top-K of their input_vbytes class
+    """
+
+    model: SimpleCoinSelectionModel
+    kept: npt.NDArray[np.intp]
+    removed_uneconomical: int
+    removed_dominated: int
+
+    @property
+    def removed(self) -> int:
+        return self.removed_uneconomical + self.removed_dominated
+
+
+def presolve(model: SimpleCoinSelectionModel) -> PresolveResult:
+    """
+    Removes UTXOs that provably cannot improve the optimum:
+
+    1. A UTXO whose value is at most floor(fee_rate * floor(input_vbytes))
+       (in whole sat/kvB and weight units, see units.py) never pays for
+       itself: dropping it from any selection lowers the integer fee by at
+       least that much, so change does not decrease and the transaction
+       gets smaller.
+
+    2. The fee depends only on how many inputs are taken from each
+       input_vbytes class, so an optimal selection can always use the
+       highest-valued UTXOs of each class. A greedy feasible selection
+       (see heuristics.py) bounds the optimal tx size T, hence the inputs of
+       size w are at most floor((4 * T - fixed_weight) / w) (in weight
+       units), and only that many per class are kept.
+    """
+    model.validate()
+
+    p = model.params
+    values, weights = utxo_weights(model.utxos)
+    n = len(values)
+
+    # 1. Uneconomical inputs
+    threshold = weights // WITNESS_SCALE_FACTOR * p.fee_rate_sat_per_kvb // 1000
+    economical = np.flatnonzero(values > threshold)
+    removed_uneconomical = n - economical.size
+
+    # 2. Top-K per input size class
+    keep = economical
+    greedy = greedy_indices(model, values[economical], weights[economical])
+    if greedy is not None:
+        _fee, tx_vbytes = model.fee_and_vbytes_for_weight(
+            int(weights[economical][greedy].sum())
+        )
+        max_input_weight = WITNESS_SCALE_FACTOR * tx_vbytes - model.fixed_weight()
+
+        classes, class_of = np.unique(weights[economical], return_inverse=True)
+        k_per_class = max_input_weight // classes
+
+        # Sort by class, then value (desc), then original index; snapshots
+        # (see snapshot.py) are stored in that order already
+        if _class_sorted(values[economical], weights[economical]):
+            order = np.arange(economical.size)
+        else:
+            order = np.lexsort((economical, -values[economical], class_of))
+        sorted_class = class_of[order]
+        class_start = np.searchsorted(sorted_class, np.arange(classes.size))
+        rank = np.arange(order.size) - class_start[sorted_class]
+
+        keep = np.sort(economical[order[rank < k_per_class[sorted_class]]])
+
+    removed_dominated = economical.size - keep.size
+
+    # replace() keeps the model class (e.g. AggregatedCoinSelectionModel)
+    reduced = replace(model, utxos=utxo_subset(model.utxos, keep.tolist()))
+    return PresolveResult(
+        model=reduced,
+        kept=keep,
+        removed_uneconomical=int(removed_uneconomical),
+        removed_dominated=int(removed_dominated),
+    )
@@ -0,0 +1,320 @@
+"""
+Fee quotes for a fixed UTXO pool, in logarithmic time per quote.
+
+The fee depends only on the total input size X, so the minimum fee for
+(target, fee_rate) is the fee at the smallest X whose best selection covers
+target + fee + min_change. The index keeps:
+
+  - every UTXO sorted by value density (value_sats per weight unit), with
+    prefix sums of sizes and values: the LP relaxation of "most value within
+    size X" is the densest-first prefix, cut fractionally at X. Its
+    breakpoints do not depend on the fee rate, so one index serves every
+    quote;
+  - per input size class, values sorted descending with prefix sums.
+
+Requests that cannot be met at all are recognised first, with the same
+exact certificate as feasibility.infeasibility_certificate(): the UTXOs
+with positive effective value are the densest-first prefix, so their
+totals are one binary search away.
+
+A quote binary-searches the LP breakpoints for the smallest X whose relaxed
+change reaches min_change (a lower bound on the optimal size, hence on the
+fee), and the densest-first and per-class prefixes, and the densest-first
+prefix completed by one UTXO of each class, for the cheapest feasible ones
+(upper bounds). With exact=True, a solver confirms the optimum
+whenever the bounds differ.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from .dp import ClassDPSolver
+from .feasibility import certificate_for_useful
+from .model import SimpleCoinSelectionModel, SolverTimeoutError, utxo_weights
+from .types import (
+    UTXO,
+    CoinSelectionSolver,
+    InfeasibilityCertificate,
+    SelectionParams,
+    SelectionResult,
+    TxSizing,
+)
+
+# Float slack, so rounding noise never tightens a bound past the optimum
+_EPS = 1e-9
+
+# How many longer prefixes to try when the shortest candidate prefix misses
+# min_change only by fee rounding
+_ROUNDING_STEPS = 8
+
+
+@dataclass(frozen=True, slots=True)
+class FeeQuote:
+    """
+    Bounds on the minimum fee of a request. feasible is None when the
+    bounds cannot tell (only fee rounding is in the way); result is set
+    when the exact optimum was confirmed (see FeeQuoteIndex.quote()).
+    """
+
+    feasible: bool | None
+    lower_fee_sats: int | None
+    upper_fee_sats: int | None
+    result: SelectionResult | None = None
+
+    @property
+    def is_exact(self) -> bool:
+        return self.lower_fee_sats is not None and (
+            self.lower_fee_sats == self.upper_fee_sats
+        )
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class _Class:
+    size: int  # weight units
+    neg_values: npt.NDArray[np.int64]  # -value_sats, ascending
+    cum_values: npt.NDArray[np.int64]  # prefix sums of values, from 0
+    indices: npt.NDArray[np.intp]  # into the pool, same order
+    ranks: npt.NDArray[np.intp]  # positions in the density order, ascending
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class FeeQuoteIndex:
+    """
+    Precomputed quote structures for one pool; build with build_quote_index().
+    """
+
+    utxos: Sequence[UTXO]
+    sizing: TxSizing
+    min_change_sats: int
+    neg_density: npt.NDArray[np.float64]  # -value/size, ascending
+    density_order: npt.NDArray[np.intp]
+    cum_weights: npt.NDArray[np.int64]  # prefix sums in density order, from 0
+    cum_values: npt.NDArray[np.int64]
+    classes: tuple[_Class, ...]
+    exact_solver: CoinSelectionSolver
+
+    def params(self, target_sats: int, fee_rate_sat_per_vb: float) -> SelectionParams:
+        return SelectionParams(
+            target_sats=target_sats,
+            fee_rate_sat_per_vb=fee_rate_sat_per_vb,
+            min_change_sats=self.min_change_sats,
+            sizing=self.sizing,
+        )
+
+    def quote(
+        self, target_sats: int, fee_rate_sat_per_vb: float, *, exact: bool = False
+    ) -> FeeQuote:
+        """
+        Lower and upper bounds on the minimum fee for sending target_sats at
+        fee_rate_sat_per_vb, with the same integer rounding as the solvers'
+        results, in O(log n) per input size class.
+
+        With exact=True, the optimum is confirmed when the bounds differ (or
+        feasibility is unknown) by running exact_solver on the pool; when
+        they agree, the bounding selection itself is returned as result.
+        """
+        model = SimpleCoinSelectionModel(
+            self.utxos, self.params(target_sats, fee_rate_sat_per_vb)
+        )
+        model.validate()
+        if self._certificate(model) is not None:
+            return FeeQuote(feasible=False, lower_fee_sats=None, upper_fee_sats=None)
+
+        # Sats per weight unit
+        rate = model.params.fee_rate_sat_per_kvb / 4000
+        need = target_sats + self.min_change_sats + rate * model.fixed_weight()
+
+        # Prefixes worth taking: value density above the fee rate, i.e.
+        # positive effective value. Relaxed change grows along them.
+        useful = int(np.searchsorted(self.neg_density, -rate, side="left"))
+
+        def relaxed(j: int) -> float:
+            return float(self.cum_values[j]) - rate * float(self.cum_weights[j])
+
+        if relaxed(useful) < need - _EPS:
+            # Only float rounding disagrees with the certificate
+            if exact:
+                return self._solve(model)
+            return FeeQuote(feasible=None, lower_fee_sats=None, upper_fee_sats=None)
+
+        # Lower bound: smallest fractional size X with relaxed change >= need
+        j = bisect.bisect_left(range(useful + 1), need - _EPS, key=relaxed)
+        x_lb = 0.0
+        if j > 0:
+            density = -float(self.neg_density[j - 1])
+            x_lb = float(self.cum_weights[j - 1]) + max(
+                0.0, (need - relaxed(j - 1)) / (density - rate)
+            )
+        lower, _ = model.fee_and_vbytes_for_weight(max(0, math.ceil(x_lb - 1e-6)))
+
+        # Upper bound: smallest feasible densest-first or one-class prefix
+        best: tuple[int, npt.NDArray[np.intp]] | None = None
+        found = _feasible_prefix(
+            model, lambda k: (int(self.cum_values[k]), int(self.cum_weights[k])), j
+        )
+        if found is not None:
+            best = (found[0], self.density_order[: found[1]])
+        for cls in self.classes:
+            # The densest j - 1 UTXOs plus the best one left of this class
+            # (within a class, density order is value order)
+            k = int(np.searchsorted(cls.ranks, j - 1))
+            if j == 0 or k == cls.indices.size:
+                continue
+            fee, _ = model.fee_and_vbytes_for_weight(
+                int(self.cum_weights[j - 1]) + cls.size
+            )
+            total_in = int(self.cum_values[j - 1]) - int(cls.neg_values[k])
+            if total_in - target_sats - fee >= self.min_change_sats and (
+                best is None or fee < best[0]
+            ):
+                best = (fee, np.append(self.density_order[: j - 1], cls.indices[k]))
+        for cls in self.classes:
+            k_useful = int(np.searchsorted(cls.neg_values, -rate * cls.size, "left"))
+            k = bisect.bisect_left(
+                range(k_useful + 1),
+                need - _EPS,
+                key=lambda k: float(cls.cum_values[k]) - rate * cls.size * k,
+            )
+            if k > k_useful:
+                continue
+            found = _feasible_prefix(
+                model, lambda k: (int(cls.cum_values[k]), cls.size * k), k
+            )
+            if found is not None and (best is None or found[0] < best[0]):
+                best = (found[0], cls.indices[: found[1]])
+
+        upper = None if best is None else best[0]
+        quote = FeeQuote(
+            feasible=True if best is not None else None,
+            lower_fee_sats=lower,
+            upper_fee_sats=upper,
+        )
+        if not exact:
+            return quote
+        if best is not None and lower == upper:
+            picked = np.sort(best[1]).tolist()
+            result = model.result_for([self.utxos[i] for i in picked])
+            return FeeQuote(True, result.fee_sats, result.fee_sats, result)
+        return self._solve(model)
+
+    def infeasibility_certificate(
+        self, target_sats: int, fee_rate_sat_per_vb: float
+    ) -> InfeasibilityCertificate | None:
+        """
+        feasibility.infeasibility_certificate() for a request on this pool,
+        in O(log n) instead of a pass over the pool.
+        """
+        model = SimpleCoinSelectionModel(
+            self.utxos, self.params(target_sats, fee_rate_sat_per_vb)
+        )
+        model.validate()
+        return self._certificate(model)
+
+    def _certificate(
+        self, model: SimpleCoinSelectionModel
+    ) -> InfeasibilityCertificate | None:
+        # The UTXOs with positive effective value are the densest-first
+        # prefix. Densities are rounded floats, so the few within rounding
+        # of the rate are checked one by one in integers.
+        kvb = model.params.fee_rate_sat_per_kvb
+        rate = kvb / 4000
+        lo = int(np.searchsorted(self.neg_density, -rate * (1 + _EPS), side="left"))
+        hi = int(np.searchsorted(self.neg_density, -rate * (1 - _EPS), side="right"))
+        values = np.diff(self.cum_values[lo : hi + 1])
+        weights = np.diff(self.cum_weights[lo : hi + 1])
+        useful = 4000 * values > kvb * weights
+        return certificate_for_useful(
+            model,
+            int(self.cum_values[lo]) + int(values[useful].sum()),
+            int(self.cum_weights[lo]) + int(weights[useful].sum()),
+        )
+
+    def _solve(self, model: SimpleCoinSelectionModel) -> FeeQuote:
+        try:
+            result = self.exact_solver.solve(model)
+        except SolverTimeoutError:
+            raise
+        except RuntimeError:
+            return FeeQuote(feasible=False, lower_fee_sats=None, upper_fee_sats=None)
+        return FeeQuote(True, result.fee_sats, result.fee_sats, result)
+
+
+def _feasible_prefix(
+    model: SimpleCoinSelectionModel,
+    prefix: Callable[[int], tuple[int, int]],
+    start: int,
+) -> tuple[int, int] | None:
+    """
+    (fee, length) of the shortest prefix from length start on that is
+    feasible after integer fee rounding; prefix(k) gives the (value, size in
+    weight units) of the first k items. Only a few lengths past start are
+    tried: there the relaxed change already covers min_change, so only
+    rounding can miss.
+    """
+    p = model.params
+    for k in range(start, start + _ROUNDING_STEPS):
+        try:
+            total_in, input_weight = prefix(k)
+        except IndexError:
+            return None
+        fee, _ = model.fee_and_vbytes_for_weight(input_weight)
+        if total_in - p.target_sats - fee >= p.min_change_sats:
+            return fee, k
+    return None
+
+
+def build_quote_index(
+    utxos: Sequence[UTXO],
+    sizing: TxSizing,
+    min_change_sats: int,
+    exact_solver: CoinSelectionSolver | None = None,
+) -> FeeQuoteIndex:
+    """
+    Builds the quote index for a pool in O(n log n). exact_solver (default:
+    ClassDPSolver) confirms optima for quote(..., exact=True).
+    """
+    values, weights = utxo_weights(utxos)
+    if values.size and int(weights.min()) <= 0:
+        raise ValueError("input_vbytes must be > 0")
+
+    order = np.argsort(-(values / weights), kind="stable")
+    rank = np.empty(order.size, dtype=np.intp)
+    rank[order] = np.arange(order.size)
+    cum_weights = np.concatenate(([0], np.cumsum(weights[order]))).astype(np.int64)
+    cum_values = np.concatenate(([0], np.cumsum(values[order]))).astype(np.int64)
+
+    classes = []
+    for size in np.unique(weights).tolist():
+        members = np.flatnonzero(weights == size)
+        by_value = members[np.argsort(-values[members], kind="stable")]
+        sorted_values = values[by_value]
+        classes.append(
+            _Class(
+                size=int(size),
+                neg_values=-sorted_values,
+                cum_values=np.concatenate(([0], np.cumsum(sorted_values))).astype(
+                    np.int64
+                ),
+                indices=by_value,
+                ranks=rank[by_value],
+            )
+        )
+
+    return FeeQuoteIndex(
+        utxos=utxos,
+        sizing=sizing,
+        min_change_sats=min_change_sats,
+        neg_density=-(values / weights)[order],
+        density_order=order,
+        cum_weights=cum_weights,
+        cum_values=cum_values,
+        classes=tuple(classes),
+        exact_solver=exact_solver if exact_solver is not None else ClassDPSolver(),
+    )
@@ -0,0 +1,146 @@
+"""
+Binary UTXO snapshots that open without parsing or copying.
+
+Layout (little-endian):
+  - a 64-byte header: magic b"UTXOSNAP", format version (uint32), record
+    size (uint32), record count (uint64), flags (uint32), zero padding;
+  - count fixed-width 48-byte records: txid (32 raw bytes), value_sats
+    (int64), vout (uint32), input_vbytes (float32).
+
+Records are sorted by input_vbytes ascending, then value_sats descending,
+i.e. by effective value within every input size class at any fee rate,
+which is the order presolve() ranks UTXOs in.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+from .pool import TXID_BYTES, UTXOPool
+from .types import UTXO
+
+MAGIC = b"UTXOSNAP"
+VERSION = 1
+HEADER_SIZE = 64
+FLAG_SORTED = 1
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("txid", np.uint8, (TXID_BYTES,)),
+        ("value_sats", "<i8"),
+        ("vout", "<u4"),
+        ("input_vbytes", "<f4"),
+    ]
+)
+
+_HEADER = struct.Struct("<8sIIQI")
+
+
+def write_snapshot(path: str | os.PathLike[str], utxos: Sequence[UTXO]) -> int:
+    """
+    Writes utxos (a UTXOPool or any sequence of UTXOs with hex txids) as a
+    sorted snapshot. Returns the number of records written.
+    """
+    pool = utxos if isinstance(utxos, UTXOPool) else UTXOPool.from_utxos(utxos)
+    order = np.lexsort((-pool.value_sats, pool.input_vbytes))
+
+    records = np.empty(len(pool), dtype=RECORD_DTYPE)
+    records["txid"] = pool.txid[order]
+    records["value_sats"] = pool.value_sats[order]
+    records["vout"] = pool.vout[order]
+    records["input_vbytes"] = pool.input_vbytes[order]
+
+    header = _HEADER.pack(MAGIC, VERSION, RECORD_DTYPE.itemsize, len(pool), FLAG_SORTED)
+    with open(path, "wb") as f:
+        f.write(header.ljust(HEADER_SIZE, b"\0"))
+        records.tofile(f)
+    return len(pool)
+
+
+def read_snapshot(path: str | os.PathLike[str]) -> UTXOPool:
+    """
+    Opens a snapshot as a read-only, memory-mapped UTXOPool. Only the header
+    is read; the pool's columns are views into the mapped file.
+    """
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+        file_size = os.fstat(f.fileno()).st_size
+
+    if len(header) < HEADER_SIZE:
+        raise ValueError(f"{path}: not a UTXO snapshot (truncated header)")
+    magic, version, record_size, count, _flags = _HEADER.unpack_from(header)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a UTXO snapshot")
+    if version != VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path}: unsupported snapshot version {version}")
+    if file_size != HEADER_SIZE + count * record_size:
+        raise ValueError(f"{path}: size does not match {count} records")
+
+    if count == 0:
+        records = np.empty(0, dtype=RECORD_DTYPE)
+    else:
+        records = np.memmap(
+            path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,)
+        )
+    return UTXOPool(
+        txid=records["txid"],
+        vout=records["vout"],
+        value_sats=records["value_sats"],
+        input_vbytes=records["input_vbytes"],
+    )
+
+
+def convert_fixture(
+    fixture: str | os.PathLike[str], out_dir: str | os.PathLike[str]
+) -> list[Path]:
+    """
+    Writes one snapshot per case of a fixture JSON (as produced by
+    tests/utils/gen_cases.py) to out_dir/case_NNN.utxos, giving UTXO i the
+    same txid/vout as the tests and examples do (f"{i:064x}", i), and the
+    rest of the case (target, fee rate, sizing, ...) to out_dir/case_NNN.json,
+    so a replay never parses the whole fixture. Returns the snapshot paths.
+    """
+    payload = json.loads(Path(fixture).read_text(encoding="utf-8"))
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    paths: list[Path] = []
+    for k, case in enumerate(payload["cases"]):
+        utxos = [
+            UTXO(
+                txid=f"{i:064x}",
+                vout=i,
+                value_sats=int(u["value_sats"]),
+                input_vbytes=float(u["input_vbytes"]),
+            )
+            for i, u in enumerate(case["utxos"])
+        ]
+        path = out / f"case_{k:03d}.utxos"
+        write_snapshot(path, utxos)
+        header = {key: value for key, value in case.items() if key != "utxos"}
+        path.with_suffix(".json").write_text(json.dumps(header), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert a fixture JSON into one UTXO snapshot per case."
+    )
+    parser.add_argument("fixture", help="Path to fixture JSON")
+    parser.add_argument("out_dir", help="Directory for the case_NNN.utxos files")
+    args = parser.parse_args()
+
+    paths = convert_fixture(args.fixture, args.out_dir)
+    print(f"Wrote {len(paths)} snapshots to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,201 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+import contextlib
+import math
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Sequence, TypeVar
 
+import numpy as np
+import numpy.typing as npt
 import pulp
+from scipy.optimize import Bounds, LinearConstraint, milp
 
-from .model import SimpleCoinSelectionModel
-from .types import UTXO, SelectionResult
+from . import _cbc
+from .feasibility import ensure_feasible
+from .heuristics import greedy_indices
+from .metrics import instrumented, record_solve
+from .model import (
+    MinChangeRoundingError,
+    SimpleCoinSelectionModel,
+    SolverTimeoutError,
+    utxo_weights,
+)
+from .presolve import presolve
+from .types import (
+    UTXO,
+    Incumbent,
+    SelectionParams,
+    SelectionResult,
+    SolveStats,
+)
+
+# What SimpleCoinSelectionModel.build() returns
+_Built = tuple[
+    pulp.LpProblem,
+    list[pulp.LpVariable],
+    pulp.LpVariable,
+    pulp.LpVariable,
+    pulp.LpVariable,
+]
+
+# Slack added to the CBC cutoff so the incumbent itself is never cut off.
+_CUTOFF_TOL = 1e-6
+
+
+class _Phases:
+    """
+    Wall time per solve phase, for SolveStats. While disabled (the default)
+    lap() and cbc() only check a flag.
+    """
+
+    __slots__ = ("enabled", "seconds", "_last")
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self.seconds: dict[str, float] = {}
+        self._last = time.perf_counter() if enabled else 0.0
+
+    def lap(self, phase: str) -> None:
+        """Adds the time since the previous lap to phase."""
+        if self.enabled:
+            now = time.perf_counter()
+            self.seconds[phase] = self.seconds.get(phase, 0.0) + now - self._last
+            self._last = now
+
+    def cbc(self, log: _cbc.CBCLog) -> None:
+        """Adds a CBC run's own write/cbc/read times (see _cbc.CBCLog)."""
+        if self.enabled:
+            for phase, seconds in (
+                ("write", log.write_seconds),
+                ("cbc", log.run_seconds),
+                ("read", log.read_seconds),
+            ):
+                self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+            self._last = time.perf_counter()
+
+    def stats(
+        self,
+        n_variables: int,
+        n_constraints: int,
+        status: str,
+        *,
+        nodes: int | None = None,
+        objective: float | None = None,
+        best_bound: float | None = None,
+    ) -> SolveStats:
+        gap = None
+        if objective is not None and best_bound is not None and objective > 0:
+            gap = max(0.0, (objective - best_bound) / objective)
+        return SolveStats(
+            phase_seconds=dict(self.seconds),
+            n_variables=n_variables,
+            n_constraints=n_constraints,
+            status=status,
+            nodes=nodes,
+            objective=objective,
+            best_bound=best_bound,
+            gap=gap,
+        )
+
+
+def _milp_backend(solver: SimpleMILPSolver) -> str:
+    # Metrics label: fast mode never runs CBC
+    return "greedy" if solver.fast else "cbc"
+
+
+def _anytime(result: SelectionResult, best_bound: float | None) -> SelectionResult:
+    """Marks a result from an interrupted search, with its bound and gap."""
+    gap = None
+    if best_bound is not None and result.fee_sats > 0:
+        gap = max(0.0, (result.fee_sats - best_bound) / result.fee_sats)
+    return replace(result, is_optimal=False, best_bound=best_bound, gap=gap)
+
+
+def _greedy(
+    model: SimpleCoinSelectionModel,
+    report: Callable[[float, SelectionResult], None] | None = None,
+) -> tuple[list[int] | None, SelectionResult | None]:
+    """Greedy incumbent (indices into model.utxos) and its result, if any."""
+    model.validate()
+    values, weights = utxo_weights(model.utxos)
+    greedy = greedy_indices(model, values, weights)
+    if greedy is None:
+        # Fail fast, before CBC, when infeasibility is provable
+        ensure_feasible(model, values, weights)
+        return None, None
+
+    incumbent: list[int] = greedy.tolist()
+    result = model.result_for([model.utxos[i] for i in incumbent])
+    if report is not None:
+        report(model.objective_for(result.tx_vbytes), result)
+    return incumbent, result
+
+
+def _fast_result(fallback: SelectionResult | None) -> SelectionResult:
+    if fallback is None:
+        raise RuntimeError("Greedy heuristic found no feasible selection")
+    return fallback
+
+
+def _better_start(
+    model: SimpleCoinSelectionModel, candidate: list[int], current: list[int] | None
+) -> bool:
+    """
+    True if candidate is a valid MIP start with a lower objective than
+    current (or current is not a valid MIP start).
+    """
+    start = _mip_start(model, candidate)
+    if start is None:
+        return False
+    other = None if current is None else _mip_start(model, current)
+    return other is None or start[0] < other[0]
+
+
+def _binary(name: str) -> pulp.LpVariable:
+    return pulp.LpVariable(name, lowBound=0, upBound=1, cat=pulp.LpBinary)
+
+
+def _add_min_vbytes(built: _Built, min_tx_vbytes: int) -> None:
+    # A known lower bound on the optimal tx_vbytes, added as a cut
+    if min_tx_vbytes:
+        prob, vbytes_var = built[0], built[4]
+        prob += vbytes_var >= min_tx_vbytes, "min_tx_vbytes"
+
+
+_T = TypeVar("_T")
+
+
+def _or_none(fn: Callable[..., _T], *args: Any) -> _T | None:
+    # Batch APIs report infeasible requests as None instead of raising
+    try:
+        return fn(*args)
+    except RuntimeError:
+        return None
+
+
+def _presolved(model: SimpleCoinSelectionModel) -> SimpleCoinSelectionModel:
+    reduced = presolve(model).model
+    if not reduced.utxos:
+        # Every UTXO is worth less than its input fee; always certified
+        ensure_feasible(reduced)
+    return reduced
+
+
+def _mip_start(
+    model: SimpleCoinSelectionModel, selected: list[int]
+) -> tuple[float, SelectionResult] | None:
+    """
+    Returns (objective, result) for a feasible selection, None otherwise.
+    The MILP's fee is the rounded one, so every feasible selection is a
+    valid MIP start and objective cutoff.
+    """
+    try:
+        result = model.result_for([model.utxos[i] for i in selected])
+    except MinChangeRoundingError:
+        return None
+    return model.objective_for(result.tx_vbytes), result
 
 
 @dataclass(frozen=True, slots=True)
@@ -18,51 +208,452 @@ class SimpleMILPSolver:
       - If no feasible solution exists under that policy, it will fail (by design).
     """
 
-    time_limit_seconds: int | None = None
+    time_limit_seconds: float | None = None
+    presolve: bool = False  # shrink the UTXO pool first (see presolve.py)
+    warm_start: bool = True  # seed CBC with a greedy incumbent and cutoff
+    fast: bool = False  # return the greedy incumbent without running CBC
+    collect_stats: bool = False  # attach SolveStats (phase times, counts) to results
 
-    def solve(self, model: SimpleCoinSelectionModel) -> SelectionResult:
-        prob, x_vars, change_var, _fee_expr, _vbytes_expr = model.build()
+    @instrumented(_milp_backend)
+    def solve(
+        self,
+        model: SimpleCoinSelectionModel,
+        on_incumbent: Callable[[Incumbent], None] | None = None,
+        *,
+        min_tx_vbytes: int = 0,
+    ) -> SelectionResult:
+        """
+        Solves the model. on_incumbent, if given, is called with every
+        improving solution while the search runs (the greedy incumbent, with
+        its result, and then each one CBC logs).
+
+        min_tx_vbytes, if given, must be a lower bound on the optimal
+        selection's tx_vbytes (e.g. the optimum at a lower fee rate); CBC
+        gets it as a cut. fast mode ignores it.
+
+        If the time limit stops CBC after it found a solution, the best one
+        is returned with is_optimal=False and the bound and gap CBC proved.
+
+        With collect_stats, the result's stats has the wall time of every
+        phase (validate, presolve, greedy, build, write, cbc, read, extract),
+        the problem size and what CBC reported (status, nodes, bound, gap).
+        """
+        started = time.perf_counter()
+        reported = [math.inf]
+
+        def report(objective: float, result: SelectionResult | None = None) -> None:
+            # CBC re-logs the MIP start; only pass on strict improvements
+            if on_incumbent is not None and objective < reported[0] - _CUTOFF_TOL:
+                reported[0] = objective
+                elapsed = time.perf_counter() - started
+                on_incumbent(Incumbent(objective, elapsed, result))
+
+        phases = _Phases(self.collect_stats)
+        model.validate()
+        phases.lap("validate")
+
+        model, incumbent, fallback = self._setup(model, report, phases)
+        if self.fast:
+            return self._fast(fallback, phases)
+
+        built = model.build()
+        _add_min_vbytes(built, min_tx_vbytes)
+        phases.lap("build")
+        return self._run(model, built, incumbent, fallback, report, phases)
+
+    async def solve_async(
+        self,
+        model: SimpleCoinSelectionModel,
+        limiter: asyncio.Semaphore | None = None,
+    ) -> SelectionResult:
+        """
+        Same as solve(), without blocking the event loop: model building and
+        I/O run in a worker thread and CBC runs as an asyncio subprocess.
+
+        limiter, if given, bounds how many solves run at once (share one
+        semaphore between requests). Cancelling the awaiting task kills the
+        CBC process.
+        """
+        async with limiter if limiter is not None else contextlib.nullcontext():
+            # Metrics time the solve itself, not the wait for the limiter
+            started = time.perf_counter()
+            try:
+                result = await self._solve_async(model)
+            except Exception as exc:
+                record_solve(_milp_backend(self), len(model.utxos), started, error=exc)
+                raise
+            record_solve(_milp_backend(self), len(model.utxos), started, result)
+            return result
+
+    async def _solve_async(self, model: SimpleCoinSelectionModel) -> SelectionResult:
+        phases = _Phases(self.collect_stats)
+        model, incumbent, fallback = await asyncio.to_thread(
+            self._setup, model, None, phases
+        )
+        if self.fast:
+            return self._fast(fallback, phases)
+
+        built = await asyncio.to_thread(model.build)
+        phases.lap("build")
+        prob = built[0]
+        options = self._cbc_options(model, built, incumbent)
+        status, log = await _cbc.solve_async(
+            prob,
+            time_limit_seconds=self.time_limit_seconds,
+            warm_start=bool(options),
+            options=options,
+        )
+        phases.cbc(log)
+        if options and pulp.LpStatus[status] == "Infeasible" and not log.out_of_time:
+            # See _run(): CBC can over-tighten the cutoff; solve cold
+            status, log = await _cbc.solve_async(
+                prob, time_limit_seconds=self._time_left(log)
+            )
+            phases.cbc(log)
+        return self._result(model, built, status, log, fallback, phases)
+
+    def _setup(
+        self,
+        model: SimpleCoinSelectionModel,
+        report: Callable[[float, SelectionResult], None] | None = None,
+        phases: _Phases | None = None,
+    ) -> tuple[SimpleCoinSelectionModel, list[int] | None, SelectionResult | None]:
+        # Presolve and greedy incumbent: (model, incumbent, its result)
+        phases = phases or _Phases()
+        if self.presolve:
+            model = _presolved(model)
+            phases.lap("presolve")
+        if self.warm_start or self.fast:
+            incumbent, fallback = _greedy(model, report)
+            phases.lap("greedy")
+            return model, incumbent, fallback
+        ensure_feasible(model)
+        return model, None, None
+
+    def _fast(
+        self, fallback: SelectionResult | None, phases: _Phases
+    ) -> SelectionResult:
+        result = _fast_result(fallback)
+        if not phases.enabled:
+            return result
+        return replace(result, stats=phases.stats(0, 0, "Greedy heuristic"))
+
+    def solve_many(
+        self,
+        utxos: Sequence[UTXO],
+        params_list: Sequence[SelectionParams],
+        *,
+        min_tx_vbytes: int = 0,
+    ) -> list[SelectionResult | None]:
+        """
+        Solves one request per SelectionParams against the same UTXO pool.
+
+        Selection variables are created once per UTXO of the pool; each request
+        only builds the balance row and objective for its target and fee
+        rate (over the kept subset of the variables, with presolve). Each
+        solve is warm-started from the better of the greedy incumbent and the
+        previous request's solution, when that is feasible.
+
+        Returns one result per params, in order, with None where no feasible
+        selection exists. In fast mode, requests are solved independently.
+        min_tx_vbytes is passed to every solve (see solve()).
+        """
+        if self.fast:
+            return [
+                _or_none(self.solve, SimpleCoinSelectionModel(utxos, params))
+                for params in params_list
+            ]
+
+        # x_i per UTXO of the pool, created the first time a request uses it
+        pool_vars: dict[int, pulp.LpVariable] = {}
+        previous: list[int] = []  # last selection, as rows of the pool
+        results: list[SelectionResult | None] = []
+
+        for params in params_list:
+            started = time.perf_counter()
+            try:
+                result, previous = self._quote(
+                    utxos, params, pool_vars, previous, min_tx_vbytes
+                )
+            except RuntimeError as exc:
+                record_solve("cbc", len(utxos), started, error=exc)
+                results.append(None)
+                continue
+            record_solve("cbc", len(utxos), started, result)
+            results.append(result)
+
+        return results
+
+    def _quote(
+        self,
+        utxos: Sequence[UTXO],
+        params: SelectionParams,
+        pool_vars: dict[int, pulp.LpVariable],
+        previous: Sequence[int],
+        min_tx_vbytes: int = 0,
+    ) -> tuple[SelectionResult, list[int]]:
+        # One solve_many() request, reusing (and extending) pool_vars.
+        # previous is the last request's selection as rows of the pool, tried
+        # as a MIP start; returns the result and its selection as rows
+        phases = _Phases(self.collect_stats)
+        model = SimpleCoinSelectionModel(utxos, params)
+        model.validate()
+        phases.lap("validate")
+
+        kept: npt.NDArray[np.intp] = np.arange(len(utxos))
+        if self.presolve:
+            reduced = presolve(model)
+            if not reduced.model.utxos:
+                ensure_feasible(reduced.model)
+            model, kept = reduced.model, reduced.kept
+            phases.lap("presolve")
+
+        rows: list[int] = kept.tolist()
+        for i in rows:
+            if i not in pool_vars:
+                pool_vars[i] = _binary(f"x_{i}")
+        x_vars = [pool_vars[i] for i in rows]
+
+        greedy: list[int] | None = None
+        fallback: SelectionResult | None = None
+        incumbent: list[int] | None = None
+        if self.warm_start:
+            greedy, fallback = _greedy(model)
+            incumbent = greedy
+            # Positions of the previous rows in the (sorted) kept rows, if
+            # presolve kept them all
+            pos = np.searchsorted(kept, previous)
+            if (
+                previous
+                and np.all(pos < kept.size)
+                and np.array_equal(kept[pos], previous)
+            ):
+                start: list[int] = pos.tolist()
+                if _better_start(model, start, incumbent):
+                    incumbent = start
+            phases.lap("greedy")
+        else:
+            ensure_feasible(model)
+
+        built = model.build(x_vars)
+        _add_min_vbytes(built, min_tx_vbytes)
+        phases.lap("build")
+        result = self._run(model, built, incumbent, fallback, None, phases)
+
+        if greedy is not None and fallback is not None:
+            if result.selected == fallback.selected:
+                # The greedy selection, e.g. CBC hit the time limit first
+                return result, kept[greedy].tolist()
+        taken = [row for row, x in zip(rows, x_vars) if (x.value() or 0) > 0.5]
+        return result, taken
+
+    def _run(
+        self,
+        model: SimpleCoinSelectionModel,
+        built: _Built,
+        incumbent: list[int] | None,
+        fallback: SelectionResult | None,
+        report: Callable[[float], None] | None = None,
+        phases: _Phases | None = None,
+    ) -> SelectionResult:
+        phases = phases or _Phases()
+        prob = built[0]
+        options = self._cbc_options(model, built, incumbent)
 
-        # Pick a solver.
         # CBC is bundled with many PuLP installs; this is the usual default.
-        solver = pulp.PULP_CBC_CMD(msg=False, timeLimit=self.time_limit_seconds)
-        status = prob.solve(solver)
+        # It runs through _cbc so the log (bound, incumbents) is kept.
+        status, log = _cbc.solve(
+            prob,
+            time_limit_seconds=self.time_limit_seconds,
+            warm_start=bool(options),
+            options=options,
+            on_incumbent=report,
+        )
+        phases.cbc(log)
+
+        if options and pulp.LpStatus[status] == "Infeasible" and not log.out_of_time:
+            # CBC's preprocessing can tighten a valid cutoff past the
+            # incumbent and then "prove" infeasibility. The incumbent shows
+            # the problem is feasible, so solve again cold, in the time left
+            # (out of time, _extract() returns the incumbent instead).
+            status, log = _cbc.solve(
+                prob, time_limit_seconds=self._time_left(log), on_incumbent=report
+            )
+            phases.cbc(log)
+
+        return self._result(model, built, status, log, fallback, phases)
+
+    def _time_left(self, log: _cbc.CBCLog) -> float | None:
+        # Time limit for a second CBC run after the one that wrote log
+        if self.time_limit_seconds is None:
+            return None
+        return self.time_limit_seconds - log.run_seconds
+
+    def _cbc_options(
+        self,
+        model: SimpleCoinSelectionModel,
+        built: _Built,
+        incumbent: list[int] | None,
+    ) -> list[str]:
+        """
+        Sets the incumbent as MIP start and returns the matching CBC cutoff
+        option, if the incumbent is a valid start; [] otherwise.
+        """
+        _prob, x_vars, change_var, fee_var, vbytes_var = built
+        start = None if incumbent is None else _mip_start(model, incumbent)
+        if start is None:
+            return []
+
+        objective, result = start
+        for x, value in zip(x_vars, model.choice_values(incumbent or [])):
+            x.setInitialValue(value)
+        change_var.setInitialValue(result.change_sats)
+        fee_var.setInitialValue(result.fee_sats)
+        vbytes_var.setInitialValue(result.tx_vbytes)
+        return [f"cutoff {objective + _CUTOFF_TOL}"]
+
+    def _result(
+        self,
+        model: SimpleCoinSelectionModel,
+        built: _Built,
+        status: int,
+        log: _cbc.CBCLog,
+        fallback: SelectionResult | None,
+        phases: _Phases | None = None,
+    ) -> SelectionResult:
+        result = self._extract(model, built, status, log, fallback)
+        if phases is None or not phases.enabled:
+            return result
+
+        phases.lap("extract")
+        prob = built[0]
+        stats = phases.stats(
+            prob.numVariables(),
+            prob.numConstraints(),
+            pulp.LpSolution[prob.sol_status],
+            nodes=log.nodes,
+            objective=log.objective,
+            best_bound=log.best_bound,
+        )
+        return replace(result, stats=stats)
+
+    def _extract(
+        self,
+        model: SimpleCoinSelectionModel,
+        built: _Built,
+        status: int,
+        log: _cbc.CBCLog,
+        fallback: SelectionResult | None,
+    ) -> SelectionResult:
+        prob, x_vars, change_var, _fee_var, _vbytes_var = built
 
         if pulp.LpStatus[status] != "Optimal":
+            # CBC's preprocessing also says "Infeasible" when the time limit
+            # cuts it short, so that is no proof once the limit has passed
+            timed_out = pulp.LpStatus[status] == "Not Solved" or (
+                pulp.LpStatus[status] == "Infeasible" and log.out_of_time
+            )
+            if timed_out and fallback is not None:
+                # Time limit hit before CBC found anything better
+                return _anytime(fallback, log.best_bound)
+            if timed_out:
+                raise SolverTimeoutError(
+                    "Time limit reached before CBC found a feasible selection"
+                )
             raise RuntimeError(
                 f"No optimal solution found. Status: {pulp.LpStatus[status]}"
             )
 
-        selected: list[UTXO] = []
-        for utxo, x in zip(model.utxos, x_vars):
-            xv = x.value()
-            if xv is None:
-                continue
-            if xv > 0.5:
-                selected.append(utxo)
+        selected = model.selected_from([x.value() for x in x_vars])
 
         change_val = change_var.value()
         if change_val is None:
             raise RuntimeError("Solver returned no change value")
 
-        # Recompute fee/vbytes in a deterministic integer way
-        fee_sats, tx_vbytes = model.evaluate_fee_and_vbytes(selected)
+        result = model.result_for(selected)
+        if prob.sol_status == pulp.LpSolutionOptimal:
+            return result
 
-        # Sanity: compute change from balance with integer fee/vbytes
-        total_in = sum(u.value_sats for u in selected)
-        target = model.params.target_sats
-        change_sats = total_in - target - fee_sats
+        # Stopped on the time limit with an integer solution
+        if fallback is not None and fallback.fee_sats < result.fee_sats:
+            result = fallback
+        return _anytime(result, log.best_bound)
 
-        # Enforce policy sanity (since we recompute fee with ceil)
-        if change_sats < model.params.min_change_sats:
-            raise RuntimeError(
-                "Solution violates min_change after integer fee rounding. "
-                "Try slightly higher UTXO sum or adjust sizing/feerate rounding."
-            )
 
-        return SelectionResult(
-            selected=tuple(selected),
-            change_sats=int(change_sats),
-            fee_sats=int(fee_sats),
-            tx_vbytes=int(tx_vbytes),
+@dataclass(frozen=True, slots=True)
+class HiGHSMILPSolver:
+    """
+    In-process MILP solver for the SimpleCoinSelectionModel using HiGHS
+    (through scipy.optimize.milp).
+
+    Solves the array form of the model (build_arrays()), so no LP/MPS file is
+    written and no solver subprocess is started.
+    """
+
+    time_limit_seconds: float | None = None
+    mip_rel_gap: float = 0.0  # prove optimality, like CBC's default
+    presolve: bool = False  # shrink the UTXO pool first (see presolve.py)
+    collect_stats: bool = False  # attach SolveStats (phase times, counts) to results
+
+    @instrumented("highs")
+    def solve(self, model: SimpleCoinSelectionModel) -> SelectionResult:
+        """
+        Solves the model. With collect_stats, the result's stats has the wall
+        time of every phase (presolve, build, highs, extract), the problem
+        size and what HiGHS reported (status, nodes, bound, gap).
+        """
+        phases = _Phases(self.collect_stats)
+        if self.presolve:
+            model = _presolved(model)
+            phases.lap("presolve")
+        ensure_feasible(model)
+
+        arrays = model.build_arrays()
+        phases.lap("build")
+
+        options: dict[str, float | bool] = {
+            "disp": False,
+            "mip_rel_gap": self.mip_rel_gap,
+        }
+        if self.time_limit_seconds is not None:
+            options["time_limit"] = float(self.time_limit_seconds)
+
+        res = milp(
+            arrays.objective,
+            integrality=arrays.integrality,
+            bounds=Bounds(arrays.lower_bounds, arrays.upper_bounds),
+            constraints=LinearConstraint(
+                arrays.constraint_matrix, arrays.constraint_lb, arrays.constraint_ub
+            ),
+            options=options,
+        )
+        phases.lap("highs")
+
+        if res.x is None and res.status == 1:
+            raise SolverTimeoutError(f"No solution found. Status: {res.message}")
+        if res.x is None or res.status not in (0, 1):
+            raise RuntimeError(f"No optimal solution found. Status: {res.message}")
+
+        selected = model.selected_from(res.x[: arrays.n_choice].tolist())
+        result = model.result_for(selected)
+
+        bound = getattr(res, "mip_dual_bound", None)
+        if bound is not None:
+            bound = float(bound) + arrays.objective_offset
+        if res.status != 0:
+            # Time limit hit with a feasible solution
+            result = _anytime(result, bound)
+        if not phases.enabled:
+            return result
+
+        phases.lap("extract")
+        nodes = getattr(res, "mip_node_count", None)
+        stats = phases.stats(
+            len(arrays.objective),
+            arrays.constraint_matrix.shape[0],
+            str(res.message),
+            nodes=None if nodes is None else int(nodes),
+            objective=float(res.fun) + arrays.objective_offset,
+            best_bound=bound,
         )
+        return replace(result, stats=stats)
@@ -0,0 +1,145 @@
+"""
+Optimal selections over a range of fee rates, solving only at breakpoints.
+
+At a fixed rate the optimum is a feasible selection with the fewest
+tx_vbytes. A selection's fee only grows with the rate, so every selection is
+feasible up to some rate and infeasible above it; hence the optimal
+tx_vbytes never decreases with the rate, and a selection that is optimal at
+rate r stays optimal up to the last rate at which it is still feasible:
+
+    max_rate = floor(1000 * (inputs - target - min_change) / tx_vbytes)
+
+in sat/kvB (see units.py). The sweep solves at r, records the piece
+[r, max_rate], and solves next at max_rate + 1, whose optimum is at least
+as large: one solve per distinct optimal selection instead of per rate.
+"""
+
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass, replace
+
+from .model import SimpleCoinSelectionModel, SolverTimeoutError
+from .solver import SimpleMILPSolver
+from .types import UTXO, CoinSelectionSolver, SelectionResult
+from .units import to_sat_per_kvb
+
+
+@dataclass(frozen=True, slots=True)
+class FeeRatePiece:
+    """
+    One selection that is optimal at every fee rate from min_sat_per_kvb to
+    max_sat_per_kvb (inclusive, whole sat/kvB). tx_vbytes is the same at
+    all of them; the fee and change vary with the rate.
+    """
+
+    min_sat_per_kvb: int
+    max_sat_per_kvb: int
+    selected: tuple[UTXO, ...]
+    tx_vbytes: int
+    is_optimal: bool = True  # False if its solve was stopped early
+
+
+@dataclass(frozen=True, slots=True)
+class FeeRateSweep:
+    """
+    Piecewise optimal selection of a request over a fee-rate range, from
+    sweep_fee_rates(). Pieces are contiguous and in increasing rate order;
+    infeasible_from_sat_per_kvb is the first rate in range at which the
+    solver found no feasible selection (then none is feasible at any
+    higher rate either), if any.
+    """
+
+    model: SimpleCoinSelectionModel
+    pieces: tuple[FeeRatePiece, ...]
+    infeasible_from_sat_per_kvb: int | None
+
+    @property
+    def breakpoints(self) -> list[int]:
+        """Rates (sat/kvB) at which the optimal selection changes."""
+        rates = [piece.min_sat_per_kvb for piece in self.pieces[1:]]
+        if self.pieces and self.infeasible_from_sat_per_kvb is not None:
+            rates.append(self.infeasible_from_sat_per_kvb)
+        return rates
+
+    def piece_at(self, fee_rate_sat_per_vb: float) -> FeeRatePiece | None:
+        """The piece covering a rate, or None if it is infeasible or out of range."""
+        rate = to_sat_per_kvb(fee_rate_sat_per_vb)
+        starts = [piece.min_sat_per_kvb for piece in self.pieces]
+        k = bisect.bisect_right(starts, rate) - 1
+        if k < 0 or rate > self.pieces[k].max_sat_per_kvb:
+            return None
+        return self.pieces[k]
+
+    def result_at(self, fee_rate_sat_per_vb: float) -> SelectionResult | None:
+        """The optimal SelectionResult at a rate, without solving."""
+        piece = self.piece_at(fee_rate_sat_per_vb)
+        if piece is None:
+            return None
+        params = replace(self.model.params, fee_rate_sat_per_vb=fee_rate_sat_per_vb)
+        result = replace(self.model, params=params).result_for(piece.selected)
+        return result if piece.is_optimal else replace(result, is_optimal=False)
+
+
+def _max_rate(model: SimpleCoinSelectionModel, result: SelectionResult) -> int:
+    # Highest rate (sat/kvB) at which the selection still leaves min_change
+    p = model.params
+    budget = result.total_input_sats - p.target_sats - p.min_change_sats
+    return 1000 * budget // result.tx_vbytes
+
+
+def sweep_fee_rates(
+    model: SimpleCoinSelectionModel,
+    max_fee_rate_sat_per_vb: float,
+    solver: CoinSelectionSolver | None = None,
+) -> FeeRateSweep:
+    """
+    Optimal selections of model's request for every fee rate from its own
+    fee_rate_sat_per_vb up to max_fee_rate_sat_per_vb, solving once per
+    piece (see the module docstring).
+
+    solver defaults to SimpleMILPSolver(). A SimpleMILPSolver gets the
+    previous piece's tx_vbytes as min_tx_vbytes when that piece is optimal;
+    other solvers (e.g. ClassDPSolver) are called once per piece as is.
+    """
+    model.validate()
+    lo = model.params.fee_rate_sat_per_kvb
+    hi = to_sat_per_kvb(max_fee_rate_sat_per_vb)
+    if hi < lo:
+        raise ValueError("max_fee_rate_sat_per_vb is below the model's fee rate")
+    solver = SimpleMILPSolver() if solver is None else solver
+    milp = solver if isinstance(solver, SimpleMILPSolver) else None
+
+    pieces: list[FeeRatePiece] = []
+    rate = lo
+    infeasible_from: int | None = None
+    while rate <= hi:
+        at_rate = replace(
+            model, params=replace(model.params, fee_rate_sat_per_vb=rate / 1000)
+        )
+        try:
+            if milp is not None:
+                # Only an optimal piece bounds the next optimum from below
+                bound = pieces[-1].tx_vbytes if pieces and pieces[-1].is_optimal else 0
+                result = milp.solve(at_rate, min_tx_vbytes=bound)
+            else:
+                result = solver.solve(at_rate)
+        except SolverTimeoutError:
+            raise
+        except RuntimeError:
+            infeasible_from = rate
+            break
+
+        last = min(_max_rate(at_rate, result), hi)
+        pieces.append(
+            FeeRatePiece(
+                min_sat_per_kvb=rate,
+                max_sat_per_kvb=last,
+                selected=result.selected,
+                tx_vbytes=result.tx_vbytes,
+                is_optimal=result.is_optimal,
+            )
+        )
+        rate = last + 1
+
+    return FeeRateSweep(model, tuple(pieces), infeasible_from)
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Protocol, Sequence
+
+from .units import to_sat_per_kvb
+
+if TYPE_CHECKING:
+    from .model import SimpleCoinSelectionModel
 
 
 @dataclass(frozen=True, slots=True)
@@ -34,10 +39,52 @@ class SelectionParams:
     """Fixed inputs for one coin-selection run."""
 
     target_sats: int
+    # Used as whole sat/kvB (fee_rate_sat_per_kvb); Fractions are accepted
     fee_rate_sat_per_vb: float
     min_change_sats: int  # dust / wallet policy threshold
     sizing: TxSizing
 
+    @property
+    def fee_rate_sat_per_kvb(self) -> int:
+        return to_sat_per_kvb(self.fee_rate_sat_per_vb)
+
+
+@dataclass(frozen=True, slots=True)
+class InfeasibilityCertificate:
+    """
+    Proof that no selection satisfies a request: even the selection with the
+    most change (every UTXO worth more than its input fee, before any fee
+    rounding) leaves only best_change_sats, shortfall_sats short of
+    min_change_sats.
+    """
+
+    shortfall_sats: int
+    best_change_sats: int  # upper bound on the change of any selection
+
+
+@dataclass(frozen=True, slots=True)
+class SolveStats:
+    """
+    Where a solve spent its time and what the backend reported, attached to
+    the result when the solver's collect_stats is set.
+    """
+
+    # Wall time per phase, in the order the phases ran (e.g. validate,
+    # presolve, greedy, build, write, cbc, read, extract)
+    phase_seconds: dict[str, float]
+    n_variables: int
+    n_constraints: int
+    status: str  # backend status, e.g. "Optimal Solution Found"
+    # Search figures in objective units (unrounded fee), if reported
+    nodes: int | None = None
+    objective: float | None = None
+    best_bound: float | None = None
+    gap: float | None = None
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.phase_seconds.values())
+
 
 @dataclass(frozen=True, slots=True)
 class SelectionResult:
@@ -47,6 +94,14 @@ class SelectionResult:
     change_sats: int
     fee_sats: int
     tx_vbytes: int
+    # Anytime solves (e.g. time limit hit) return the best selection found;
+    # best_bound is the proven lower bound on the (unrounded) fee and gap is
+    # (fee - best_bound) / fee, both when the backend reports them.
+    is_optimal: bool = True
+    best_bound: float | None = None
+    gap: float | None = None
+    # Per-phase timings and solver figures, only with collect_stats
+    stats: SolveStats | None = field(default=None, compare=False)
 
     @property
     def total_input_sats(self) -> int:
@@ -58,5 +113,20 @@ class SelectionResult:
         return self.total_input_sats - self.fee_sats
 
 
+@dataclass(frozen=True, slots=True)
+class Incumbent:
+    """An improving solution reported while a solver is still searching."""
+
+    objective: float  # unrounded fee (sats) of the solution
+    elapsed_seconds: float
+    result: SelectionResult | None = None  # set when the selection is known
+
+
+class CoinSelectionSolver(Protocol):
+    """Anything with a solve(model) -> SelectionResult method."""
+
+    def solve(self, model: SimpleCoinSelectionModel) -> SelectionResult: ...
+
+
 def total_input_vbytes(selected: Sequence[UTXO]) -> float:
     return sum((u.input_vbytes for u in selected), float(0))
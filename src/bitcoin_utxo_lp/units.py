@@ -0,0 +1,61 @@
+"""
+Exact integer size and fee arithmetic.
+
+Sizes are counted in weight units (WU; 4 per vbyte) and fee rates in whole
+sat/kvB, as Bitcoin Core does; a rate is rounded up, so no fee falls below
+the requested rate. A transaction of weight w at r sat/kvB pays
+
+    ceil(r * ceil(w / 4) / 1000) sats,
+
+computed in integers only, so the MILP, the other solvers and the reported
+results agree to the sat.
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+from fractions import Fraction
+from typing import TypeVar
+
+import numpy as np
+import numpy.typing as npt
+
+WITNESS_SCALE_FACTOR = 4  # WU per vbyte
+
+# Float noise allowed on sizes that are whole weight units (e.g. 57.5 vB)
+_EPS = 1e-9
+
+_N = TypeVar("_N", int, npt.NDArray[np.int64])
+
+
+def to_weight(vbytes: float) -> int:
+    """A size in vbytes as weight units, rounded up to a whole WU."""
+    return math.ceil(vbytes * WITNESS_SCALE_FACTOR - _EPS)
+
+
+def to_weights(vbytes: npt.NDArray[np.floating]) -> npt.NDArray[np.int64]:
+    """Vectorised to_weight()."""
+    scaled = vbytes.astype(np.float64) * WITNESS_SCALE_FACTOR
+    return np.ceil(scaled - _EPS).astype(np.int64)
+
+
+@functools.lru_cache(maxsize=1024)
+def to_sat_per_kvb(fee_rate_sat_per_vb: float | Fraction) -> int:
+    """
+    A fee rate in sat/vB as whole sat/kvB, rounded up. A float is taken as
+    the decimal it prints as, so 1.1 is exactly 1100 sat/kvB.
+    """
+    rate = fee_rate_sat_per_vb
+    exact = rate if isinstance(rate, Fraction) else Fraction(str(rate))
+    return math.ceil(exact * 1000)
+
+
+def vbytes_for(weight: _N) -> _N:
+    """Virtual size of weight WU: ceil(weight / 4)."""
+    return -(-weight // WITNESS_SCALE_FACTOR)
+
+
+def fee_for(vbytes: _N, sat_per_kvb: int) -> _N:
+    """Fee of vbytes at sat_per_kvb: ceil(sat_per_kvb * vbytes / 1000)."""
+    return -(-(vbytes * sat_per_kvb) // 1000)
@@ -0,0 +1,208 @@
+"""
+Mutable wallet UTXO set, updated by per-block deltas.
+
+WalletPool keeps, per input size class (weight units), the class's UTXOs
+sorted by value descending. That is all presolve() needs: its uneconomical
+UTXOs are a suffix of each class and its top-K reduction a prefix, so the
+reduced model for a request is read off the indexes in time proportional to
+the candidates it keeps, however large the wallet is.
+
+The class lists are plain sorted lists: a delta finds its position by
+bisection, but inserting or deleting the key shifts the rest of the list, so
+it is O(n) per add() or spend() (a memmove, about 70 us at 100k UTXOs), plus
+an O(1) digest update (see digest.py). No coefficient arrays are kept between
+deltas: model() builds the reduced model, and its value and weight arrays,
+from the class prefixes on every uncached call.
+"""
+
+from __future__ import annotations
+
+import bisect
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from .digest import PoolDigest
+from .heuristics import greedy_indices
+from .model import SimpleCoinSelectionModel
+from .pool import UTXOPool
+from .types import UTXO, SelectionParams
+from .units import WITNESS_SCALE_FACTOR, to_weight
+
+# Sort key within a class: value descending, then outpoint
+_Key = tuple[int, str, int]
+
+# Per-class depth of the first candidate pass; doubled until it covers the
+# greedy bound
+_INITIAL_DEPTH = 64
+
+
+def _key(utxo: UTXO) -> _Key:
+    return (-utxo.value_sats, utxo.txid, utxo.vout)
+
+
+class WalletPool:
+    """
+    UTXO set of a wallet, changed with add(utxo) and spend(txid, vout).
+
+      - model(params) returns the presolved model for a request: for each
+        input size class, the economical UTXOs that can be part of an
+        optimal selection (see presolve()), class by class, highest value
+        first. Solving it gives the optimum over the whole wallet. Each
+        uncached call rebuilds the model, in time proportional to the
+        candidates it keeps; models are memoised per (params, model class)
+        until the next delta.
+      - add() and spend() are O(n) in the size of the UTXO's class (list
+        insertion and deletion).
+      - digest() is pool_digest() of the current UTXOs, kept up to date by
+        the deltas, e.g. for CachingSolver.
+      - to_pool() snapshots the whole set as a UTXOPool, in O(n).
+
+    Not thread-safe: serialise deltas and model() calls.
+    """
+
+    __slots__ = ("_utxos", "_classes", "_digest", "_models")
+
+    def __init__(self, utxos: Iterable[UTXO] = ()) -> None:
+        items = list(utxos)
+        self._utxos: dict[tuple[str, int], UTXO] = {}
+        self._classes: dict[int, list[_Key]] = {}
+        self._models: dict[
+            tuple[type[SimpleCoinSelectionModel], SelectionParams],
+            SimpleCoinSelectionModel,
+        ] = {}
+        for u in items:
+            if (u.txid, u.vout) in self._utxos:
+                raise ValueError(f"Duplicate UTXO {u.txid}:{u.vout}")
+            self._utxos[(u.txid, u.vout)] = u
+            self._classes.setdefault(to_weight(u.input_vbytes), []).append(_key(u))
+        for keys in self._classes.values():
+            keys.sort()
+        self._digest = PoolDigest(items)
+
+    def add(self, utxo: UTXO) -> None:
+        """Adds a new UTXO; its outpoint must not be in the wallet."""
+        outpoint = (utxo.txid, utxo.vout)
+        if outpoint in self._utxos:
+            raise ValueError(f"Duplicate UTXO {utxo.txid}:{utxo.vout}")
+        self._utxos[outpoint] = utxo
+        keys = self._classes.setdefault(to_weight(utxo.input_vbytes), [])
+        bisect.insort(keys, _key(utxo))
+        self._digest.add(utxo)
+        self._models.clear()
+
+    def spend(self, txid: str, vout: int) -> UTXO:
+        """Removes the UTXO at txid:vout and returns it."""
+        try:
+            utxo = self._utxos.pop((txid, vout))
+        except KeyError:
+            raise KeyError(f"Unknown UTXO {txid}:{vout}") from None
+        size = to_weight(utxo.input_vbytes)
+        keys = self._classes[size]
+        del keys[bisect.bisect_left(keys, _key(utxo))]
+        if not keys:
+            del self._classes[size]
+        self._digest.remove(utxo)
+        self._models.clear()
+        return utxo
+
+    def apply(
+        self, spent: Iterable[tuple[str, int]] = (), added: Iterable[UTXO] = ()
+    ) -> None:
+        """One block's delta: spends the outpoints, then adds the UTXOs."""
+        for txid, vout in spent:
+            self.spend(txid, vout)
+        for utxo in added:
+            self.add(utxo)
+
+    def __len__(self) -> int:
+        return len(self._utxos)
+
+    def __contains__(self, outpoint: object) -> bool:
+        return outpoint in self._utxos
+
+    def __iter__(self) -> Iterator[UTXO]:
+        return iter(self._utxos.values())
+
+    def digest(self) -> bytes:
+        return self._digest.digest()
+
+    def to_pool(self) -> UTXOPool:
+        return UTXOPool.from_utxos(self._utxos.values())
+
+    def _prefixes(self, depth: dict[int, int]) -> list[UTXO]:
+        # The first depth[size] UTXOs of each class, class by class
+        return [
+            self._utxos[(txid, vout)]
+            for size in sorted(depth)
+            for _, txid, vout in self._classes[size][: depth[size]]
+        ]
+
+    def model(
+        self,
+        params: SelectionParams,
+        model_cls: type[SimpleCoinSelectionModel] = SimpleCoinSelectionModel,
+    ) -> SimpleCoinSelectionModel:
+        """
+        The presolved model of params over the wallet's UTXOs.
+
+        Candidates are the highest-valued economical UTXOs of each class,
+        depth first 64 per class: a greedy selection among them bounds the
+        optimal input size, hence how many UTXOs of each class can matter
+        (as in presolve()), and the depth doubles until it covers that
+        bound or the class.
+        """
+        memo = (model_cls, params)
+        if memo in self._models:
+            return self._models[memo]
+
+        rate = params.fee_rate_sat_per_kvb
+        economical: dict[int, int] = {}
+        for size, keys in self._classes.items():
+            threshold = size // WITNESS_SCALE_FACTOR * rate // 1000
+            # Keys are (-value, ...): value > threshold is a prefix
+            count = bisect.bisect_left(keys, (-threshold,))
+            if count:
+                economical[size] = count
+        if not economical:
+            # Nothing pays for itself: the best UTXO of each class is enough
+            # for the solvers to report the request infeasible
+            economical = dict.fromkeys(self._classes, 1)
+
+        depth = _INITIAL_DEPTH
+        while True:
+            taken = {size: min(depth, n) for size, n in economical.items()}
+            utxos = self._prefixes(taken)
+            model = model_cls(utxos, params)
+            if not utxos:
+                break
+            values = np.fromiter(
+                (u.value_sats for u in utxos), dtype=np.int64, count=len(utxos)
+            )
+            weights = np.repeat(
+                np.array(sorted(taken), dtype=np.int64),
+                [taken[size] for size in sorted(taken)],
+            )
+            greedy = greedy_indices(model, values, weights)
+            if greedy is not None:
+                _fee, tx_vbytes = model.fee_and_vbytes_for_weight(
+                    int(weights[greedy].sum())
+                )
+                max_input_weight = (
+                    WITNESS_SCALE_FACTOR * tx_vbytes - model.fixed_weight()
+                )
+                needed = {
+                    size: min(max_input_weight // size, n)
+                    for size, n in economical.items()
+                }
+                if all(taken[size] >= k for size, k in needed.items()):
+                    model = model_cls(self._prefixes(needed), params)
+                    break
+                depth = max(2 * depth, *needed.values())
+            elif taken == economical:
+                break
+            else:
+                depth *= 2
+
+        self._models[memo] = model
+        return model
@@ -0,0 +1,168 @@
+"""
+Two-stage exact solver for very large pools.
+
+With tx_vbytes and the fee relaxed to continuous values, the model is a
+fractional covering knapsack: minimise the input weight W subject to
+
+    sum(e_i * x_i) >= D,  0 <= x_i <= 1,
+
+where e_i = 4000 * v_i - rate * w_i is UTXO i's effective value in 1/4000
+sats (sat/kvB times weight units) and D = 4000 * (target + min_change) +
+rate * fixed_weight. Its optimum W_LP takes UTXOs densest first (e_i / w_i)
+and cuts the last one fractionally; with lam = w_k / e_k of that one, the
+reduced cost of UTXO i is d_i = w_i - lam * e_i, and every selection obeys
+
+    W >= W_LP + sum(d_i for i taken, d_i > 0)
+              + sum(-d_i for i left out, d_i < 0).
+
+Stage 2 solves, exactly, the sub-pool of the UTXOs with the smallest |d_i|
+(the window) and those outside it that the LP takes. A selection with a
+lower fee than the sub-pool's optimum has tx_vbytes at most one less, so
+input weight at most W_max = 4 * (tx_vbytes - 1) - fixed_weight. If W_LP +
+min(|d_i| outside the window) exceeds W_max, such a selection agrees with
+the LP outside the window, so it is a selection of the sub-pool, which has
+none: the result is optimal for the whole pool. Otherwise the window grows
+to every UTXO with |d_i| <= W_max - W_LP (at least doubling).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+import numpy.typing as npt
+
+from .dp import ClassDPSolver
+from .feasibility import ensure_feasible
+from .metrics import instrumented
+from .model import (
+    SimpleCoinSelectionModel,
+    SolverTimeoutError,
+    utxo_subset,
+    utxo_weights,
+)
+from .types import CoinSelectionSolver, SelectionResult
+
+# Slack (weight units) on the reduced-cost test, far above float noise
+_EPS = 1e-6
+
+# Densest UTXOs sorted in the first pass of the LP; grows 4x until they
+# cover the demand
+_LP_PREFIX = 1024
+
+
+@dataclass(frozen=True, slots=True)
+class _Relaxation:
+    """LP optimum of the relaxed model and its reduced costs."""
+
+    weight: float  # W_LP
+    reduced_costs: npt.NDArray[np.float64]  # d_i, aligned with the pool
+
+
+def _smallest(keys: npt.NDArray[np.float64], k: int) -> npt.NDArray[np.intp]:
+    # Indices of the k smallest keys, sorted by key, without a full sort
+    if k >= keys.size:
+        return np.argsort(keys, kind="stable")
+    part = np.argpartition(keys, k - 1)[:k]
+    return part[np.argsort(keys[part], kind="stable")]
+
+
+def _relax(
+    model: SimpleCoinSelectionModel,
+    values: npt.NDArray[np.int64],
+    weights: npt.NDArray[np.int64],
+) -> _Relaxation | None:
+    # None if even every useful UTXO cannot cover the demand
+    p = model.params
+    rate = p.fee_rate_sat_per_kvb
+    effective = 4000 * values - rate * weights
+    demand = 4000 * (p.target_sats + p.min_change_sats) + rate * model.fixed_weight()
+
+    useful = np.flatnonzero(effective > 0)
+    density = effective[useful] / weights[useful]
+    m = min(_LP_PREFIX, useful.size)
+    while True:
+        order = useful[_smallest(-density, m)]
+        covered = np.cumsum(effective[order], dtype=np.float64)
+        k = int(np.searchsorted(covered, demand))
+        if k < order.size:
+            break
+        if m == useful.size:
+            return None
+        m = min(4 * m, useful.size)
+
+    last = order[k]
+    before = float(covered[k - 1]) if k else 0.0
+    fraction = max(demand - before, 0.0) / float(effective[last])
+    weight = float(weights[order[:k]].sum()) + fraction * float(weights[last])
+    lam = float(weights[last]) / float(effective[last])
+    return _Relaxation(weight, weights - lam * effective.astype(np.float64))
+
+
+@dataclass(frozen=True, slots=True)
+class LPWindowSolver:
+    """
+    Two-stage exact solver for very large pools: the LP relaxation picks a
+    window of a few hundred UTXOs, an exact solver solves it, and reduced
+    costs prove the result optimal for the whole pool, or widen the window
+    until they do (see the module docstring).
+
+      - window: size of the first window; it grows on each failed proof, up
+        to the whole pool.
+      - solver: solves each window, ClassDPSolver() by default. Any exact
+        solver works, e.g. HiGHSMILPSolver(time_limit_seconds=...); if its
+        result is not proven optimal, that result is returned as is.
+    """
+
+    window: int = 256
+    solver: CoinSelectionSolver = field(default_factory=ClassDPSolver)
+
+    @instrumented("lp_window")
+    def solve(self, model: SimpleCoinSelectionModel) -> SelectionResult:
+        if self.window < 1:
+            raise ValueError("window must be >= 1")
+        model.validate()
+        values, weights = utxo_weights(model.utxos)
+        ensure_feasible(model, values, weights)
+
+        relaxed = _relax(model, values, weights)
+        if relaxed is None:
+            raise RuntimeError("No feasible solution found")
+        d = relaxed.reduced_costs
+        distance = np.abs(d)
+        n = distance.size
+
+        size = min(self.window, n)
+        while True:
+            inside = _smallest(distance, size)
+            outside = np.ones(n, dtype=bool)
+            outside[inside] = False
+            # The LP's 1s outside the window join it as free columns: a
+            # selection that agrees with the LP outside the window is still
+            # a selection of this sub-pool
+            taken = np.flatnonzero(outside & (d < 0))
+            keep = np.sort(np.concatenate((inside, taken)))
+            sub = replace(model, utxos=utxo_subset(model.utxos, keep.tolist()))
+            try:
+                result: SelectionResult | None = self.solver.solve(sub)
+            except SolverTimeoutError:
+                raise
+            except RuntimeError:
+                result = None
+
+            if size == n:
+                if result is None:
+                    raise RuntimeError("No feasible solution found")
+                return result
+            if result is not None:
+                if not result.is_optimal:
+                    return result
+                max_weight = 4 * (result.tx_vbytes - 1) - model.fixed_weight()
+                gap = max_weight - relaxed.weight + _EPS
+                if distance[outside].min() > gap:
+                    return result
+                # The proof needs every UTXO with |d_i| <= gap in the window
+                needed = int(np.count_nonzero(distance <= gap))
+                size = min(max(2 * size, needed), n)
+                continue
+            size = min(2 * size, n)
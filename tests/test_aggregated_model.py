@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import pytest
+
+from bitcoin_utxo_lp import (
+    UTXO,
+    AggregatedCoinSelectionModel,
+    HiGHSMILPSolver,
+    SimpleMILPSolver,
+    presolve,
+)
+
+from .utils.cases import CaseV1, load_cases, model_from_case
+from .utils.instances import params
+
+
+def _large_uniform_pool() -> list[UTXO]:
+    # Same shape as examples/large_number_of_utxos.py: 6 distinct UTXO shapes
+    return [
+        UTXO(f"{i:064x}", 0, 10_000 + (i % 3) * 200, 68.0 + (i % 2) * 2.0)
+        for i in range(100_000)
+    ]
+
+
+def test_identical_utxos_share_one_variable() -> None:
+    model = AggregatedCoinSelectionModel(_large_uniform_pool(), params(90_000, 2.5))
+
+    arrays = model.build_arrays()
+    _prob, x_vars, _change, _fee, _vb = model.build()
+
+    assert arrays.n_choice == 6
+    assert sorted(arrays.upper_bounds[:6].tolist()) == [16_666] * 2 + [16_667] * 4
+    assert len(x_vars) == 6
+
+
+@pytest.mark.parametrize(
+    "solver",
+    [SimpleMILPSolver(), SimpleMILPSolver(warm_start=False), HiGHSMILPSolver()],
+)
+def test_large_uniform_pool_solves_aggregated(
+    solver: SimpleMILPSolver | HiGHSMILPSolver,
+) -> None:
+    utxos = _large_uniform_pool()
+    model = AggregatedCoinSelectionModel(utxos, params(90_000, 2.5))
+
+    res = solver.solve(model)
+
+    assert res.fee_sats == 1_710
+    assert res.tx_vbytes == 684
+    assert len(set(res.selected)) == len(res.selected)
+
+
+def test_counts_expand_to_first_utxos_in_pool_order() -> None:
+    utxos = [
+        UTXO("a" * 64, 0, 30_000, 68.0),
+        UTXO("b" * 64, 1, 30_000, 68.0),
+        UTXO("c" * 64, 2, 5_000, 91.0),
+        UTXO("d" * 64, 3, 30_000, 68.0),
+    ]
+    model = AggregatedCoinSelectionModel(utxos, params(50_000, 1.0))
+
+    # Groups are ordered by (value, vbytes): [5k/91, 30k/68]
+    assert model.selected_from([0.0, 2.0]) == [utxos[0], utxos[1]]
+    assert model.choice_values([1, 3]) == [0, 2]
+    assert SimpleMILPSolver().solve(model).selected == (utxos[0], utxos[1])
+
+
+def test_presolve_keeps_aggregated_model() -> None:
+    model = AggregatedCoinSelectionModel(_large_uniform_pool(), params(90_000, 2.5))
+
+    assert isinstance(presolve(model).model, AggregatedCoinSelectionModel)
+
+
+@pytest.mark.parametrize("case", load_cases())
+def test_aggregated_matches_simple_model_on_fixtures(case: CaseV1) -> None:
+    simple = model_from_case(case)
+    model = AggregatedCoinSelectionModel(simple.utxos, simple.params)
+    if case.get("expect") == "infeasible":
+        with pytest.raises(RuntimeError):
+            SimpleMILPSolver(time_limit_seconds=5).solve(model)
+        return
+
+    res = SimpleMILPSolver(time_limit_seconds=5).solve(model)
+    ref = SimpleMILPSolver(time_limit_seconds=5).solve(simple)
+
+    assert res.fee_sats == ref.fee_sats
+    assert res.change_sats >= model.params.min_change_sats
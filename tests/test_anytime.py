@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pulp
+import pytest
+
+from bitcoin_utxo_lp import (
+    BranchAndBoundSolver,
+    Incumbent,
+    SimpleCoinSelectionModel,
+    SimpleMILPSolver,
+    _cbc,
+)
+
+from .utils.instances import hard_model, small_instance
+
+
+def test_time_limit_returns_incumbent_with_gap() -> None:
+    model = hard_model()
+    seen: list[Incumbent] = []
+
+    res = SimpleMILPSolver(time_limit_seconds=0.5).solve(
+        model, on_incumbent=seen.append
+    )
+
+    assert res.change_sats >= model.params.min_change_sats
+    assert res.total_input_sats == (
+        model.params.target_sats + res.fee_sats + res.change_sats
+    )
+    assert not res.is_optimal
+    assert res.best_bound is not None and res.best_bound <= res.fee_sats
+    assert res.gap is not None and 0.0 <= res.gap < 1.0
+
+    # The greedy incumbent is streamed first, with its result
+    assert seen and seen[0].result is not None
+    objectives = [inc.objective for inc in seen]
+    assert objectives == sorted(objectives, reverse=True)
+    assert len(set(objectives)) == len(objectives)
+    assert objectives[-1] <= res.fee_sats
+
+
+def test_optimal_solve_keeps_default_result_shape() -> None:
+    model = SimpleCoinSelectionModel(*small_instance())
+
+    res = SimpleMILPSolver().solve(model)
+
+    assert res.is_optimal
+    assert res.best_bound is None and res.gap is None
+
+
+@pytest.mark.parametrize("first_run_seconds", [1.0, 0.25])
+def test_cold_retry_stays_within_the_time_limit(
+    monkeypatch: pytest.MonkeyPatch, first_run_seconds: float
+) -> None:
+    # CBC says "Infeasible" for the warm start, as when the limit cuts its
+    # preprocessing short; a cold retry only gets the time that is left
+    limits: list[float | None] = []
+
+    def infeasible(
+        prob: pulp.LpProblem, *, time_limit_seconds: float | None = None, **_: Any
+    ) -> tuple[int, _cbc.CBCLog]:
+        limits.append(time_limit_seconds)
+        seconds = first_run_seconds if len(limits) == 1 else time_limit_seconds
+        log = _cbc.CBCLog(
+            run_seconds=seconds or 0.0, time_limit_seconds=time_limit_seconds
+        )
+        return pulp.LpStatusInfeasible, log
+
+    monkeypatch.setattr(_cbc, "solve", infeasible)
+    model = SimpleCoinSelectionModel(*small_instance())
+
+    res = SimpleMILPSolver(time_limit_seconds=1.0).solve(model)
+
+    assert limits == ([1.0] if first_run_seconds >= 1.0 else [1.0, 0.75])
+    assert not res.is_optimal
+    assert res.change_sats >= model.params.min_change_sats
+
+
+def test_bnb_streams_improving_incumbents() -> None:
+    model = hard_model()
+    seen: list[Incumbent] = []
+
+    res = BranchAndBoundSolver().solve(model, on_incumbent=seen.append)
+
+    assert res.is_optimal
+    fees = [inc.result.fee_sats for inc in seen if inc.result is not None]
+    assert len(fees) == len(seen) >= 2
+    assert [inc.objective for inc in seen] == sorted(
+        (inc.objective for inc in seen), reverse=True
+    )
+    assert fees[-1] == res.fee_sats
+
+
+def test_bnb_budget_marks_result_not_optimal() -> None:
+    model = hard_model()
+
+    res = BranchAndBoundSolver(max_iterations=2_000).solve(model)
+
+    assert res.change_sats >= model.params.min_change_sats
+    assert not res.is_optimal
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from typing import Any
+
+import pulp
+import pytest
+
+from bitcoin_utxo_lp import (
+    SimpleCoinSelectionModel,
+    SimpleMILPSolver,
+    _cbc,
+    infeasibility_certificate,
+)
+
+from .utils.cases import load_cases, model_from_case
+from .utils.instances import hard_model
+
+
+class _ProcessTracker:
+    """Wraps asyncio.create_subprocess_exec to see the CBC processes."""
+
+    def __init__(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.procs: list[asyncio.subprocess.Process] = []
+        self.live: set[int] = set()
+        self.max_running = 0
+        self._create = asyncio.create_subprocess_exec
+        monkeypatch.setattr(asyncio, "create_subprocess_exec", self._spawn)
+
+    async def _spawn(self, *args: Any, **kwargs: Any) -> asyncio.subprocess.Process:
+        proc = await self._create(*args, **kwargs)
+        self.procs.append(proc)
+        self.live.add(proc.pid)
+        self.max_running = max(self.max_running, len(self.live))
+
+        wait = proc.wait
+
+        async def tracked_wait() -> int:
+            code = await wait()
+            self.live.discard(proc.pid)
+            return code
+
+        proc.wait = tracked_wait  # type: ignore[method-assign]
+        return proc
+
+
+def test_async_matches_sync_on_fixtures() -> None:
+    models = [model_from_case(case) for case in load_cases()]
+    solver = SimpleMILPSolver(time_limit_seconds=5)
+
+    async def run_all() -> list[Any]:
+        limiter = asyncio.Semaphore(4)
+        return await asyncio.gather(
+            *(solver.solve_async(m, limiter) for m in models), return_exceptions=True
+        )
+
+    for model, res in zip(models, asyncio.run(run_all())):
+        try:
+            ref = solver.solve(model)
+        except RuntimeError:
+            assert isinstance(res, RuntimeError)
+            continue
+        assert not isinstance(res, BaseException)
+        assert res.fee_sats == ref.fee_sats
+
+
+def test_limiter_bounds_concurrent_cbc_processes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    tracker = _ProcessTracker(monkeypatch)
+    # Provably infeasible requests are rejected without starting CBC
+    models = [
+        m
+        for m in map(model_from_case, load_cases())
+        if infeasibility_certificate(m) is None
+    ][:6]
+    solver = SimpleMILPSolver(warm_start=False)
+
+    async def run_all() -> None:
+        limiter = asyncio.Semaphore(2)
+        await asyncio.gather(
+            *(solver.solve_async(m, limiter) for m in models), return_exceptions=True
+        )
+
+    asyncio.run(run_all())
+
+    assert len(tracker.procs) == len(models)
+    assert tracker.max_running <= 2
+
+
+def test_cancellation_kills_cbc(monkeypatch: pytest.MonkeyPatch) -> None:
+    tracker = _ProcessTracker(monkeypatch)
+    model: SimpleCoinSelectionModel = hard_model()
+
+    async def cancel_midway() -> None:
+        task = asyncio.create_task(SimpleMILPSolver().solve_async(model))
+        while not tracker.procs:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_midway())
+
+    assert len(tracker.procs) == 1
+    assert tracker.procs[0].returncode is not None  # killed, not left running
+
+
+def test_cancellation_while_writing_removes_files(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    writing = threading.Event()
+    release = threading.Event()
+    runs: list[_cbc.CBCRun] = []
+    prepare = _cbc.prepare
+
+    def slow_prepare(*args: Any, **kwargs: Any) -> _cbc.CBCRun:
+        writing.set()
+        release.wait(5)
+        runs.append(prepare(*args, **kwargs))
+        return runs[-1]
+
+    monkeypatch.setattr(_cbc, "prepare", slow_prepare)
+
+    async def cancel_while_writing() -> None:
+        task = asyncio.create_task(
+            SimpleMILPSolver().solve_async(model_from_case(load_cases()[0]))
+        )
+        while not writing.is_set():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        release.set()
+
+    asyncio.run(cancel_while_writing())
+
+    assert len(runs) == 1
+    assert not os.path.exists(runs[0].mps_path)
+    assert runs[0].mst_path is None or not os.path.exists(runs[0].mst_path)
+
+
+def test_cbc_failure_is_a_runtime_error() -> None:
+    prob = pulp.LpProblem("p", pulp.LpMinimize)
+    x = pulp.LpVariable("x", lowBound=0, cat="Integer")
+    prob += x
+    prob += x >= 1
+
+    run = _cbc.prepare(prob)
+    with pytest.raises(RuntimeError):
+        run.finish(returncode=1)
+    assert not os.path.exists(run.mps_path)
+
+
+@pytest.mark.parametrize("warm_start", [False, True])
+def test_failed_cbc_spawn_removes_files(
+    monkeypatch: pytest.MonkeyPatch, warm_start: bool
+) -> None:
+    runs: list[_cbc.CBCRun] = []
+    prepare = _cbc.prepare
+
+    def tracked_prepare(*args: Any, **kwargs: Any) -> _cbc.CBCRun:
+        runs.append(prepare(*args, **kwargs))
+        runs[-1].args[0] = os.path.join(os.path.dirname(runs[-1].mps_path), "no-cbc")
+        return runs[-1]
+
+    monkeypatch.setattr(_cbc, "prepare", tracked_prepare)
+    solver = SimpleMILPSolver(warm_start=warm_start)
+
+    with pytest.raises(OSError):
+        solver.solve(model_from_case(load_cases()[0]))
+
+    assert len(runs) == 1
+    assert not os.path.exists(runs[0].mps_path)
+    assert runs[0].mst_path is None or not os.path.exists(runs[0].mst_path)
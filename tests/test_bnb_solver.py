@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import itertools
+
+import pytest
+from hypothesis import given, settings
+
+from bitcoin_utxo_lp import (
+    UTXO,
+    BranchAndBoundSolver,
+    SelectionParams,
+    SimpleCoinSelectionModel,
+    SimpleMILPSolver,
+    SolverTimeoutError,
+    TxSizing,
+)
+
+from .utils.cases import CaseV1, load_cases, model_from_case
+from .utils.exhaustive import best_by_exhaustive_search, evaluate_objective
+from .utils.instances import st_small_case
+
+
+@pytest.mark.parametrize("case", load_cases())
+def test_bnb_matches_milp_on_saved_cases(case: CaseV1) -> None:
+    model = model_from_case(case)
+
+    if case.get("expect") == "infeasible":
+        with pytest.raises(RuntimeError):
+            BranchAndBoundSolver().solve(model)
+        return
+
+    res = BranchAndBoundSolver().solve(model)
+    ref = SimpleMILPSolver(time_limit_seconds=5).solve(model)
+
+    assert res.fee_sats == ref.fee_sats
+    assert res.tx_vbytes == ref.tx_vbytes
+
+
+@settings(max_examples=100, deadline=None)
+@given(st_small_case())
+def test_bnb_matches_exhaustive_search(case) -> None:  # type: ignore[no-untyped-def]
+    utxos, params = case
+    model = SimpleCoinSelectionModel(utxos=utxos, params=params)
+
+    try:
+        best_obj, _ = best_by_exhaustive_search(params=params, utxos=utxos)
+    except RuntimeError:
+        with pytest.raises(RuntimeError):
+            BranchAndBoundSolver().solve(model)
+        return
+
+    res = BranchAndBoundSolver().solve(model)
+    assert res.fee_sats == best_obj.fee_sats
+    assert res.tx_vbytes == best_obj.tx_vbytes
+
+
+def test_bnb_iteration_budget_returns_best_so_far() -> None:
+    utxos = [
+        UTXO(f"{i:064x}", i, 1_000 + (i * 7_919) % 50_000, 68.0) for i in range(200)
+    ]
+    params = SelectionParams(
+        target_sats=400_000,
+        fee_rate_sat_per_vb=5.0,
+        min_change_sats=546,
+        sizing=TxSizing(
+            base_overhead_vbytes=10.0,
+            recipient_output_vbytes=31.0,
+            change_output_vbytes=31.0,
+        ),
+    )
+    model = SimpleCoinSelectionModel(utxos, params)
+
+    quick = BranchAndBoundSolver(max_iterations=50).solve(model)
+    full = BranchAndBoundSolver(max_iterations=1_000_000).solve(model)
+
+    assert quick.change_sats >= params.min_change_sats
+    assert quick.total_input_sats == (
+        params.target_sats + quick.fee_sats + quick.change_sats
+    )
+    assert full.fee_sats <= quick.fee_sats
+
+
+def test_bnb_budget_too_small_to_find_anything_raises() -> None:
+    utxos = [UTXO(f"{i:064x}", i, 10_000, 68.0) for i in range(50)]
+    params = SelectionParams(
+        target_sats=200_000,
+        fee_rate_sat_per_vb=1.0,
+        min_change_sats=546,
+        sizing=TxSizing(
+            base_overhead_vbytes=10.0,
+            recipient_output_vbytes=31.0,
+            change_output_vbytes=31.0,
+        ),
+    )
+
+    with pytest.raises(SolverTimeoutError):
+        BranchAndBoundSolver(max_iterations=3).solve(
+            SimpleCoinSelectionModel(utxos, params)
+        )
+
+
+@settings(max_examples=100, deadline=None)
+@given(st_small_case())
+def test_top_k_matches_exhaustive_search(case) -> None:  # type: ignore[no-untyped-def]
+    utxos, params = case
+    model = SimpleCoinSelectionModel(utxos=utxos, params=params)
+
+    fees = []
+    for bits in itertools.product([False, True], repeat=len(utxos)):
+        obj = evaluate_objective(params=params, utxos=utxos, selected_mask=list(bits))
+        if obj is not None:
+            fees.append(obj.fee_sats)
+    if not fees:
+        with pytest.raises(RuntimeError):
+            BranchAndBoundSolver().solve_top_k(model, 5)
+        return
+
+    top = BranchAndBoundSolver().solve_top_k(model, 5)
+    assert [r.fee_sats for r in top] == sorted(fees)[:5]
+    assert len({r.selected for r in top}) == len(top)
+    assert all(r.is_optimal for r in top)
+    assert all(r.change_sats >= params.min_change_sats for r in top)
+    assert top[0].fee_sats == BranchAndBoundSolver().solve(model).fee_sats
+
+
+def test_top_k_distinguishes_identical_utxos() -> None:
+    utxos = [UTXO(f"{i:064x}", 0, 50_000, 68.0) for i in range(4)]
+    params = SelectionParams(
+        target_sats=40_000,
+        fee_rate_sat_per_vb=1.0,
+        min_change_sats=546,
+        sizing=TxSizing(
+            base_overhead_vbytes=10.0,
+            recipient_output_vbytes=31.0,
+            change_output_vbytes=31.0,
+        ),
+    )
+    model = SimpleCoinSelectionModel(utxos, params)
+
+    top = BranchAndBoundSolver().solve_top_k(model, 6)
+
+    # Each single UTXO covers the target: four equal-fee alternatives first
+    assert [len(r.selected) for r in top] == [1, 1, 1, 1, 2, 2]
+    assert len({r.selected for r in top}) == 6
+    assert len(BranchAndBoundSolver().solve_top_k(model, 100)) == 15
+    with pytest.raises(ValueError):
+        BranchAndBoundSolver().solve_top_k(model, 0)
+
+
+def test_top_k_iteration_budget_marks_results() -> None:
+    utxos = [
+        UTXO(f"{i:064x}", i, 1_000 + (i * 7_919) % 50_000, 68.0) for i in range(200)
+    ]
+    params = SelectionParams(
+        target_sats=400_000,
+        fee_rate_sat_per_vb=5.0,
+        min_change_sats=546,
+        sizing=TxSizing(
+            base_overhead_vbytes=10.0,
+            recipient_output_vbytes=31.0,
+            change_output_vbytes=31.0,
+        ),
+    )
+    model = SimpleCoinSelectionModel(utxos, params)
+
+    top = BranchAndBoundSolver(max_iterations=500).solve_top_k(model, 3)
+    assert top
+    assert not any(r.is_optimal for r in top)
+    assert [r.fee_sats for r in top] == sorted(r.fee_sats for r in top)
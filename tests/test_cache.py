@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import random
+from dataclasses import replace
+
+import pytest
+
+from bitcoin_utxo_lp import (
+    UTXO,
+    CachingSolver,
+    ClassDPSolver,
+    PoolDigest,
+    SelectionParams,
+    SelectionResult,
+    SimpleCoinSelectionModel,
+    TxSizing,
+    UTXOPool,
+    pool_digest,
+)
+from bitcoin_utxo_lp.cache import _result_nbytes
+
+from .utils.cases import load_cases, model_from_case
+from .utils.instances import random_utxos
+
+SIZING = TxSizing(
+    base_overhead_vbytes=10.5,
+    recipient_output_vbytes=31.0,
+    change_output_vbytes=31.0,
+)
+
+
+class _CountingSolver:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def solve(self, model: SimpleCoinSelectionModel) -> SelectionResult:
+        self.calls += 1
+        return ClassDPSolver().solve(model)
+
+
+def test_digest_is_order_independent_and_matches_pool() -> None:
+    utxos = random_utxos(50)
+    shuffled = random.Random(1).sample(utxos, len(utxos))
+
+    assert pool_digest(utxos) == pool_digest(shuffled)
+    assert pool_digest(UTXOPool.from_utxos(shuffled)) == pool_digest(utxos)
+    # Any field change, or a missing / duplicated UTXO, changes the digest
+    for changed in (
+        [replace(utxos[0], vout=utxos[0].vout + 1), *utxos[1:]],
+        [replace(utxos[0], value_sats=utxos[0].value_sats + 1), *utxos[1:]],
+        [replace(utxos[0], input_vbytes=utxos[0].input_vbytes + 0.25), *utxos[1:]],
+        utxos[1:],
+        [*utxos, utxos[0]],
+    ):
+        assert pool_digest(changed) != pool_digest(utxos)
+    # Non-hex txids are accepted too
+    assert pool_digest([UTXO("a", 0, 1, 68.0)]) != pool_digest([UTXO("b", 0, 1, 68.0)])
+
+
+def test_incremental_digest_matches_recomputation() -> None:
+    utxos = random_utxos(40)
+    digest = PoolDigest(UTXOPool.from_utxos(utxos[:30]))
+
+    for u in utxos[30:]:
+        digest.add(u)
+    before = digest.copy()
+    digest.remove_all(utxos[:10])
+    digest.remove(utxos[35])
+
+    assert before.digest() == pool_digest(utxos)
+    assert digest.digest() == pool_digest(utxos[10:35] + utxos[36:])
+    assert digest.count == 29
+
+
+def test_repeated_requests_hit_the_cache() -> None:
+    model = model_from_case(load_cases()[0])
+    inner = _CountingSolver()
+    solver = CachingSolver(inner)
+
+    first = solver.solve(model)
+    reordered = SimpleCoinSelectionModel(list(reversed(model.utxos)), model.params)
+    assert solver.solve(reordered) == first
+    assert solver.solve(model, digest=pool_digest(model.utxos)) is first
+    other = replace(model.params, target_sats=model.params.target_sats + 1)
+    solver.solve(SimpleCoinSelectionModel(model.utxos, other))
+
+    info = solver.cache_info()
+    assert inner.calls == 2
+    assert (info.hits, info.misses, info.entries) == (2, 2, 2)
+    assert info.nbytes > 0
+
+
+def test_lru_eviction_by_entries_and_bytes() -> None:
+    utxos = random_utxos(20)
+    params = [
+        SelectionParams(
+            target_sats=t, fee_rate_sat_per_vb=2.0, min_change_sats=0, sizing=SIZING
+        )
+        for t in (10_000, 20_000, 30_000)
+    ]
+    models = [SimpleCoinSelectionModel(utxos, p) for p in params]
+
+    solver = CachingSolver(ClassDPSolver(), max_entries=2)
+    solver.solve(models[0])
+    solver.solve(models[1])
+    solver.solve(models[0])  # models[1] is now least recently used
+    solver.solve(models[2])
+    solver.solve(models[0])
+    assert solver.cache_info().evictions == 1
+    solver.solve(models[1])
+    assert solver.cache_info().misses == 4
+
+    one = CachingSolver(ClassDPSolver()).solve(models[0])
+    tight = CachingSolver(ClassDPSolver(), max_bytes=_result_nbytes(one))
+    for m in models:
+        tight.solve(m)
+    info = tight.cache_info()
+    assert info.entries <= 1
+    assert info.nbytes <= _result_nbytes(one)
+
+    solver.clear()
+    assert solver.cache_info().entries == 0
+
+
+def test_failures_are_not_cached() -> None:
+    model = SimpleCoinSelectionModel(
+        [UTXO("a" * 64, 0, 1_000, 68.0)],
+        SelectionParams(
+            target_sats=10_000,
+            fee_rate_sat_per_vb=1.0,
+            min_change_sats=0,
+            sizing=SIZING,
+        ),
+    )
+    solver = CachingSolver(_CountingSolver())
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            solver.solve(model)
+    assert solver.cache_info().entries == 0
+    assert solver.cache_info().misses == 2
+
+    with pytest.raises(ValueError):
+        CachingSolver(ClassDPSolver(), max_entries=0)
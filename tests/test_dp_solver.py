@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import pytest
+from hypothesis import given, settings
+
+from bitcoin_utxo_lp import (
+    UTXO,
+    ClassDPSolver,
+    SelectionParams,
+    SimpleCoinSelectionModel,
+    SimpleMILPSolver,
+    TxSizing,
+)
+
+from .utils.cases import CaseV1, load_cases, model_from_case
+from .utils.exhaustive import best_by_exhaustive_search
+from .utils.instances import st_small_case
+
+SIZING = TxSizing(
+    base_overhead_vbytes=10.0,
+    recipient_output_vbytes=31.0,
+    change_output_vbytes=31.0,
+)
+
+
+@pytest.mark.parametrize("case", load_cases())
+def test_class_dp_matches_milp_on_saved_cases(case: CaseV1) -> None:
+    model = model_from_case(case)
+
+    if case.get("expect") == "infeasible":
+        with pytest.raises(RuntimeError):
+            ClassDPSolver().solve(model)
+        return
+
+    res = ClassDPSolver().solve(model)
+    ref = SimpleMILPSolver(time_limit_seconds=5).solve(model)
+
+    assert res.fee_sats == ref.fee_sats
+    assert res.tx_vbytes == ref.tx_vbytes
+    assert res.total_input_sats == (
+        model.params.target_sats + res.fee_sats + res.change_sats
+    )
+
+
+@settings(max_examples=100, deadline=None)
+@given(st_small_case())
+def test_class_dp_matches_exhaustive_search(case) -> None:  # type: ignore[no-untyped-def]
+    utxos, params = case
+    model = SimpleCoinSelectionModel(utxos=utxos, params=params)
+
+    try:
+        best_obj, _ = best_by_exhaustive_search(params=params, utxos=utxos)
+    except RuntimeError:
+        with pytest.raises(RuntimeError):
+            ClassDPSolver().solve(model)
+        return
+
+    res = ClassDPSolver().solve(model)
+    assert res.fee_sats == best_obj.fee_sats
+    assert res.tx_vbytes == best_obj.tx_vbytes
+    assert res.change_sats >= params.min_change_sats
+
+
+def test_class_dp_rounds_sizes_up_to_whole_weight_units() -> None:
+    utxos = [UTXO("a" * 64, 0, 10_000, 68.1)]  # 272.4 WU, counted as 273
+    params = SelectionParams(
+        target_sats=1_000, fee_rate_sat_per_vb=1.0, min_change_sats=1, sizing=SIZING
+    )
+
+    res = ClassDPSolver().solve(SimpleCoinSelectionModel(utxos, params))
+
+    assert res.tx_vbytes == 141  # ceil((288 + 273) / 4)
+    assert res.fee_sats == 141
+
+
+def test_class_dp_large_uniform_pool() -> None:
+    # Same shape as examples/large_number_of_utxos.py
+    utxos = [
+        UTXO(f"{i:064x}", 0, 10_000 + (i % 3) * 200, 68.0 + (i % 2) * 2.0)
+        for i in range(100_000)
+    ]
+    params = SelectionParams(
+        target_sats=90_000,
+        fee_rate_sat_per_vb=2.5,
+        min_change_sats=546,
+        sizing=SIZING,
+    )
+
+    res = ClassDPSolver().solve(SimpleCoinSelectionModel(utxos, params))
+
+    assert res.fee_sats == 1_710
+    assert res.tx_vbytes == 684
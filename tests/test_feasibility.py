@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import itertools
+from dataclasses import replace
+
+import pytest
+
+from bitcoin_utxo_lp import (
+    BranchAndBoundSolver,
+    ClassDPSolver,
+    HiGHSMILPSolver,
+    InfeasibleSelectionError,
+    SimpleCoinSelectionModel,
+    SimpleMILPSolver,
+    infeasibility_certificate,
+)
+
+from .utils.instances import small_instance
+
+
+def _best_change(model: SimpleCoinSelectionModel) -> int:
+    # Brute force over every non-empty selection, with the reported rounding
+    best: int | None = None
+    for r in range(1, len(model.utxos) + 1):
+        for subset in itertools.combinations(model.utxos, r):
+            fee, _ = model.evaluate_fee_and_vbytes(subset)
+            change = sum(u.value_sats for u in subset) - model.params.target_sats - fee
+            best = change if best is None else max(best, change)
+    assert best is not None
+    return best
+
+
+def test_certificate_bounds_every_selection() -> None:
+    utxos, base = small_instance()
+    total = sum(u.value_sats for u in utxos)
+
+    for target in range(0, total + 20_000, 5_000):
+        for rate in (1.0, 7.5, 40.0):
+            params = replace(base, target_sats=target, fee_rate_sat_per_vb=rate)
+            model = SimpleCoinSelectionModel(utxos, params)
+            cert = infeasibility_certificate(model)
+            best = _best_change(model)
+            if cert is None:
+                continue
+            assert best < params.min_change_sats
+            assert best <= cert.best_change_sats
+            assert cert.shortfall_sats == params.min_change_sats - cert.best_change_sats
+
+
+def test_certificate_catches_the_obvious_cases() -> None:
+    utxos, base = small_instance()
+    total = sum(u.value_sats for u in utxos)
+    model = SimpleCoinSelectionModel(utxos, base)
+
+    assert infeasibility_certificate(model) is None
+    above_total = replace(model, params=replace(base, target_sats=total + 1))
+    assert infeasibility_certificate(above_total) is not None
+    huge_change = replace(model, params=replace(base, min_change_sats=total))
+    assert infeasibility_certificate(huge_change) is not None
+
+
+@pytest.mark.parametrize(
+    "solver",
+    [
+        SimpleMILPSolver(),
+        SimpleMILPSolver(warm_start=False),
+        SimpleMILPSolver(presolve=True),
+        SimpleMILPSolver(fast=True),
+        HiGHSMILPSolver(),
+        ClassDPSolver(),
+        BranchAndBoundSolver(),
+    ],
+)
+def test_solvers_reject_before_building(
+    solver: object, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    utxos, base = small_instance()
+    model = SimpleCoinSelectionModel(utxos, replace(base, target_sats=10**12))
+
+    def no_build(self: SimpleCoinSelectionModel, *args: object) -> None:
+        raise AssertionError("model was built")
+
+    monkeypatch.setattr(SimpleCoinSelectionModel, "build", no_build)
+    monkeypatch.setattr(SimpleCoinSelectionModel, "build_arrays", no_build)
+
+    with pytest.raises(InfeasibleSelectionError) as info:
+        solver.solve(model)  # type: ignore[attr-defined]
+    assert info.value.certificate.shortfall_sats > 10**11
+    assert isinstance(info.value, RuntimeError)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pytest
+
+from bitcoin_utxo_lp import (
+    UTXO,
+    SimpleCoinSelectionModel,
+    SimpleMILPSolver,
+)
+from bitcoin_utxo_lp.heuristics import greedy_indices, largest_first
+from bitcoin_utxo_lp.model import utxo_weights
+
+from .utils.cases import CaseV1, load_cases, model_from_case
+from .utils.instances import params
+
+
+def test_local_improvement_swaps_to_smaller_inputs() -> None:
+    utxos = [
+        UTXO("a" * 64, 0, 60_000, 148.0),  # largest effective value, big input
+        UTXO("b" * 64, 1, 40_000, 58.0),
+        UTXO("c" * 64, 2, 30_000, 58.0),
+    ]
+    model = SimpleCoinSelectionModel(utxos, params(30_000))
+    values, weights = utxo_weights(utxos)
+
+    first = largest_first(model, values, weights)
+    improved = greedy_indices(model, values, weights)
+
+    assert first is not None and first.tolist() == [0]
+    assert improved is not None and improved.tolist() == [1]
+
+
+@pytest.mark.parametrize("case", load_cases())
+def test_fast_mode_is_feasible_and_never_beats_milp(case: CaseV1) -> None:
+    model = model_from_case(case)
+    if case.get("expect") == "infeasible":
+        with pytest.raises(RuntimeError):
+            SimpleMILPSolver(fast=True).solve(model)
+        return
+
+    fast = SimpleMILPSolver(fast=True).solve(model)
+    exact = SimpleMILPSolver(time_limit_seconds=5).solve(model)
+    cold = SimpleMILPSolver(time_limit_seconds=5, warm_start=False).solve(model)
+
+    assert fast.change_sats >= model.params.min_change_sats
+    assert fast.total_input_sats == (
+        model.params.target_sats + fast.fee_sats + fast.change_sats
+    )
+    assert fast.fee_sats >= exact.fee_sats
+    assert exact.fee_sats == cold.fee_sats
+
+
+def test_fast_mode_on_large_uniform_pool() -> None:
+    utxos = [
+        UTXO(f"{i:064x}", 0, 10_000 + (i % 3) * 200, 68.0 + (i % 2) * 2.0)
+        for i in range(100_000)
+    ]
+
+    res = SimpleMILPSolver(fast=True).solve(
+        SimpleCoinSelectionModel(utxos, params(90_000, 2.5))
+    )
+
+    assert res.fee_sats == 1_710
+    assert res.tx_vbytes == 684
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import pytest
+
+from bitcoin_utxo_lp import (
+    UTXO,
+    HiGHSMILPSolver,
+    SelectionParams,
+    SimpleCoinSelectionModel,
+    SimpleMILPSolver,
+    TxSizing,
+)
+
+from .utils.cases import CaseV1, load_cases, model_from_case
+
+
+@pytest.mark.parametrize("case", load_cases())
+def test_highs_matches_cbc_on_saved_cases(case: CaseV1) -> None:
+    model = model_from_case(case)
+
+    if case.get("expect") == "infeasible":
+        with pytest.raises(RuntimeError):
+            HiGHSMILPSolver(time_limit_seconds=5).solve(model)
+        return
+
+    res = HiGHSMILPSolver(time_limit_seconds=5).solve(model)
+    ref = SimpleMILPSolver(time_limit_seconds=5).solve(model)
+
+    assert res.fee_sats == ref.fee_sats
+    assert res.tx_vbytes == ref.tx_vbytes
+    assert res.total_input_sats == (
+        model.params.target_sats + res.fee_sats + res.change_sats
+    )
+
+
+def test_highs_single_utxo_happy_path() -> None:
+    utxo = UTXO(txid="a" * 64, vout=0, value_sats=1000, input_vbytes=68.0)
+    params = SelectionParams(
+        target_sats=300,
+        fee_rate_sat_per_vb=1.0,
+        min_change_sats=1,
+        sizing=TxSizing(
+            base_overhead_vbytes=10.0,
+            recipient_output_vbytes=31.0,
+            change_output_vbytes=31.0,
+        ),
+    )
+
+    res = HiGHSMILPSolver().solve(SimpleCoinSelectionModel([utxo], params))
+
+    assert res.selected == (utxo,)
+    assert res.fee_sats == 140
+    assert res.change_sats == 560
+    assert res.tx_vbytes == 140
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from bitcoin_utxo_lp import (
+    BranchAndBoundSolver,
+    SimpleCoinSelectionModel,
+)
+from bitcoin_utxo_lp.ingest import read_csv, read_jsonl, top_k_candidates
+
+from .utils.instances import params, random_utxos
+
+
+def test_readers_stream_jsonl_and_csv(tmp_path: Path) -> None:
+    utxos = random_utxos(50)
+    jsonl = tmp_path / "utxos.jsonl"
+    jsonl.write_text(
+        "\n".join(
+            json.dumps(
+                {
+                    "txid": u.txid,
+                    "vout": u.vout,
+                    "value_sats": u.value_sats,
+                    "input_vbytes": u.input_vbytes,
+                }
+            )
+            for u in utxos
+        )
+        + "\n\n"
+    )
+    csv_text = "txid,vout,value_sats,input_vbytes\n" + "".join(
+        f"{u.txid},{u.vout},{u.value_sats},{u.input_vbytes}\n" for u in utxos
+    )
+
+    assert list(read_jsonl(jsonl)) == utxos
+    assert list(read_csv(io.StringIO(csv_text))) == utxos
+
+
+def test_readers_report_bad_records() -> None:
+    good = '{"txid": "aa", "vout": 0, "value_sats": 1, "input_vbytes": 68}'
+    with pytest.raises(ValueError, match="line 2"):
+        list(read_jsonl(io.StringIO(good + "\n{oops\n")))
+
+    with pytest.raises(ValueError, match="line 2"):
+        list(read_csv(io.StringIO("txid,vout,value_sats,input_vbytes\naa,0,x,68\n")))
+
+
+def test_top_k_candidates_keep_the_optimum() -> None:
+    utxos = random_utxos(20_000)
+    bound = params(2_000_000, 20.0)
+
+    pool = top_k_candidates(iter(utxos), bound, chunk_size=1_000)
+
+    assert len(pool) < 500
+    # In input order
+    positions = {u: i for i, u in enumerate(utxos)}
+    assert [positions[u] for u in pool] == sorted(positions[u] for u in pool)
+
+    solver = BranchAndBoundSolver(max_iterations=1_000_000)
+    for target in (50_000, 600_000, 2_000_000):
+        for rate in (1.0, 7.5, 20.0):
+            request = params(target, rate)
+            full = solver.solve(SimpleCoinSelectionModel(utxos, request))
+            reduced = solver.solve(SimpleCoinSelectionModel(pool, request))
+            assert reduced.fee_sats == full.fee_sats
+
+
+def test_top_k_candidates_keeps_everything_when_nothing_is_feasible() -> None:
+    utxos = random_utxos(300)
+
+    pool = top_k_candidates(utxos, params(10**12, 1.0), chunk_size=50)
+
+    assert list(pool) == utxos
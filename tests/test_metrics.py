@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import replace
+
+import pytest
+
+from bitcoin_utxo_lp import (
+    BranchAndBoundSolver,
+    ClassDPSolver,
+    HiGHSMILPSolver,
+    LPWindowSolver,
+    MinChangeRoundingError,
+    SimpleCoinSelectionModel,
+    SimpleMILPSolver,
+    SolverTimeoutError,
+)
+from bitcoin_utxo_lp.metrics import REGISTRY, MetricsRegistry
+
+from .utils.instances import hard_model, small_instance
+
+
+@pytest.fixture(autouse=True)
+def _clean_registry() -> Iterator[None]:
+    REGISTRY.reset()
+    yield
+    REGISTRY.reset()
+
+
+def test_registry_histogram_and_prometheus_text() -> None:
+    registry = MetricsRegistry(latency_buckets=(0.01, 0.1), pool_size_buckets=(100,))
+    registry.observe_solve("cbc", 50, 0.005, "ok")
+    registry.observe_solve("cbc", 50, 0.05, "timeout")
+    registry.observe_solve("cbc", 5_000, 3.0, "infeasible")
+
+    snap = registry.snapshot()
+    assert snap["solve_seconds"]["cbc"]["100"] == {
+        "buckets": {"0.01": 1, "0.1": 2, "+Inf": 2},
+        "sum": pytest.approx(0.055),
+        "count": 2,
+    }
+    assert snap["solve_seconds"]["cbc"]["+Inf"]["buckets"]["0.1"] == 0
+    assert snap["solves_total"] == {"cbc": {"infeasible": 1, "ok": 1, "timeout": 1}}
+
+    text = registry.to_prometheus()
+    assert "# TYPE bitcoin_utxo_lp_solve_seconds histogram" in text
+    assert (
+        'bitcoin_utxo_lp_solve_seconds_bucket{backend="cbc",pool_size="100",'
+        'le="0.1"} 2' in text
+    )
+    assert (
+        'bitcoin_utxo_lp_solve_seconds_count{backend="cbc",pool_size="+Inf"} 1' in text
+    )
+    assert 'bitcoin_utxo_lp_solves_total{backend="cbc",outcome="timeout"} 1' in text
+
+    with pytest.raises(ValueError):
+        registry.observe_solve("cbc", 1, 0.1, "slow")
+
+
+def test_solvers_record_outcomes() -> None:
+    utxos, params = small_instance()
+    model = SimpleCoinSelectionModel(utxos, params)
+    infeasible = replace(model, params=replace(params, target_sats=10**12))
+
+    SimpleMILPSolver().solve(model)
+    SimpleMILPSolver(fast=True).solve(model)
+    SimpleMILPSolver(time_limit_seconds=0.3).solve(hard_model())
+    with pytest.raises(RuntimeError):
+        ClassDPSolver().solve(infeasible)
+    with pytest.raises(ValueError):
+        ClassDPSolver().solve(replace(model, params=replace(params, target_sats=-1)))
+
+    snap = REGISTRY.snapshot()
+    assert snap["solves_total"] == {
+        "cbc": {"ok": 1, "timeout": 1},
+        "dp": {"error": 1, "infeasible": 1},
+        "greedy": {"ok": 1},
+    }
+    assert set(snap["solve_seconds"]["cbc"]) == {"10", "10000"}
+
+
+def test_window_solves_are_recorded_once() -> None:
+    model = SimpleCoinSelectionModel(*small_instance())
+
+    LPWindowSolver(window=2).solve(model)
+    LPWindowSolver(window=2, solver=SimpleMILPSolver()).solve(model)
+    ClassDPSolver().solve(model)
+
+    assert REGISTRY.snapshot()["solves_total"] == {
+        "lp_window": {"ok": 2},
+        "dp": {"ok": 1},
+    }
+
+
+@pytest.mark.parametrize(
+    ("solver", "backend"),
+    [
+        (SimpleMILPSolver(warm_start=False, time_limit_seconds=0.01), "cbc"),
+        (BranchAndBoundSolver(max_iterations=3), "bnb"),
+        (HiGHSMILPSolver(time_limit_seconds=0.001), "highs"),
+    ],
+)
+def test_limit_hit_before_any_selection_is_a_timeout(
+    solver: SimpleMILPSolver | BranchAndBoundSolver | HiGHSMILPSolver, backend: str
+) -> None:
+    with pytest.raises(SolverTimeoutError):
+        solver.solve(hard_model())
+
+    assert REGISTRY.snapshot()["solves_total"] == {backend: {"timeout": 1}}
+
+
+def test_rounding_failures_are_counted(monkeypatch: pytest.MonkeyPatch) -> None:
+    utxos, params = small_instance()
+
+    def fail(self: SimpleCoinSelectionModel, selected: object) -> None:
+        raise MinChangeRoundingError("rounded away")
+
+    monkeypatch.setattr(SimpleCoinSelectionModel, "result_for", fail)
+    results = SimpleMILPSolver(warm_start=False).solve_many(utxos, [params])
+
+    assert results == [None]
+    assert REGISTRY.snapshot()["solves_total"] == {"cbc": {"rounding_failure": 1}}
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+from bitcoin_utxo_lp import (
+    UTXO,
+    BranchAndBoundSolver,
+    ClassDPSolver,
+    CoinSelectionSolver,
+    SimpleCoinSelectionModel,
+    SimpleMILPSolver,
+)
+from bitcoin_utxo_lp.parallel import solve_batch
+
+from .utils.cases import load_cases, model_from_case
+
+
+def test_batch_results_match_sequential_solves_in_order() -> None:
+    solvers: list[CoinSelectionSolver] = [
+        SimpleMILPSolver(),
+        BranchAndBoundSolver(),
+        ClassDPSolver(),
+    ]
+    jobs = [
+        (model_from_case(case), solvers[k % len(solvers)])
+        for k, case in enumerate(load_cases())
+    ]
+
+    results = solve_batch(jobs, max_workers=2, max_in_flight=3, time_limit_seconds=5)
+
+    assert len(results) == len(jobs)
+    for (model, solver), job in zip(jobs, results):
+        try:
+            ref = solver.solve(model)
+        except RuntimeError:
+            assert isinstance(job.error, RuntimeError)
+            continue
+        assert job.ok and job.result is not None
+        assert job.result.fee_sats == ref.fee_sats
+        # Selections refer to the caller's UTXO objects
+        assert all(u in model.utxos for u in job.result.selected)
+        assert job.result.selected == ref.selected
+
+
+def test_failing_job_does_not_abort_batch() -> None:
+    model = model_from_case(load_cases()[0])
+    invalid = SimpleCoinSelectionModel(
+        [UTXO("a" * 64, 0, 50_000, 68.0)],
+        replace(model.params, fee_rate_sat_per_vb=0.0),
+    )
+
+    results = solve_batch(
+        [(model, SimpleMILPSolver()), (invalid, ClassDPSolver())],
+        max_workers=2,
+    )
+
+    assert results[0].ok and results[0].result is not None
+    assert not results[1].ok and isinstance(results[1].error, ValueError)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from bitcoin_utxo_lp import (
+    UTXO,
+    BranchAndBoundSolver,
+    ClassDPSolver,
+    CoinSelectionSolver,
+    HiGHSMILPSolver,
+    SimpleCoinSelectionModel,
+    SimpleMILPSolver,
+    UTXOPool,
+    presolve,
+)
+
+from .utils.cases import CaseV1, load_cases, model_from_case
+
+
+def test_pool_round_trips_utxos() -> None:
+    utxos = [
+        UTXO("ab" * 32, 3, 50_000, 68.0),
+        UTXO("00" * 31 + "01", 0, 1, 57.5),
+        UTXO("ff" * 32, 4_294_967_295, 2_100_000_000_000_000, 148.25),
+    ]
+
+    pool = UTXOPool.from_utxos(utxos)
+
+    assert len(pool) == 3
+    assert list(pool) == utxos
+    assert pool[-1] == utxos[-1]
+    assert list(pool[1:]) == utxos[1:]
+    assert pool.nbytes == 3 * 48
+
+
+def test_pool_rejects_non_hex_txids_and_bad_columns() -> None:
+    with pytest.raises(ValueError):
+        UTXOPool.from_utxos([UTXO("not-hex", 0, 1_000, 68.0)])
+
+    with pytest.raises(ValueError):
+        UTXOPool(
+            txid=np.zeros((2, 32), dtype=np.uint8),
+            vout=np.zeros(2, dtype=np.uint32),
+            value_sats=np.zeros(2, dtype=np.int64),
+            input_vbytes=np.zeros(2, dtype=np.float64),  # must be float32
+        )
+
+
+def test_presolve_keeps_pool() -> None:
+    model = model_from_case(load_cases()[0])
+    pooled = SimpleCoinSelectionModel(UTXOPool.from_utxos(model.utxos), model.params)
+
+    reduced = presolve(pooled).model
+
+    assert isinstance(reduced.utxos, UTXOPool)
+    assert list(reduced.utxos) == list(presolve(model).model.utxos)
+
+
+@pytest.mark.parametrize("case", load_cases())
+@pytest.mark.parametrize(
+    "solver",
+    [
+        SimpleMILPSolver(time_limit_seconds=5),
+        SimpleMILPSolver(presolve=True),
+        HiGHSMILPSolver(),
+        ClassDPSolver(),
+        BranchAndBoundSolver(),
+    ],
+)
+def test_solvers_accept_pool(case: CaseV1, solver: CoinSelectionSolver) -> None:
+    model = model_from_case(case)
+    pooled = SimpleCoinSelectionModel(UTXOPool.from_utxos(model.utxos), model.params)
+
+    try:
+        ref = solver.solve(model)
+    except RuntimeError:
+        with pytest.raises(RuntimeError):
+            solver.solve(pooled)
+        return
+
+    res = solver.solve(pooled)
+    assert res.fee_sats == ref.fee_sats
+    assert all(isinstance(u, UTXO) for u in res.selected)
+    assert set(res.selected) <= set(model.utxos)
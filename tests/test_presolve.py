@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import pytest
+
+from bitcoin_utxo_lp import (
+    UTXO,
+    SimpleCoinSelectionModel,
+    SimpleMILPSolver,
+    presolve,
+)
+
+from .utils.cases import CaseV1, load_cases, model_from_case
+from .utils.instances import params
+
+
+def test_presolve_drops_uneconomical_utxos() -> None:
+    utxos = [
+        UTXO("a" * 64, 0, 50_000, 68.0),
+        UTXO("b" * 64, 1, 680, 68.0),  # exactly its own input fee at 10 sat/vB
+        UTXO("c" * 64, 2, 681, 68.0),
+    ]
+    res = presolve(SimpleCoinSelectionModel(utxos, params(10_000, 10.0)))
+
+    assert res.removed_uneconomical == 1
+    assert utxos[1] not in res.model.utxos
+
+
+def test_presolve_keeps_top_k_per_vbyte_class() -> None:
+    # Same shape as examples/large_number_of_utxos.py
+    utxos = [
+        UTXO(f"{i:064x}", 0, 10_000 + (i % 3) * 200, 68.0 + (i % 2) * 2.0)
+        for i in range(20_000)
+    ]
+    model = SimpleCoinSelectionModel(utxos, params(90_000, 2.5))
+
+    res = presolve(model)
+
+    assert len(res.model.utxos) < 50
+    assert res.removed == len(utxos) - len(res.model.utxos)
+    assert res.kept.tolist() == sorted(res.kept.tolist())
+
+    full = SimpleMILPSolver(time_limit_seconds=30, presolve=True).solve(model)
+    assert full.fee_sats == 1_710
+    assert full.tx_vbytes == 684
+
+
+@pytest.mark.parametrize("case", load_cases())
+def test_presolve_preserves_optimum_on_saved_cases(case: CaseV1) -> None:
+    model = model_from_case(case)
+
+    if case.get("expect") == "infeasible":
+        with pytest.raises(RuntimeError):
+            SimpleMILPSolver(time_limit_seconds=5, presolve=True).solve(model)
+        return
+
+    res = SimpleMILPSolver(time_limit_seconds=5, presolve=True).solve(model)
+    ref = SimpleMILPSolver(time_limit_seconds=5).solve(model)
+
+    assert res.fee_sats == ref.fee_sats
+    assert res.tx_vbytes == ref.tx_vbytes
+
+
+def test_presolve_all_uneconomical_is_infeasible() -> None:
+    utxos = [UTXO("a" * 64, 0, 500, 68.0), UTXO("b" * 64, 1, 600, 68.0)]
+    model = SimpleCoinSelectionModel(utxos, params(100, 10.0))
+
+    assert presolve(model).model.utxos == []
+    with pytest.raises(RuntimeError):
+        SimpleMILPSolver(presolve=True).solve(model)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import math
+from fractions import Fraction
 
 from hypothesis import given, settings
 from hypothesis import strategies as st
@@ -12,6 +13,7 @@ from bitcoin_utxo_lp import (
     SimpleMILPSolver,
     TxSizing,
 )
+from bitcoin_utxo_lp.units import fee_for
 
 # Keep sizes modest so MILP remains quick.
 st_input_vbytes = st.sampled_from([58.0, 68.0, 91.0, 148.0])
@@ -75,5 +77,9 @@ def test_property_invariants_or_infeasible(case) -> None:
     assert res.tx_vbytes > 0
     assert res.fee_sats > 0
 
-    # Fee is consistent with tx_vbytes (wallet-style ceil)
-    assert res.fee_sats == math.ceil(params.fee_rate_sat_per_vb * res.tx_vbytes)
+    # Fee is consistent with tx_vbytes (wallet-style ceil), and never below
+    # the requested rate; the rate is exact as printed (1.1 * 100 > 110 in
+    # floats)
+    rate = Fraction(str(params.fee_rate_sat_per_vb))
+    assert res.fee_sats >= math.ceil(rate * res.tx_vbytes)
+    assert res.fee_sats == fee_for(res.tx_vbytes, params.fee_rate_sat_per_kvb)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from bitcoin_utxo_lp import (
+    UTXO,
+    ClassDPSolver,
+    FeeQuoteIndex,
+    SimpleCoinSelectionModel,
+    TxSizing,
+    build_quote_index,
+    infeasibility_certificate,
+)
+
+from .utils.instances import random_utxos
+
+SIZING = TxSizing(
+    base_overhead_vbytes=10.0,
+    recipient_output_vbytes=31.0,
+    change_output_vbytes=31.0,
+)
+
+
+def _optimum(index: FeeQuoteIndex, target: int, rate: float) -> int | None:
+    model = SimpleCoinSelectionModel(index.utxos, index.params(target, rate))
+    try:
+        return ClassDPSolver().solve(model).fee_sats
+    except RuntimeError:
+        return None
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_bounds_bracket_the_optimum(seed: int) -> None:
+    utxos = random_utxos(40, seed, max_value=200_000)
+    index = build_quote_index(utxos, SIZING, min_change_sats=546)
+    total = sum(u.value_sats for u in utxos)
+    rng = random.Random(seed)
+
+    for _ in range(30):
+        target = rng.randint(0, total)
+        rate = rng.choice([1.0, 3.3, 12.0, 55.0, 400.0])
+        quote = index.quote(target, rate)
+        best = _optimum(index, target, rate)
+
+        if best is None:
+            assert quote.feasible is not True
+            assert quote.upper_fee_sats is None
+            continue
+        assert quote.feasible is not False
+        assert quote.lower_fee_sats is not None
+        assert quote.lower_fee_sats <= best
+        if quote.upper_fee_sats is not None:
+            assert best <= quote.upper_fee_sats
+
+
+def test_exact_quote_matches_dp() -> None:
+    utxos = random_utxos(30, 7, max_value=200_000)
+    index = build_quote_index(utxos, SIZING, min_change_sats=546)
+    total = sum(u.value_sats for u in utxos)
+
+    for target in range(0, total + 50_000, total // 12):
+        for rate in (2.0, 25.0):
+            quote = index.quote(target, rate, exact=True)
+            best = _optimum(index, target, rate)
+            if best is None:
+                assert quote.feasible is False
+                assert quote.result is None
+                continue
+            assert quote.feasible is True
+            assert quote.is_exact
+            assert quote.result is not None
+            assert quote.result.fee_sats == best
+            assert quote.result.change_sats >= 546
+
+
+def test_unreachable_target_is_infeasible() -> None:
+    utxos = random_utxos(10, 1, max_value=200_000)
+    index = build_quote_index(utxos, SIZING, min_change_sats=546)
+
+    quote = index.quote(sum(u.value_sats for u in utxos), 1.0)
+
+    assert quote.feasible is False
+    assert quote.lower_fee_sats is None and quote.upper_fee_sats is None
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_certificate_matches_the_full_pass(seed: int) -> None:
+    # At 1 sat/vB the 68-vB UTXOs are worth exactly nothing or one sat
+    utxos = random_utxos(60, seed, max_value=20_000) + [
+        UTXO(txid=f"{i:064x}", vout=0, value_sats=68 + i % 2, input_vbytes=68.0)
+        for i in range(20)
+    ]
+    index = build_quote_index(utxos, SIZING, min_change_sats=546)
+    total = sum(u.value_sats for u in utxos)
+    rng = random.Random(seed)
+
+    for _ in range(40):
+        target = rng.randint(total // 2, total)
+        rate = rng.choice([0.9, 1.0, 1.001, 4.2, 60.0])
+        model = SimpleCoinSelectionModel(utxos, index.params(target, rate))
+        expected = infeasibility_certificate(model)
+        assert index.infeasibility_certificate(target, rate) == expected
+        if expected is not None:
+            assert index.quote(target, rate).feasible is False
+
+
+def test_build_rejects_non_positive_sizes() -> None:
+    utxos = [UTXO(txid="00" * 32, vout=0, value_sats=1_000, input_vbytes=0.0)]
+    with pytest.raises(ValueError, match="input_vbytes"):
+        build_quote_index(utxos, SIZING, min_change_sats=546)
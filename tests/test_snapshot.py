@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from bitcoin_utxo_lp import (
+    SimpleCoinSelectionModel,
+    SimpleMILPSolver,
+    UTXOPool,
+    presolve,
+)
+from bitcoin_utxo_lp.snapshot import convert_fixture, read_snapshot, write_snapshot
+
+from .utils.cases import load_cases, model_from_case
+from .utils.instances import random_utxos
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "cases_v1.json"
+
+
+def test_snapshot_round_trip_is_sorted_and_memory_mapped(tmp_path: Path) -> None:
+    utxos = random_utxos(1_000)
+    path = tmp_path / "wallet.utxos"
+
+    assert write_snapshot(path, utxos) == len(utxos)
+    pool = read_snapshot(path)
+
+    assert isinstance(pool.value_sats, np.memmap)
+    assert path.stat().st_size == 64 + 48 * len(utxos)
+    assert sorted(pool, key=lambda u: (u.txid, u.vout)) == sorted(
+        utxos, key=lambda u: (u.txid, u.vout)
+    )
+    keys = [(u.input_vbytes, -u.value_sats) for u in pool]
+    assert keys == sorted(keys)
+
+
+def test_empty_snapshot(tmp_path: Path) -> None:
+    path = tmp_path / "empty.utxos"
+    write_snapshot(path, [])
+
+    assert len(read_snapshot(path)) == 0
+
+
+def test_read_snapshot_rejects_other_files(tmp_path: Path) -> None:
+    path = tmp_path / "wallet.utxos"
+    write_snapshot(path, random_utxos(10))
+    data = path.read_bytes()
+
+    (tmp_path / "bad_magic").write_bytes(b"X" + data[1:])
+    (tmp_path / "truncated").write_bytes(data[:-1])
+    (tmp_path / "short").write_bytes(data[:10])
+
+    for name in ("bad_magic", "truncated", "short"):
+        with pytest.raises(ValueError):
+            read_snapshot(tmp_path / name)
+
+
+def test_presolve_on_snapshot_matches_unsorted_pool(tmp_path: Path) -> None:
+    model = model_from_case(load_cases()[0])
+    utxos = random_utxos(5_000)
+    path = tmp_path / "wallet.utxos"
+    write_snapshot(path, utxos)
+
+    sorted_kept = presolve(SimpleCoinSelectionModel(read_snapshot(path), model.params))
+    kept = presolve(SimpleCoinSelectionModel(UTXOPool.from_utxos(utxos), model.params))
+
+    assert set(sorted_kept.model.utxos) == set(kept.model.utxos)
+
+
+def test_converted_fixture_solves_like_json(tmp_path: Path) -> None:
+    paths = convert_fixture(FIXTURE, tmp_path)
+    cases = load_cases()
+    assert len(paths) == len(cases)
+    raw = json.loads(FIXTURE.read_text(encoding="utf-8"))["cases"]
+    for path, case_json in zip(paths, raw):
+        header = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+        assert header == {k: v for k, v in case_json.items() if k != "utxos"}
+
+    solver = SimpleMILPSolver(time_limit_seconds=5)
+    for path, case in zip(paths, cases):
+        model = model_from_case(case)
+        from_snapshot = SimpleCoinSelectionModel(read_snapshot(path), model.params)
+        try:
+            ref = solver.solve(model)
+        except RuntimeError:
+            with pytest.raises(RuntimeError):
+                solver.solve(from_snapshot)
+            continue
+        assert solver.solve(from_snapshot).fee_sats == ref.fee_sats
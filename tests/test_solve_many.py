@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import random
+from dataclasses import replace
+from typing import Any
+
+import pytest
+
+from bitcoin_utxo_lp import (
+    UTXO,
+    SelectionParams,
+    SimpleCoinSelectionModel,
+    SimpleMILPSolver,
+    UTXOPool,
+)
+
+from .utils.instances import small_instance
+
+
+def _params_list(base: SelectionParams) -> list[SelectionParams]:
+    return [
+        replace(base, target_sats=target, fee_rate_sat_per_vb=rate)
+        for target in (20_000, 45_000, 90_000, 10_000_000)  # the last is infeasible
+        for rate in (1.0, 4.0, 12.0)
+    ]
+
+
+@pytest.mark.parametrize(
+    "solver",
+    [
+        SimpleMILPSolver(),
+        SimpleMILPSolver(warm_start=False),
+        SimpleMILPSolver(presolve=True),
+        SimpleMILPSolver(fast=True),
+    ],
+)
+def test_solve_many_matches_independent_solves(solver: SimpleMILPSolver) -> None:
+    utxos, base = small_instance()
+    params_list = _params_list(base)
+
+    results = solver.solve_many(utxos, params_list)
+
+    assert len(results) == len(params_list)
+    for params, res in zip(params_list, results):
+        try:
+            ref = solver.solve(SimpleCoinSelectionModel(utxos, params))
+        except RuntimeError:
+            assert res is None
+            continue
+        assert res is not None
+        assert res.fee_sats == ref.fee_sats
+        assert res.total_input_sats == (
+            params.target_sats + res.fee_sats + res.change_sats
+        )
+
+
+@pytest.mark.parametrize("presolve", [False, True])
+def test_min_tx_vbytes_from_a_lower_rate_keeps_the_optimum(presolve: bool) -> None:
+    utxos, low = small_instance()
+    high = replace(low, fee_rate_sat_per_vb=low.fee_rate_sat_per_vb * 8)
+    solver = SimpleMILPSolver(presolve=presolve)
+
+    bound = solver.solve(SimpleCoinSelectionModel(utxos, low)).tx_vbytes
+    ref = solver.solve(SimpleCoinSelectionModel(utxos, high))
+    cut = solver.solve(SimpleCoinSelectionModel(utxos, high), min_tx_vbytes=bound)
+    (many,) = solver.solve_many(utxos, [high], min_tx_vbytes=bound)
+
+    assert bound <= ref.tx_vbytes
+    assert many is not None
+    for res in (cut, many):
+        assert (res.fee_sats, res.tx_vbytes) == (ref.fee_sats, ref.tx_vbytes)
+        assert res.is_optimal
+
+
+def test_solve_many_rejects_invalid_params() -> None:
+    utxos, base = small_instance()
+
+    with pytest.raises(ValueError):
+        SimpleMILPSolver().solve_many(utxos, [base, replace(base, target_sats=-1)])
+
+
+@pytest.mark.parametrize("presolve", [False, True])
+def test_solve_many_builds_utxos_only_for_selections(
+    monkeypatch: pytest.MonkeyPatch, presolve: bool
+) -> None:
+    # A few large UTXOs among many small ones: quick for CBC
+    rng = random.Random(7)
+    pool = UTXOPool.from_utxos(
+        UTXO(
+            f"{i:064x}",
+            0,
+            200_000 + 1_000 * i if i < 20 else rng.randint(1_000, 5_000),
+            rng.choice([57.5, 68.0]),
+        )
+        for i in range(400)
+    )
+    _utxos, base = small_instance()
+    params_list = [
+        replace(base, target_sats=t, fee_rate_sat_per_vb=r)
+        for t, r in ((300_000, 2.0), (310_000, 2.0), (600_000, 5.0))
+    ]
+
+    built = 0
+    getitem = UTXOPool.__getitem__
+
+    def counting_getitem(self: UTXOPool, index: Any) -> Any:
+        nonlocal built
+        built += isinstance(index, int)
+        return getitem(self, index)
+
+    monkeypatch.setattr(UTXOPool, "__getitem__", counting_getitem)
+    results = SimpleMILPSolver(presolve=presolve).solve_many(pool, params_list)
+
+    assert all(res is not None for res in results)
+    # Only the greedy starts and the selections, not the whole pool
+    assert built < 100
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import pytest
+
+from bitcoin_utxo_lp import (
+    HiGHSMILPSolver,
+    SimpleCoinSelectionModel,
+    SimpleMILPSolver,
+)
+
+from .utils.instances import hard_model, small_instance
+
+
+def _model() -> SimpleCoinSelectionModel:
+    utxos, params = small_instance()
+    return SimpleCoinSelectionModel(utxos, params)
+
+
+def test_stats_are_off_by_default() -> None:
+    model = _model()
+
+    plain = SimpleMILPSolver().solve(model)
+    with_stats = SimpleMILPSolver(collect_stats=True).solve(model)
+
+    assert plain.stats is None
+    assert with_stats.stats is not None
+    # stats do not take part in equality
+    assert with_stats == plain
+
+
+def test_cbc_stats_cover_every_phase() -> None:
+    model = _model()
+
+    res = SimpleMILPSolver(presolve=True, collect_stats=True).solve(model)
+
+    stats = res.stats
+    assert stats is not None
+    assert list(stats.phase_seconds) == [
+        "validate",
+        "presolve",
+        "greedy",
+        "build",
+        "write",
+        "cbc",
+        "read",
+        "extract",
+    ]
+    assert all(t >= 0.0 for t in stats.phase_seconds.values())
+    assert stats.total_seconds == pytest.approx(sum(stats.phase_seconds.values()))
+    assert stats.n_variables >= 1 and stats.n_constraints == 4
+    assert stats.status == "Optimal Solution Found"
+    assert stats.nodes is not None
+    assert stats.gap == 0.0
+
+
+def test_cbc_stats_on_time_limit() -> None:
+    res = SimpleMILPSolver(time_limit_seconds=0.5, collect_stats=True).solve(
+        hard_model()
+    )
+
+    stats = res.stats
+    assert stats is not None and not res.is_optimal
+    assert stats.n_variables == len(hard_model().utxos) + 3
+    assert stats.status == "Solution Found"
+    assert stats.best_bound is not None and stats.objective is not None
+    assert stats.best_bound <= stats.objective
+    assert stats.gap is not None and 0.0 < stats.gap < 1.0
+
+
+def test_fast_and_highs_stats() -> None:
+    model = _model()
+
+    fast = SimpleMILPSolver(fast=True, collect_stats=True).solve(model).stats
+    assert fast is not None
+    assert list(fast.phase_seconds) == ["validate", "greedy"]
+    assert fast.n_variables == 0
+
+    highs = HiGHSMILPSolver(collect_stats=True).solve(model).stats
+    assert highs is not None
+    assert list(highs.phase_seconds) == ["build", "highs", "extract"]
+    assert highs.n_variables == len(model.utxos) + 3
+    assert highs.gap == 0.0
+
+
+def test_solve_many_stats() -> None:
+    utxos, params = small_instance()
+
+    results = SimpleMILPSolver(collect_stats=True).solve_many(utxos, [params] * 2)
+
+    for res in results:
+        assert res is not None and res.stats is not None
+        assert "cbc" in res.stats.phase_seconds
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import random
+from dataclasses import replace
+
+import pytest
+
+from bitcoin_utxo_lp import (
+    ClassDPSolver,
+    CoinSelectionSolver,
+    SelectionParams,
+    SelectionResult,
+    SimpleCoinSelectionModel,
+    SimpleMILPSolver,
+    TxSizing,
+    sweep_fee_rates,
+)
+
+from .utils.instances import random_utxos
+
+SIZING = TxSizing(
+    base_overhead_vbytes=10.5,
+    recipient_output_vbytes=31.0,
+    change_output_vbytes=31.0,
+)
+
+
+def _model(seed: int) -> SimpleCoinSelectionModel:
+    utxos = random_utxos(30, seed, min_value=1_000, max_value=200_000)
+    rng = random.Random(seed)
+    params = SelectionParams(
+        target_sats=rng.randint(500_000, 2_500_000),
+        fee_rate_sat_per_vb=1.0,
+        min_change_sats=546,
+        sizing=SIZING,
+    )
+    return SimpleCoinSelectionModel(utxos, params)
+
+
+@pytest.mark.parametrize("solver", [ClassDPSolver(), SimpleMILPSolver()])
+@pytest.mark.parametrize("seed", [4, 5])
+def test_sweep_matches_independent_solves(
+    solver: CoinSelectionSolver, seed: int
+) -> None:
+    model = _model(seed)
+    sweep = sweep_fee_rates(model, 150.0, solver)
+
+    assert len(sweep.pieces) > 1
+    for a, b in zip(sweep.pieces, sweep.pieces[1:]):
+        assert b.min_sat_per_kvb == a.max_sat_per_kvb + 1
+        assert b.tx_vbytes >= a.tx_vbytes
+
+    for rate in (1.0, 2.5, 7.0, 33.3, 64.0, 99.9, 150.0):
+        at_rate = replace(model, params=replace(model.params, fee_rate_sat_per_vb=rate))
+        got = sweep.result_at(rate)
+        try:
+            ref = ClassDPSolver().solve(at_rate)
+        except RuntimeError:
+            assert got is None
+            assert sweep.infeasible_from_sat_per_kvb is not None
+            assert sweep.infeasible_from_sat_per_kvb <= rate * 1000
+            continue
+        assert got is not None
+        assert (got.fee_sats, got.tx_vbytes) == (ref.fee_sats, ref.tx_vbytes)
+
+
+def test_sweep_bounds_only_by_optimal_pieces(monkeypatch: pytest.MonkeyPatch) -> None:
+    bounds: list[int] = []
+    solve = SimpleMILPSolver.solve
+
+    def every_other_optimal(
+        self: SimpleMILPSolver,
+        model: SimpleCoinSelectionModel,
+        on_incumbent: object = None,
+        *,
+        min_tx_vbytes: int = 0,
+    ) -> SelectionResult:
+        bounds.append(min_tx_vbytes)
+        result = solve(self, model, min_tx_vbytes=min_tx_vbytes)
+        return replace(result, is_optimal=len(bounds) % 2 == 1)
+
+    monkeypatch.setattr(SimpleMILPSolver, "solve", every_other_optimal)
+    pieces = sweep_fee_rates(_model(4), 150.0).pieces
+
+    assert len(pieces) > 2
+    assert bounds[0] == 0
+    assert bounds[1 : len(pieces)] == [
+        a.tx_vbytes if a.is_optimal else 0 for a in pieces[:-1]
+    ]
+    assert 0 in bounds[1:]
+
+
+def test_sweep_ends_where_requests_become_infeasible() -> None:
+    model = _model(2)
+    sweep = sweep_fee_rates(model, 500.0, ClassDPSolver())
+
+    end = sweep.infeasible_from_sat_per_kvb
+    assert end is not None
+    assert sweep.pieces[-1].max_sat_per_kvb == end - 1
+    assert sweep.breakpoints[-1] == end
+    assert sweep.result_at(end / 1000) is None
+    assert sweep.result_at(0.5) is None  # below the swept range
+
+
+def test_sweep_rejects_empty_range() -> None:
+    model = _model(0)
+    model = replace(model, params=replace(model.params, fee_rate_sat_per_vb=5.0))
+    with pytest.raises(ValueError):
+        sweep_fee_rates(model, 4.0)
@@ -82,3 +82,47 @@ def test_infeasible_due_to_min_change_raises() -> None:
 
     with pytest.raises(RuntimeError):
         SimpleMILPSolver().solve(SimpleCoinSelectionModel([utxo], params))
+
+
+def test_build_arrays_matches_pulp_model() -> None:
+    utxos = [
+        UTXO(txid="a" * 64, vout=0, value_sats=1000, input_vbytes=68.0),
+        UTXO(txid="b" * 64, vout=1, value_sats=2500, input_vbytes=91.0),
+    ]
+    params = SelectionParams(
+        target_sats=300,
+        fee_rate_sat_per_vb=2.0,
+        min_change_sats=1,
+        sizing=_default_sizing(),
+    )
+    model = SimpleCoinSelectionModel(utxos, params)
+
+    arrays = model.build_arrays()
+
+    # Columns: x_0, x_1, change_sats, tx_vbytes, fee_sats
+    assert arrays.n_choice == 2
+    assert arrays.constraint_matrix.shape == (3, 5)
+    assert arrays.constraint_matrix.toarray().tolist() == [
+        [1000.0, 2500.0, -1.0, 0.0, -1.0],  # balance
+        [-272.0, -364.0, 0.0, 4.0, 0.0],  # weight (WU)
+        [0.0, 0.0, 0.0, -2000.0, 1000.0],  # fee rate (sat/kvB)
+    ]
+    assert arrays.constraint_lb.tolist() == [300.0, 4 * 72.0, 0.0]
+    assert arrays.constraint_ub[0] == 300.0
+    assert arrays.objective.tolist() == [0.0, 0.0, 0.0, 2.0, 0.0]
+    assert arrays.objective_offset == 0.0
+    assert arrays.lower_bounds.tolist() == [0.0, 0.0, 1.0, 0.0, 0.0]
+    assert arrays.upper_bounds[:2].tolist() == [1.0, 1.0]
+
+
+def test_build_arrays_validates_params() -> None:
+    params = SelectionParams(
+        target_sats=-1,
+        fee_rate_sat_per_vb=1.0,
+        min_change_sats=1,
+        sizing=_default_sizing(),
+    )
+    utxo = UTXO(txid="a" * 64, vout=0, value_sats=1000, input_vbytes=68.0)
+
+    with pytest.raises(ValueError):
+        SimpleCoinSelectionModel([utxo], params).build_arrays()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import random
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from bitcoin_utxo_lp import (
+    UTXO,
+    ClassDPSolver,
+    HiGHSMILPSolver,
+    SelectionParams,
+    SimpleCoinSelectionModel,
+    SimpleMILPSolver,
+    TxSizing,
+)
+from bitcoin_utxo_lp.units import (
+    fee_for,
+    to_sat_per_kvb,
+    to_weight,
+    to_weights,
+    vbytes_for,
+)
+
+SIZING = TxSizing(
+    base_overhead_vbytes=10.5,
+    recipient_output_vbytes=31.0,
+    change_output_vbytes=31.0,
+)
+
+
+def test_sizes_and_rates_are_whole_units() -> None:
+    assert to_weight(57.5) == 230
+    assert to_weight(68.1) == 273  # rounded up to a whole weight unit
+    assert to_weights(np.array([57.5, 68.0], dtype=np.float32)).tolist() == [230, 272]
+    assert to_sat_per_kvb(2.7) == 2700
+    assert to_sat_per_kvb(Fraction(7, 3)) == 2334  # rounded up
+    assert vbytes_for(289) == 73
+
+
+def test_fee_is_exact_where_floats_round_up() -> None:
+    # 1.1 * 100 == 110.00000000000001 in floats
+    assert fee_for(100, to_sat_per_kvb(1.1)) == 110
+    assert fee_for(np.array([100, 101]), 1100).tolist() == [110, 112]
+
+
+def test_fee_never_falls_below_the_requested_rate() -> None:
+    assert to_sat_per_kvb(1.0004) == 1001
+    assert fee_for(140, to_sat_per_kvb(1.0004)) == 141
+    assert fee_for(140, to_sat_per_kvb(7.0005)) == 981
+    assert to_sat_per_kvb(3) == 3000
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_milp_optimises_the_reported_fee(seed: int) -> None:
+    # Fractional fee rates: the MILP must reach the exact optimum, cold and
+    # warm, with no rounding failures
+    rng = random.Random(seed)
+    utxos = [
+        UTXO(f"{i:064x}", 0, rng.randint(1_000, 400_000), rng.choice([57.5, 68.0]))
+        for i in range(25)
+    ]
+    params = SelectionParams(
+        target_sats=rng.randint(50_000, 1_000_000),
+        fee_rate_sat_per_vb=rng.choice([1.1, 2.7, 13.37]),
+        min_change_sats=546,
+        sizing=SIZING,
+    )
+    model = SimpleCoinSelectionModel(utxos, params)
+
+    best = ClassDPSolver().solve(model)
+    for solver in (
+        SimpleMILPSolver(time_limit_seconds=30),
+        SimpleMILPSolver(time_limit_seconds=30, warm_start=False),
+        HiGHSMILPSolver(time_limit_seconds=30),
+    ):
+        res = solver.solve(model)
+        assert res.is_optimal
+        assert (res.fee_sats, res.tx_vbytes) == (best.fee_sats, best.tx_vbytes)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from bitcoin_utxo_lp import (
+    UTXO,
+    AggregatedCoinSelectionModel,
+    ClassDPSolver,
+    SelectionParams,
+    SimpleCoinSelectionModel,
+    SimpleMILPSolver,
+    TxSizing,
+    WalletPool,
+    pool_digest,
+)
+
+from .utils.instances import random_utxos
+
+SIZING = TxSizing(
+    base_overhead_vbytes=10.5,
+    recipient_output_vbytes=31.0,
+    change_output_vbytes=31.0,
+)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_model_after_deltas_has_the_full_pool_optimum(seed: int) -> None:
+    rng = random.Random(seed)
+    utxos = random_utxos(2_000, seed, min_value=100, max_value=2_000_000)
+    wallet = WalletPool(utxos)
+
+    for _block in range(5):
+        spent = rng.sample(utxos, 20)
+        added = random_utxos(
+            20, rng.getrandbits(32), min_value=100, max_value=2_000_000
+        )
+        wallet.apply([(u.txid, u.vout) for u in spent], added)
+        utxos = [u for u in utxos if u not in spent] + added
+
+        params = SelectionParams(
+            target_sats=rng.randint(100_000, 20_000_000),
+            fee_rate_sat_per_vb=rng.choice([1.0, 7.3, 55.0]),
+            min_change_sats=546,
+            sizing=SIZING,
+        )
+        model = wallet.model(params)
+        best = ClassDPSolver().solve(SimpleCoinSelectionModel(utxos, params))
+
+        assert len(model.utxos) < len(utxos)
+        assert ClassDPSolver().solve(model).fee_sats == best.fee_sats
+        assert wallet.digest() == pool_digest(utxos)
+        assert len(wallet) == len(utxos)
+
+
+def test_model_is_memoised_until_the_next_delta() -> None:
+    wallet = WalletPool(random_utxos(300, 7, min_value=100, max_value=2_000_000))
+    params = SelectionParams(
+        target_sats=1_000_000,
+        fee_rate_sat_per_vb=5.0,
+        min_change_sats=546,
+        sizing=SIZING,
+    )
+
+    model = wallet.model(params)
+    assert wallet.model(params) is model
+    aggregated = wallet.model(params, AggregatedCoinSelectionModel)
+    assert isinstance(aggregated, AggregatedCoinSelectionModel)
+    assert SimpleMILPSolver().solve(aggregated).fee_sats == (
+        ClassDPSolver().solve(model).fee_sats
+    )
+
+    wallet.add(random_utxos(1, 8)[0])
+    assert wallet.model(params) is not model
+
+
+def test_deltas_are_checked() -> None:
+    u = UTXO("a" * 64, 0, 50_000, 68.0)
+    wallet = WalletPool([u])
+
+    with pytest.raises(ValueError):
+        wallet.add(u)
+    with pytest.raises(KeyError):
+        wallet.spend("b" * 64, 0)
+    assert wallet.spend(u.txid, u.vout) == u
+    assert (u.txid, u.vout) not in wallet
+    assert wallet.digest() == pool_digest([])
+
+    with pytest.raises(ValueError):
+        WalletPool([u, u])
+
+
+def test_uneconomical_wallet_reports_infeasible() -> None:
+    wallet = WalletPool([UTXO(f"{i:064x}", 0, 100, 68.0) for i in range(50)])
+    params = SelectionParams(
+        target_sats=1_000,
+        fee_rate_sat_per_vb=10.0,
+        min_change_sats=0,
+        sizing=SIZING,
+    )
+
+    with pytest.raises(RuntimeError):
+        ClassDPSolver().solve(wallet.model(params))
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from bitcoin_utxo_lp import (
+    UTXO,
+    AggregatedCoinSelectionModel,
+    ClassDPSolver,
+    HiGHSMILPSolver,
+    InfeasibleSelectionError,
+    LPWindowSolver,
+    SelectionParams,
+    SimpleCoinSelectionModel,
+    TxSizing,
+)
+
+from .utils.cases import load_cases, model_from_case
+from .utils.instances import random_utxos
+
+SIZING = TxSizing(
+    base_overhead_vbytes=10.5,
+    recipient_output_vbytes=31.0,
+    change_output_vbytes=31.0,
+)
+
+
+def _random_model(seed: int, n: int) -> SimpleCoinSelectionModel:
+    utxos = random_utxos(n, seed, min_value=100, max_value=3_000_000)
+    rng = random.Random(seed)
+    params = SelectionParams(
+        target_sats=rng.randint(1_000, n * 300_000),
+        fee_rate_sat_per_vb=rng.choice([1.0, 3.3, 25.0, 150.0]),
+        min_change_sats=rng.choice([0, 546]),
+        sizing=SIZING,
+    )
+    return SimpleCoinSelectionModel(utxos, params)
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_matches_full_milp(seed: int) -> None:
+    model = _random_model(seed, n=150)
+
+    try:
+        ref = HiGHSMILPSolver().solve(model)
+    except RuntimeError:
+        with pytest.raises(RuntimeError):
+            LPWindowSolver(window=8).solve(model)
+        return
+
+    # A small first window forces the proof to fail and the window to widen
+    res = LPWindowSolver(window=8).solve(model)
+    assert res.is_optimal
+    assert (res.fee_sats, res.tx_vbytes) == (ref.fee_sats, ref.tx_vbytes)
+    assert res.change_sats >= model.params.min_change_sats
+
+
+def test_deterministic_cases_match_dp() -> None:
+    for case in load_cases():
+        model = model_from_case(case)
+        try:
+            ref = ClassDPSolver().solve(model)
+        except RuntimeError:
+            with pytest.raises(RuntimeError):
+                LPWindowSolver().solve(model)
+            continue
+        res = LPWindowSolver().solve(model)
+        assert res.fee_sats == ref.fee_sats
+        # Selections are in pool order, like the other solvers'
+        order = [model.utxos.index(u) for u in res.selected]
+        assert order == sorted(order)
+
+
+def test_any_exact_solver_solves_the_windows() -> None:
+    model = _random_model(3, n=200)
+    aggregated = AggregatedCoinSelectionModel(model.utxos, model.params)
+
+    ref = LPWindowSolver().solve(model)
+    assert LPWindowSolver().solve(aggregated) == ref
+    res = LPWindowSolver(window=16, solver=HiGHSMILPSolver()).solve(model)
+    assert (res.fee_sats, res.tx_vbytes) == (ref.fee_sats, ref.tx_vbytes)
+    with pytest.raises(ValueError):
+        LPWindowSolver(window=0).solve(model)
+
+
+def test_infeasible_pool_has_certificate() -> None:
+    model = SimpleCoinSelectionModel(
+        [UTXO("a" * 64, 0, 10_000, 68.0)],
+        SelectionParams(
+            target_sats=50_000,
+            fee_rate_sat_per_vb=1.0,
+            min_change_sats=0,
+            sizing=SIZING,
+        ),
+    )
+    with pytest.raises(InfeasibleSelectionError):
+        LPWindowSolver().solve(model)
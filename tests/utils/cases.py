@@ -0,0 +1,71 @@
+"""Saved regression cases (fixtures/cases_v1.json) and their models."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TypedDict, cast
+
+import pytest
+
+from bitcoin_utxo_lp import UTXO, SelectionParams, SimpleCoinSelectionModel, TxSizing
+
+FIXTURE_PATH = Path(__file__).resolve().parent.parent / "fixtures" / "cases_v1.json"
+
+
+class CaseUTXO(TypedDict):
+    value_sats: int
+    input_vbytes: float
+
+
+class CaseV1(TypedDict):
+    base_overhead_vbytes: float
+    recipient_output_vbytes: float
+    change_output_vbytes: float
+    target_sats: int
+    fee_rate_sat_per_vb: float
+    min_change_sats: int
+    utxos: list[CaseUTXO]
+
+
+class CasesPayloadV1(TypedDict):
+    version: int
+    cases: list[CaseV1]
+
+
+def load_cases() -> list[CaseV1]:
+    if not FIXTURE_PATH.exists():
+        pytest.skip(
+            f"Missing fixture {FIXTURE_PATH}. Generate it with: "
+            "poetry run python tests/utils/gen_cases.py"
+        )
+    payload = cast(CasesPayloadV1, json.loads(FIXTURE_PATH.read_text(encoding="utf-8")))
+    assert payload["version"] == 1
+    return payload["cases"]
+
+
+def model_from_case(case: CaseV1) -> SimpleCoinSelectionModel:
+    sizing = TxSizing(
+        base_overhead_vbytes=float(case["base_overhead_vbytes"]),
+        recipient_output_vbytes=float(case["recipient_output_vbytes"]),
+        change_output_vbytes=float(case["change_output_vbytes"]),
+    )
+
+    params = SelectionParams(
+        target_sats=int(case["target_sats"]),
+        fee_rate_sat_per_vb=float(case["fee_rate_sat_per_vb"]),
+        min_change_sats=int(case["min_change_sats"]),
+        sizing=sizing,
+    )
+
+    utxos = [
+        UTXO(
+            txid=f"{i:064x}",
+            vout=i,
+            value_sats=int(u["value_sats"]),
+            input_vbytes=float(u["input_vbytes"]),
+        )
+        for i, u in enumerate(case["utxos"])
+    ]
+
+    return SimpleCoinSelectionModel(utxos=utxos, params=params)
@@ -0,0 +1,82 @@
+"""Reference optimum by enumerating every subset of a small pool."""
+
+from __future__ import annotations
+
+import itertools
+import math
+from dataclasses import dataclass
+from fractions import Fraction
+
+from bitcoin_utxo_lp import UTXO, SelectionParams
+
+
+@dataclass(frozen=True, slots=True)
+class Objective:
+    fee_sats: int
+    tx_vbytes: int
+
+
+def evaluate_objective(
+    *,
+    params: SelectionParams,
+    utxos: list[UTXO],
+    selected_mask: list[bool],
+) -> Objective | None:
+    selected = [u for u, take in zip(utxos, selected_mask) if take]
+    if not selected:
+        return None
+
+    # Simple model ALWAYS includes change output.
+    fixed_vb = (
+        params.sizing.base_overhead_vbytes
+        + params.sizing.recipient_output_vbytes
+        + params.sizing.change_output_vbytes
+    )
+    # Sizes in weight units and the fee rate in whole sat/kvB, as wallets do
+    weight = round(4 * (fixed_vb + sum(u.input_vbytes for u in selected)))
+    tx_vbytes = -(-weight // 4)
+    rate_sat_per_kvb = math.ceil(Fraction(str(params.fee_rate_sat_per_vb)) * 1000)
+    fee_sats = -(-rate_sat_per_kvb * tx_vbytes // 1000)
+
+    total_in = sum(u.value_sats for u in selected)
+    change = total_in - params.target_sats - fee_sats
+
+    if change < params.min_change_sats:
+        return None
+    if total_in != params.target_sats + fee_sats + change:
+        return None
+
+    return Objective(fee_sats=fee_sats, tx_vbytes=tx_vbytes)
+
+
+def best_by_exhaustive_search(
+    *,
+    params: SelectionParams,
+    utxos: list[UTXO],
+) -> tuple[Objective, list[UTXO]]:
+    best_obj: Objective | None = None
+    best_sel: list[UTXO] | None = None
+
+    for bits in itertools.product([False, True], repeat=len(utxos)):
+        obj = evaluate_objective(params=params, utxos=utxos, selected_mask=list(bits))
+        if obj is None:
+            continue
+        selected = [u for u, take in zip(utxos, bits) if take]
+
+        if best_obj is None:
+            best_obj, best_sel = obj, selected
+            continue
+
+        # Primary objective: minimise fee
+        if obj.fee_sats < best_obj.fee_sats:
+            best_obj, best_sel = obj, selected
+            continue
+
+        # Tie-breaker:
+        # fewer vbytes (equivalently fewer inputs) is a reasonable stable tie-break
+        if obj.fee_sats == best_obj.fee_sats and obj.tx_vbytes < best_obj.tx_vbytes:
+            best_obj, best_sel = obj, selected
+
+    if best_obj is None or best_sel is None:
+        raise RuntimeError("No feasible subset found for exhaustive check")
+    return best_obj, best_sel
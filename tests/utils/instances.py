@@ -0,0 +1,100 @@
+"""Shared test instances: a hand-picked pool, a hard one, and random ones."""
+
+from __future__ import annotations
+
+import random
+
+from hypothesis import strategies as st
+
+from bitcoin_utxo_lp import UTXO, SelectionParams, SimpleCoinSelectionModel, TxSizing
+
+_SIZING = TxSizing(
+    base_overhead_vbytes=10.0,
+    recipient_output_vbytes=31.0,
+    change_output_vbytes=31.0,
+)
+
+
+def params(target_sats: int, fee_rate: float = 1.0) -> SelectionParams:
+    return SelectionParams(
+        target_sats=target_sats,
+        fee_rate_sat_per_vb=fee_rate,
+        min_change_sats=546,
+        sizing=_SIZING,
+    )
+
+
+def random_utxos(
+    n: int, seed: int = 0, *, min_value: int = 500, max_value: int = 300_000
+) -> list[UTXO]:
+    # Random txids, values in [min_value, max_value] and common input sizes
+    rng = random.Random(seed)
+    return [
+        UTXO(
+            txid=rng.randbytes(32).hex(),
+            vout=rng.randrange(1_000),
+            value_sats=rng.randint(min_value, max_value),
+            input_vbytes=rng.choice([57.5, 68.0, 91.0, 148.0]),
+        )
+        for _ in range(n)
+    ]
+
+
+def small_instance() -> tuple[list[UTXO], SelectionParams]:
+    utxos = [
+        UTXO("a" * 64, 0, 40_000, 68.0),
+        UTXO("b" * 64, 1, 30_000, 68.0),
+        UTXO("c" * 64, 2, 25_000, 58.0),
+        UTXO("d" * 64, 3, 12_000, 91.0),
+        UTXO("e" * 64, 4, 60_000, 68.0),
+        UTXO("f" * 64, 5, 15_000, 148.0),
+        UTXO("0" * 64, 6, 18_000, 68.0),
+        UTXO("1" * 64, 7, 22_000, 58.0),
+        UTXO("2" * 64, 8, 9_000, 91.0),
+        UTXO("3" * 64, 9, 50_000, 68.0),
+    ]
+
+    return utxos, params(95_000, 3.0)
+
+
+def hard_model() -> SimpleCoinSelectionModel:
+    # Large enough that CBC cannot close the gap within a fraction of a second
+    rng = random.Random(5)
+    utxos = [
+        UTXO(
+            f"{i:064x}",
+            0,
+            rng.randint(10_000, 5_000_000),
+            rng.choice([57.5, 68.0, 91.0, 148.0]),
+        )
+        for i in range(3_000)
+    ]
+    params = SelectionParams(
+        target_sats=30_000_000,
+        fee_rate_sat_per_vb=3.0,
+        min_change_sats=546,
+        sizing=TxSizing(10.5, 31.0, 31.0),
+    )
+    return SimpleCoinSelectionModel(utxos, params)
+
+
+@st.composite
+def st_small_case(draw):  # type: ignore[no-untyped-def]
+    n = draw(st.integers(min_value=1, max_value=10))
+    utxos = [
+        UTXO(
+            txid=f"{i:064x}",
+            vout=i,
+            value_sats=draw(st.integers(min_value=300, max_value=80_000)),
+            input_vbytes=draw(st.sampled_from([57.5, 58.0, 68.0, 91.0, 148.0])),
+        )
+        for i in range(n)
+    ]
+    total = sum(u.value_sats for u in utxos)
+    params = SelectionParams(
+        target_sats=draw(st.integers(min_value=0, max_value=total)),
+        fee_rate_sat_per_vb=draw(st.sampled_from([1.0, 2.5, 3.0, 7.3, 10.0])),
+        min_change_sats=draw(st.integers(min_value=0, max_value=1_000)),
+        sizing=_SIZING,
+    )
+    return utxos, params